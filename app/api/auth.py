@@ -2,15 +2,16 @@
 认证相关 API
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import create_access_token, get_password_hash_async, verify_password_async
 from app.core.snowflake import generate_snowflake_id
 from app.core.response import Response, success_response
 from app.schemas.user import UserCreate, UserLogin, ChangePassword, UserResponse, TokenResponse
 from app.models.user import User
-from app.api.deps import get_current_user, get_current_admin
+from app.api.deps import get_current_user, get_current_admin, invalidate_user_cache
 
 router = APIRouter(prefix="/auth", tags=["认证"])
 
@@ -18,7 +19,7 @@ router = APIRouter(prefix="/auth", tags=["认证"])
 @router.post("/register", summary="用户注册")
 async def register(
     user_create: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[UserResponse]:
     """
     用户注册（仅管理员可用）
@@ -30,7 +31,7 @@ async def register(
     - **phone**: 联系电话（选填）
     """
     # 检查用户名是否已存在
-    existing_user = db.query(User).filter(User.username == user_create.username).first()
+    existing_user = await db.scalar(select(User).where(User.username == user_create.username))
     if existing_user:
         return Response(code=400, msg="用户名已存在", data=None)
 
@@ -39,13 +40,12 @@ async def register(
         id=generate_snowflake_id(),
         username=user_create.username,
         name=user_create.name,
-        password=get_password_hash(user_create.password),
+        password=await get_password_hash_async(user_create.password),
         admin_flag=user_create.admin_flag,
         phone=user_create.phone,
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     # 返回用户信息
     user_response = UserResponse(
@@ -62,7 +62,7 @@ async def register(
 @router.post("/login", summary="用户登录")
 async def login(
     user_login: UserLogin,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[TokenResponse]:
     """
     用户登录
@@ -73,12 +73,12 @@ async def login(
     返回 JWT Token 和用户信息
     """
     # 查询用户
-    user = db.query(User).filter(User.username == user_login.username).first()
+    user = await db.scalar(select(User).where(User.username == user_login.username))
     if not user:
         return Response(code=401, msg="用户名或密码错误", data=None)
 
     # 验证密码
-    if not verify_password(user_login.password, user.password):
+    if not await verify_password_async(user_login.password, user.password):
         return Response(code=401, msg="用户名或密码错误", data=None)
 
     # 生成 Token
@@ -106,7 +106,7 @@ async def login(
 async def change_password(
     password_data: ChangePassword,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
     修改当前用户密码
@@ -114,12 +114,20 @@ async def change_password(
     - **old_password**: 旧密码
     - **new_password**: 新密码（至少6字符）
     """
+    # 当前用户可能来自缓存（不含密码），重新从数据库加载
+    user = await db.scalar(select(User).where(User.id == current_user.id))
+    if user is None:
+        return Response(code=401, msg="用户不存在", data=None)
+
     # 验证旧密码
-    if not verify_password(password_data.old_password, current_user.password):
+    if not await verify_password_async(password_data.old_password, user.password):
         return Response(code=401, msg="旧密码错误", data=None)
 
     # 更新密码
-    current_user.password = get_password_hash(password_data.new_password)
-    db.commit()
+    user.password = await get_password_hash_async(password_data.new_password)
+    await db.commit()
+
+    # 提交后再次失效缓存，防止提交前的并发请求回填旧数据
+    await invalidate_user_cache(user.id)
 
     return success_response(data={"message": "密码修改成功"})
@@ -2,7 +2,8 @@
 会员等级管理 API
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.response import Response, success_response, PageResponse
@@ -18,6 +19,7 @@ from app.schemas.customer_level import (
 from app.models.customer_level import CustomerLevel
 from app.models.customer import Customer
 from app.models.product_level_price import ProductLevelPrice
+from app.service.level_registry import level_registry
 from app.api.deps import get_current_user, get_current_admin
 
 router = APIRouter(prefix="/customer-levels", tags=["会员等级管理"])
@@ -27,7 +29,7 @@ router = APIRouter(prefix="/customer-levels", tags=["会员等级管理"])
 async def create_customer_level(
     level_create: CustomerLevelCreate,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[CustomerLevelResponse]:
     """
     创建新的会员等级（仅管理员可用）
@@ -35,9 +37,9 @@ async def create_customer_level(
     - **level_name**: 等级名称（必填，1-30字符，唯一）
     """
     # 检查等级名称是否已存在
-    existing_level = db.query(CustomerLevel).filter(
-        CustomerLevel.level_name == level_create.level_name
-    ).first()
+    existing_level = await db.scalar(
+        select(CustomerLevel).where(CustomerLevel.level_name == level_create.level_name)
+    )
     if existing_level:
         raise ConflictException("等级名称已存在")
 
@@ -47,8 +49,8 @@ async def create_customer_level(
         level_name=level_create.level_name,
     )
     db.add(new_level)
-    db.commit()
-    db.refresh(new_level)
+    await db.commit()
+    level_registry.put(new_level)
 
     # 转换为响应格式
     level_response = CustomerLevelResponse.model_validate(new_level)
@@ -59,12 +61,12 @@ async def create_customer_level(
 @router.get("/list", summary="查询等级列表")
 async def get_customer_levels(
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
     查询所有会员等级列表（所有用户可用）
     """
-    levels = db.query(CustomerLevel).all()
+    levels = await level_registry.all(db)
 
     # 转换为响应格式
     level_list = [CustomerLevelResponse.model_validate(level) for level in levels]
@@ -79,12 +81,12 @@ async def get_customer_levels(
 async def get_customer_level(
     level_query: CustomerLevelById,
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[CustomerLevelResponse]:
     """
     查询单个会员等级详情（所有用户可用）
     """
-    level = db.query(CustomerLevel).filter(CustomerLevel.id == level_query.id).first()
+    level = await db.scalar(select(CustomerLevel).where(CustomerLevel.id == level_query.id))
     if not level:
         raise NotFoundException("等级不存在")
 
@@ -98,7 +100,7 @@ async def get_customer_level(
 async def update_customer_level(
     level_update: CustomerLevelUpdate,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[CustomerLevelResponse]:
     """
     修改会员等级名称（仅管理员可用）
@@ -106,22 +108,24 @@ async def update_customer_level(
     - **id**: 等级ID（必填）
     - **level_name**: 新等级名称（必填，1-30字符）
     """
-    level = db.query(CustomerLevel).filter(CustomerLevel.id == level_update.id).first()
+    level = await db.scalar(select(CustomerLevel).where(CustomerLevel.id == level_update.id))
     if not level:
         raise NotFoundException("等级不存在")
 
     # 检查新名称是否与其他等级重复
-    existing_level = db.query(CustomerLevel).filter(
-        CustomerLevel.level_name == level_update.level_name,
-        CustomerLevel.id != level_update.id
-    ).first()
+    existing_level = await db.scalar(
+        select(CustomerLevel).where(
+            CustomerLevel.level_name == level_update.level_name,
+            CustomerLevel.id != level_update.id
+        )
+    )
     if existing_level:
         raise ConflictException("等级名称已存在")
 
     # 更新等级
     level.level_name = level_update.level_name
-    db.commit()
-    db.refresh(level)
+    await db.commit()
+    level_registry.put(level)
 
     # 转换为响应格式
     level_response = CustomerLevelResponse.model_validate(level)
@@ -133,7 +137,7 @@ async def update_customer_level(
 async def delete_customer_level(
     level_delete: CustomerLevelDelete,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
     删除会员等级（仅管理员可用）
@@ -142,22 +146,27 @@ async def delete_customer_level(
 
     - **id**: 等级ID（必填）
     """
-    level = db.query(CustomerLevel).filter(CustomerLevel.id == level_delete.id).first()
+    level = await db.scalar(select(CustomerLevel).where(CustomerLevel.id == level_delete.id))
     if not level:
         raise NotFoundException("等级不存在")
 
     # 检查是否有关联的客户
-    customer_count = db.query(Customer).filter(Customer.level_id == level_delete.id).count()
+    customer_count = await db.scalar(
+        select(func.count()).select_from(Customer).where(Customer.level_id == level_delete.id)
+    )
     if customer_count > 0:
         raise BadRequestException("该等级下有客户，无法删除")
 
     # 检查是否有关联的价格
-    price_count = db.query(ProductLevelPrice).filter(ProductLevelPrice.level_id == level_delete.id).count()
+    price_count = await db.scalar(
+        select(func.count()).select_from(ProductLevelPrice).where(ProductLevelPrice.level_id == level_delete.id)
+    )
     if price_count > 0:
         raise BadRequestException("该等级下有价格设置，无法删除")
 
     # 删除等级
-    db.delete(level)
-    db.commit()
+    await db.delete(level)
+    await db.commit()
+    level_registry.remove(level_delete.id)
 
     return success_response(data={"message": "等级删除成功"})
@@ -2,13 +2,17 @@
 客户管理 API
 """
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.core.database import get_db
-from app.core.response import Response, success_response, PageResponse
+from app.core.database import get_db, get_read_db
+from app.core.response import Response, success_response, PageResponse, CursorPageResponse
+from app.core.pagination import apply_keyset, build_next_cursor
+from app.core.counting import CountMode, count_total
 from app.core.snowflake import generate_snowflake_id
 from app.core.exceptions import NotFoundException, BadRequestException
+from app.core.serializers import model_fields, select_fields, serializer_registry
 from app.schemas.customer import (
     CustomerCreate,
     CustomerUpdate,
@@ -19,16 +23,22 @@ from app.schemas.customer import (
 )
 from app.models.customer import Customer
 from app.models.customer_level import CustomerLevel
+from app.service.level_registry import level_registry
 from app.api.deps import get_current_user, get_current_admin
 
 router = APIRouter(prefix="/customers", tags=["客户管理"])
 
+# 列表响应序列化器（导入时构建，查询行直接序列化为 JSON，不创建 ORM 实体与响应模型实例）
+CUSTOMER_PAGE_SERIALIZER = serializer_registry.register(Response[PageResponse[CustomerListResponse]])
+CUSTOMER_SCROLL_SERIALIZER = serializer_registry.register(Response[CursorPageResponse[CustomerListResponse]])
+CUSTOMER_FIELDS = model_fields(CustomerListResponse)
+
 
 @router.post("/create", summary="创建客户")
 async def create_customer(
     customer_create: CustomerCreate,
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[CustomerListResponse]:
     """
     创建新的客户（所有用户可用）
@@ -40,7 +50,7 @@ async def create_customer(
     - **address**: 地址（必填）
     """
     # 验证会员等级是否存在
-    level = db.query(CustomerLevel).filter(CustomerLevel.id == customer_create.level_id).first()
+    level = await level_registry.get(db, customer_create.level_id)
     if not level:
         raise NotFoundException("会员等级不存在")
 
@@ -54,8 +64,7 @@ async def create_customer(
         address=customer_create.address,
     )
     db.add(new_customer)
-    db.commit()
-    db.refresh(new_customer)
+    await db.commit()
 
     # 转换为响应格式
     customer_response = CustomerListResponse(
@@ -72,14 +81,64 @@ async def create_customer(
     return success_response(data=customer_response, msg="客户创建成功")
 
 
+def _build_customers_query(search: Optional[str], level_id: Optional[int]) -> Select:
+    """
+    构建客户列表查询（搜索与筛选条件）
+
+    只查询 CustomerListResponse 所需的列（只读投影，返回 Row），等级名称由等级注册表补充
+
+    Args:
+        search: 搜索关键词（客户名称或手机号）
+        level_id: 会员等级ID
+
+    Returns:
+        Select: 查询语句
+    """
+    query = select_fields(Customer, CUSTOMER_FIELDS)
+
+    # 搜索条件
+    if search:
+        search_pattern = f"%{search}%"
+        query = query.where(
+            (Customer.name.like(search_pattern)) | (Customer.phone.like(search_pattern))
+        )
+
+    # 等级筛选
+    if level_id:
+        query = query.where(Customer.level_id == level_id)
+
+    return query
+
+
+def _customer_items(customers, level_names: dict[int, str]) -> list[dict]:
+    """
+    客户列表项（字段字典，等级名称取自等级注册表）
+
+    Args:
+        customers: 客户查询行
+        level_names: 等级ID -> 等级名称
+
+    Returns:
+        list[dict]: 与 CustomerListResponse 字段相同的字典
+    """
+    return [
+        {
+            field: level_names.get(customer.level_id) if field == "level_name" else getattr(customer, field)
+            for field in CUSTOMER_FIELDS
+        }
+        for customer in customers
+    ]
+
+
 @router.get("/page", summary="分页查询客户列表")
 async def get_customers_page(
     page_index: int = Query(1, ge=1, alias="pageIndex", description="页码"),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize", description="每页数量"),
     search: Optional[str] = Query(None, description="搜索关键词（客户名称或手机号）"),
     level_id: Optional[int] = Query(None, alias="levelId", description="会员等级ID筛选"),
+    count_mode: Optional[CountMode] = Query(None, alias="countMode", description="总数统计模式：exact / cached / estimated"),
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Response[PageResponse[CustomerListResponse]]:
     """
     分页查询客户列表（所有用户可用）
@@ -87,66 +146,86 @@ async def get_customers_page(
     支持分页、搜索和筛选
     """
     # 构建查询
-    query = db.query(Customer).join(CustomerLevel)
-
-    # 搜索条件
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            (Customer.name.like(search_pattern)) | (Customer.phone.like(search_pattern))
-        )
-
-    # 等级筛选
-    if level_id:
-        query = query.filter(Customer.level_id == level_id)
+    query = _build_customers_query(search, level_id)
 
     # 计算总数
-    total = query.count()
+    total, total_mode = await count_total(db, query, "customers", (search, level_id), count_mode)
 
     # 分页
     offset = (page_index - 1) * page_size
-    customers = query.order_by(Customer.created_at.desc()).offset(offset).limit(page_size).all()
-
-    # 构建响应数据
-    items = []
-    for customer in customers:
-        customer_data = CustomerListResponse(
-            id=customer.id,
-            level_id=customer.level_id,
-            level_name=customer.level.level_name if customer.level else None,
-            name=customer.name,
-            phone=customer.phone,
-            contact_person=customer.contact_person,
-            address=customer.address,
-            created_at=customer.created_at,
-        )
-        items.append(customer_data)
+    customers = (await db.execute(
+        query.order_by(Customer.created_at.desc())
+        .offset(offset)
+        .limit(page_size)
+    )).all()
+
+    # 构建响应数据（等级名称取自等级注册表，无需关联等级表）
+    level_names = await level_registry.names(db, {customer.level_id for customer in customers})
+    items = _customer_items(customers, level_names)
+
+    return CUSTOMER_PAGE_SERIALIZER.response({
+        "total": total,
+        "items": items,
+        "total_mode": total_mode,
+    })
+
+
+@router.get("/scroll", summary="游标分页查询客户列表")
+async def scroll_customers(
+    cursor: Optional[str] = Query(None, description="游标（上一页返回的 nextCursor，为空表示第一页）"),
+    page_size: int = Query(20, ge=1, le=100, alias="pageSize", description="每页数量"),
+    search: Optional[str] = Query(None, description="搜索关键词（客户名称或手机号）"),
+    level_id: Optional[int] = Query(None, alias="levelId", description="会员等级ID筛选"),
+    with_total: bool = Query(False, alias="withTotal", description="是否返回总记录数"),
+    current_user: CustomerLevel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response[CursorPageResponse[CustomerListResponse]]:
+    """
+    游标分页查询客户列表（所有用户可用）
 
-    page_response = PageResponse[CustomerListResponse](
-        total=total,
-        items=items
-    )
+    按创建时间倒序，基于 (created_at, id) 游标翻页，深度翻页与第一页代价相同。
+    默认不计算总数，需要时传 withTotal=true
+    """
+    query = _build_customers_query(search, level_id)
 
-    return success_response(data=page_response)
+    # 计算总数（可选）
+    total = None
+    if with_total:
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+
+    customers = (await db.execute(apply_keyset(query, Customer, cursor, page_size))).all()
+    customers, next_cursor = build_next_cursor(customers, page_size)
+
+    # 构建响应数据（等级名称取自等级注册表，无需关联等级表）
+    level_names = await level_registry.names(db, {customer.level_id for customer in customers})
+    items = _customer_items(customers, level_names)
+
+    return CUSTOMER_SCROLL_SERIALIZER.response({
+        "items": items,
+        "next_cursor": next_cursor,
+        "total": total,
+    })
 
 
 @router.post("/detail", summary="查询客户详情")
 async def get_customer(
     customer_query: CustomerById,
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[CustomerListResponse]:
     """
     查询单个客户详情（所有用户可用）
     """
-    customer = db.query(Customer).filter(Customer.id == customer_query.id).first()
+    customer = await db.scalar(select(Customer).where(Customer.id == customer_query.id))
     if not customer:
         raise NotFoundException("客户不存在")
 
+    level = await level_registry.get(db, customer.level_id)
+
     customer_response = CustomerListResponse(
         id=customer.id,
         level_id=customer.level_id,
-        level_name=customer.level.level_name if customer.level else None,
+        level_name=level.level_name if level else None,
         name=customer.name,
         phone=customer.phone,
         contact_person=customer.contact_person,
@@ -161,22 +240,20 @@ async def get_customer(
 async def update_customer(
     customer_update: CustomerUpdate,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[CustomerListResponse]:
     """
     修改客户信息（仅管理员可用）
 
     所有字段都是选填的，只更新提供的字段
     """
-    customer = db.query(Customer).filter(Customer.id == customer_update.id).first()
+    customer = await db.scalar(select(Customer).where(Customer.id == customer_update.id))
     if not customer:
         raise NotFoundException("客户不存在")
 
     # 验证会员等级是否存在（如果提供了 level_id）
     if customer_update.level_id:
-        level = db.query(CustomerLevel).filter(
-            CustomerLevel.id == customer_update.level_id
-        ).first()
+        level = await level_registry.get(db, customer_update.level_id)
         if not level:
             raise NotFoundException("会员等级不存在")
 
@@ -185,13 +262,14 @@ async def update_customer(
     for field, value in update_data.items():
         setattr(customer, field, value)
 
-    db.commit()
-    db.refresh(customer)
+    await db.commit()
+
+    level = await level_registry.get(db, customer.level_id)
 
     customer_response = CustomerListResponse(
         id=customer.id,
         level_id=customer.level_id,
-        level_name=customer.level.level_name if customer.level else None,
+        level_name=level.level_name if level else None,
         name=customer.name,
         phone=customer.phone,
         contact_person=customer.contact_person,
@@ -206,16 +284,16 @@ async def update_customer(
 async def delete_customer(
     customer_delete: CustomerDelete,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
     删除客户（仅管理员可用）
     """
-    customer = db.query(Customer).filter(Customer.id == customer_delete.id).first()
+    customer = await db.scalar(select(Customer).where(Customer.id == customer_delete.id))
     if not customer:
         raise NotFoundException("客户不存在")
 
-    db.delete(customer)
-    db.commit()
+    await db.delete(customer)
+    await db.commit()
 
     return success_response(data={"message": "客户删除成功"})
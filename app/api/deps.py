@@ -1,27 +1,129 @@
 """
 API 依赖注入
 """
+import asyncio
+import logging
+
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import TypeVar, Type
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from typing import Optional, TypeVar, Type
 
+from app.core.cache import create_cache_backend
+from app.core.config import get_settings
 from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.core.exceptions import UnauthorizedException, ForbiddenException
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
 security = HTTPBearer()
 
 T = TypeVar("T")
 
 
+# ============ 已认证用户缓存 ============
+
+# 缓存的用户字段（不包含密码哈希，避免敏感数据进入共享缓存）
+_USER_CACHE_FIELDS = ("id", "username", "name", "admin_flag", "phone")
+
+user_cache = create_cache_backend(
+    "user",
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    redis_url=settings.CACHE_REDIS_URL,
+)
+
+
+async def _get_cached_user(user_id: int) -> Optional[User]:
+    """
+    从缓存获取用户
+
+    返回的是未绑定会话的 User 对象，只包含 _USER_CACHE_FIELDS 中的字段，
+    需要修改用户时应重新从数据库加载
+    """
+    if not settings.USER_CACHE_ENABLED:
+        return None
+    data = await user_cache.get(str(user_id))
+    if data is None:
+        return None
+    return User(**data)
+
+
+async def _cache_user(user: User) -> None:
+    """将用户写入缓存"""
+    if not settings.USER_CACHE_ENABLED:
+        return
+    await user_cache.set(str(user.id), {field: getattr(user, field) for field in _USER_CACHE_FIELDS})
+
+
+async def invalidate_user_cache(user_id: int) -> None:
+    """
+    使用户缓存失效
+
+    修改用户信息并提交事务后调用
+    """
+    await user_cache.delete(str(user_id))
+
+
+# 兜底失效（覆盖所有修改用户的代码路径）：flush 时只记录被修改的用户ID，
+# 事务提交后再删除缓存，不在 ORM flush 事件中做网络 I/O
+_CHANGED_USERS_KEY = "changed_user_ids"
+_invalidation_tasks: set[asyncio.Task] = set()
+
+
+async def _invalidate_users(user_ids: set[int]) -> None:
+    for user_id in user_ids:
+        try:
+            await invalidate_user_cache(user_id)
+        except Exception as e:
+            logger.warning(f"用户缓存失效失败 user_id={user_id}: {e}")
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _record_changed_user(mapper, connection, target: User) -> None:
+    """用户被更新或删除时记录用户ID，提交后使缓存失效"""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    """事务提交后使被修改用户的缓存失效（异步会话中作为后台任务执行）"""
+    user_ids = session.info.pop(_CHANGED_USERS_KEY, None)
+    if not user_ids:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # 同步脚本中使用 SessionLocal 修改用户
+        asyncio.run(_invalidate_users(user_ids))
+        return
+    task = loop.create_task(_invalidate_users(user_ids))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    """事务回滚时丢弃记录的用户ID"""
+    session.info.pop(_CHANGED_USERS_KEY, None)
+
+
 # ============ Service 依赖注入工厂 ============
 
 def get_service(service_class: Type[T]):
     """
     通用 Service 依赖注入工厂
 
+    Service 以异步会话（AsyncSession）构造，其方法需为异步方法（如 UserService）
+
     Args:
         service_class: Service 类
 
@@ -30,8 +132,9 @@ def get_service(service_class: Type[T]):
 
     使用示例:
         user_service: UserService = Depends(get_service(UserService))
+        user = await user_service.get_user(user_id)
     """
-    def _get_service(db: Session = Depends(get_db)) -> T:
+    def _get_service(db: AsyncSession = Depends(get_db)) -> T:
         return service_class(db)
     return _get_service
 
@@ -40,7 +143,7 @@ def get_service(service_class: Type[T]):
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> User:
     """
     获取当前登录用户
@@ -50,7 +153,7 @@ async def get_current_user(
         db: 数据库会话
 
     Returns:
-        User: 当前用户对象
+        User: 当前用户对象（可能来自缓存，未绑定会话且不含密码字段）
 
     Raises:
         UnauthorizedException: Token 无效或用户不存在
@@ -64,11 +167,17 @@ async def get_current_user(
     except Exception as e:
         raise UnauthorizedException("Token无效或已过期")
 
+    # 优先从缓存获取用户
+    user = await _get_cached_user(int(user_id))
+    if user is not None:
+        return user
+
     # 查询用户
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.scalar(select(User).where(User.id == int(user_id)))
     if user is None:
         raise UnauthorizedException("用户不存在")
 
+    await _cache_user(user)
     return user
 
 
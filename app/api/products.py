@@ -1,38 +1,66 @@
 """
 商品管理 API
 """
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import Optional
 
-from app.core.database import get_db
-from app.core.response import Response, success_response, PageResponse
-from app.core.snowflake import generate_snowflake_id
+from app.core.database import get_db, get_read_db
+from app.core.response import Response, success_response, PageResponse, CursorPageResponse
+from app.core.pagination import apply_keyset, build_next_cursor
+from app.core.counting import CountMode, count_total
+from app.core.snowflake import generate_snowflake_id, snowflake_id_at
 from app.core.exceptions import ConflictException, NotFoundException, BadRequestException
+from app.core.serializers import model_fields, rows_to_dicts, select_fields, serializer_registry
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     ProductDelete,
     ProductById,
+    ProductByBarcode,
     ProductResponse,
     ProductDetailResponse,
+    ProductBarcodeResponse,
     StockUpdate,
+    StockBatchUpdate,
+    StockLevelResponse,
+    StockMovementResponse,
+    StockAtResponse,
+    StockReportResponse,
     ProductPriceInDetail,
+    ProductImportResponse,
 )
 from app.models.product import Product
 from app.models.product_level_price import ProductLevelPrice
+from app.models.stock_movement import StockMovement
 from app.models.customer_level import CustomerLevel
+from app.service.product_search import apply_product_search, find_product_by_barcode, lookup_product_by_barcode
+from app.service.level_prices import build_product_prices_query
+from app.service.level_registry import level_registry
+from app.service.product_transfer import ExportFormat, export_products, import_products
+from app.service.record_stream import iter_records
+from app.service.stock import adjust_stock, adjust_stock_batch, set_stock
+from app.service.stock_ledger import movement_totals, record_movements, stock_at
 from app.api.deps import get_current_user, get_current_admin
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 router = APIRouter(prefix="/products", tags=["商品管理"])
 
+# 列表响应序列化器（导入时构建，查询行直接序列化为 JSON，不创建 ORM 实体与响应模型实例）
+PRODUCT_PAGE_SERIALIZER = serializer_registry.register(Response[PageResponse[ProductResponse]])
+PRODUCT_SCROLL_SERIALIZER = serializer_registry.register(Response[CursorPageResponse[ProductResponse]])
+PRODUCT_FIELDS = model_fields(ProductResponse)
+
 
 @router.post("/create", summary="创建商品")
 async def create_product(
     product_create: ProductCreate,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[ProductResponse]:
     """
     创建新的商品（仅管理员可用）
@@ -47,9 +75,9 @@ async def create_product(
     """
     # 检查条形码是否已存在
     if product_create.barcode:
-        existing_product = db.query(Product).filter(
-            Product.barcode == product_create.barcode
-        ).first()
+        existing_product = await db.scalar(
+            select(Product).where(Product.barcode == product_create.barcode)
+        )
         if existing_product:
             raise ConflictException("条形码已存在")
 
@@ -65,8 +93,8 @@ async def create_product(
         stock_qty=product_create.stock_qty,
     )
     db.add(new_product)
-    db.commit()
-    db.refresh(new_product)
+    await record_movements(db, [(new_product.id, new_product.stock_qty)], "新建商品", current_admin.id)
+    await db.commit()
 
     # 转换为响应格式
     product_response = ProductResponse.model_validate(new_product)
@@ -74,83 +102,194 @@ async def create_product(
     return success_response(data=product_response, msg="商品创建成功")
 
 
+@router.post(
+    "/import",
+    summary="批量导入商品",
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "text/csv": {"schema": {"type": "string"}},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}},
+)
+async def import_products_endpoint(
+    request: Request,
+    current_admin: CustomerLevel = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+) -> Response[ProductImportResponse]:
+    """
+    批量导入商品（仅管理员可用）
+
+    请求体为 CSV（Content-Type: text/csv，首行为表头）或 NDJSON（Content-Type: application/x-ndjson），
+    流式读取，每行字段与创建商品相同:
+
+    - **name**: 商品全称（必填，1-100字符）
+    - **short_name**: 商品简称（必填，1-50字符）
+    - **spec**: 规格型号（选填）
+    - **barcode**: 条形码（选填，唯一）
+    - **image_url**: 商品图片URL（选填）
+    - **purchase_price**: 进价（必填，必须大于0）
+    - **stock_qty**: 库存数量（选填，默认0）
+
+    按批提交，无效行与条形码重复的行跳过并在 errors 中返回行号与原因
+    """
+    report = await import_products(db, iter_records(request), current_admin.id)
+    return success_response(data=report, msg="商品导入完成")
+
+
+@router.get("/export", summary="导出商品")
+async def export_products_endpoint(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="导出格式：csv / ndjson"),
+    current_admin: CustomerLevel = Depends(get_current_admin),
+) -> StreamingResponse:
+    """
+    流式导出全部商品（仅管理员可用）
+
+    按创建顺序逐批读取并写出，CSV 列与导入格式一致（另含 id、created_at）
+    """
+    if export_format == ExportFormat.CSV:
+        media_type, filename = "text/csv; charset=utf-8", "products.csv"
+    else:
+        media_type, filename = "application/x-ndjson", "products.ndjson"
+    return StreamingResponse(
+        export_products(export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _build_products_query(in_stock: Optional[bool]) -> Select:
+    """
+    构建商品列表查询（筛选条件）
+
+    只查询 ProductResponse 所需的列（只读投影，返回 Row），搜索条件由 apply_product_search 添加
+
+    Args:
+        in_stock: 是否有库存
+
+    Returns:
+        Select: 查询语句
+    """
+    query = select_fields(Product, PRODUCT_FIELDS)
+
+    # 库存筛选
+    if in_stock is not None:
+        if in_stock:
+            query = query.where(Product.stock_qty > 0)
+        else:
+            query = query.where(Product.stock_qty == 0)
+
+    return query
+
+
 @router.get("/page", summary="分页查询商品列表")
 async def get_products_page(
     page_index: int = Query(1, ge=1, alias="pageIndex", description="页码"),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize", description="每页数量"),
     search: Optional[str] = Query(None, description="搜索关键词（商品名称、简称或条形码）"),
     in_stock: Optional[bool] = Query(None, alias="inStock", description="是否有库存"),
+    count_mode: Optional[CountMode] = Query(None, alias="countMode", description="总数统计模式：exact / cached / estimated"),
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Response[PageResponse[ProductResponse]]:
     """
     分页查询商品列表（所有用户可用）
 
-    支持分页、搜索和筛选
+    支持分页、搜索和筛选。搜索时按相关度排序，条形码完全匹配时只返回该商品
     """
     # 构建查询
-    query = db.query(Product)
+    query = _build_products_query(in_stock)
 
     # 搜索条件
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            (Product.name.like(search_pattern))
-            | (Product.short_name.like(search_pattern))
-            | (Product.barcode.like(search_pattern))
-        )
-
-    # 库存筛选
-    if in_stock is not None:
-        if in_stock:
-            query = query.filter(Product.stock_qty > 0)
-        else:
-            query = query.filter(Product.stock_qty == 0)
+        # 条形码完全匹配（扫码场景）直接走唯一索引
+        exact_product = await find_product_by_barcode(db, query, search)
+        if exact_product:
+            items = rows_to_dicts([exact_product], PRODUCT_FIELDS) if page_index == 1 else []
+            return PRODUCT_PAGE_SERIALIZER.response({
+                "total": 1,
+                "items": items,
+                "total_mode": CountMode.EXACT,
+            })
+
+        query = await apply_product_search(db, query, search)
 
     # 计算总数
-    total = query.count()
+    total, total_mode = await count_total(db, query, "products", (search, in_stock), count_mode)
 
     # 分页
     offset = (page_index - 1) * page_size
-    products = query.order_by(Product.created_at.desc()).offset(offset).limit(page_size).all()
+    products = (await db.execute(
+        query.order_by(Product.created_at.desc()).offset(offset).limit(page_size)
+    )).all()
 
     # 转换为响应格式
-    items = [ProductResponse.model_validate(product) for product in products]
+    return PRODUCT_PAGE_SERIALIZER.response({
+        "total": total,
+        "items": rows_to_dicts(products, PRODUCT_FIELDS),
+        "total_mode": total_mode,
+    })
 
-    page_response = PageResponse[ProductResponse](
-        total=total,
-        items=items
-    )
 
-    return success_response(data=page_response)
+@router.get("/scroll", summary="游标分页查询商品列表")
+async def scroll_products(
+    cursor: Optional[str] = Query(None, description="游标（上一页返回的 nextCursor，为空表示第一页）"),
+    page_size: int = Query(20, ge=1, le=100, alias="pageSize", description="每页数量"),
+    search: Optional[str] = Query(None, description="搜索关键词（商品名称、简称或条形码）"),
+    in_stock: Optional[bool] = Query(None, alias="inStock", description="是否有库存"),
+    with_total: bool = Query(False, alias="withTotal", description="是否返回总记录数"),
+    current_user: CustomerLevel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response[CursorPageResponse[ProductResponse]]:
+    """
+    游标分页查询商品列表（所有用户可用）
+
+    按创建时间倒序，基于 (created_at, id) 游标翻页，深度翻页与第一页代价相同。
+    默认不计算总数，需要时传 withTotal=true
+    """
+    query = _build_products_query(in_stock)
+    if search:
+        query = await apply_product_search(db, query, search, ranked=False)
+
+    # 计算总数（可选）
+    total = None
+    if with_total:
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+
+    products = (await db.execute(apply_keyset(query, Product, cursor, page_size))).all()
+    products, next_cursor = build_next_cursor(products, page_size)
+
+    # 转换为响应格式
+    return PRODUCT_SCROLL_SERIALIZER.response({
+        "items": rows_to_dicts(products, PRODUCT_FIELDS),
+        "next_cursor": next_cursor,
+        "total": total,
+    })
 
 
 @router.post("/detail", summary="查询商品详情")
 async def get_product(
     product_query: ProductById,
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[ProductDetailResponse]:
     """
     查询单个商品详情（所有用户可用）
 
     返回商品基本信息和所有等级的价格列表
     """
-    product = db.query(Product).filter(Product.id == product_query.id).first()
+    product = await db.scalar(select(Product).where(Product.id == product_query.id))
     if not product:
         raise NotFoundException("商品不存在")
 
-    # 查询所有等级的价格
-    prices = db.query(ProductLevelPrice).filter(
-        ProductLevelPrice.product_id == product_query.id
-    ).all()
+    # 查询所有等级的价格（只取所需列，等级名称取自等级注册表）
+    prices = (await db.execute(build_product_prices_query(product_query.id))).all()
 
     # 构建价格列表
+    level_names = await level_registry.names(db, {price.level_id for price in prices})
     price_items = []
     for price in prices:
         price_item = ProductPriceInDetail(
             level_id=price.level_id,
-            level_name=price.level.level_name if price.level else None,
+            level_name=level_names.get(price.level_id),
             sale_price=price.sale_price,
         )
         price_items.append(price_item)
@@ -172,37 +311,81 @@ async def get_product(
     return success_response(data=product_detail)
 
 
+@router.post("/barcode", summary="按条形码查询商品")
+async def get_product_by_barcode(
+    barcode_query: ProductByBarcode,
+    current_user: CustomerLevel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response[ProductBarcodeResponse]:
+    """
+    按条形码精确查询商品（所有用户可用，收银扫码场景）
+
+    - **barcode**: 条形码（必填）
+    - **level_id**: 会员等级ID（选填，传入时返回该等级的销售价格）
+    """
+    # 商品与指定等级的价格一次查询取回
+    found = await lookup_product_by_barcode(db, barcode_query.barcode, barcode_query.level_id)
+    if not found:
+        raise NotFoundException("商品不存在")
+    product, sale_price = found
+
+    product_response = ProductBarcodeResponse(
+        id=product.id,
+        name=product.name,
+        short_name=product.short_name,
+        spec=product.spec,
+        barcode=product.barcode,
+        image_url=product.image_url,
+        purchase_price=product.purchase_price,
+        stock_qty=product.stock_qty,
+        created_at=product.created_at,
+        level_id=barcode_query.level_id,
+        sale_price=sale_price,
+    )
+
+    return success_response(data=product_response)
+
+
 @router.post("/update", summary="更新商品信息")
 async def update_product(
     product_update: ProductUpdate,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response[ProductResponse]:
     """
     修改商品信息（仅管理员可用）
 
     所有字段都是选填的，只更新提供的字段
     """
-    product = db.query(Product).filter(Product.id == product_update.id).first()
+    product = await db.scalar(select(Product).where(Product.id == product_update.id))
     if not product:
         raise NotFoundException("商品不存在")
 
     # 检查条形码是否与其他商品重复
     if product_update.barcode:
-        existing_product = db.query(Product).filter(
-            Product.barcode == product_update.barcode,
-            Product.id != product_update.id
-        ).first()
+        existing_product = await db.scalar(
+            select(Product).where(
+                Product.barcode == product_update.barcode,
+                Product.id != product_update.id
+            )
+        )
         if existing_product:
             raise ConflictException("条形码已存在")
 
-    # 更新字段
+    # 更新字段（库存单独处理）
     update_data = product_update.model_dump(exclude_unset=True, exclude={"id"})
+    stock_qty = update_data.pop("stock_qty", None)
     for field, value in update_data.items():
         setattr(product, field, value)
 
-    db.commit()
-    db.refresh(product)
+    # 直接修改库存：比较并设置，读取后库存被其他请求调整时报冲突而不是覆盖，流水与修改在同一事务提交
+    if stock_qty is not None and stock_qty != product.stock_qty:
+        if await set_stock(db, product.id, stock_qty, product.stock_qty) is None:
+            await db.rollback()
+            raise ConflictException("库存已被其他操作修改，请刷新后重试")
+        await record_movements(db, [(product.id, stock_qty - product.stock_qty)], "修改商品信息", current_admin.id)
+        set_committed_value(product, "stock_qty", stock_qty)
+    await db.commit()
 
     # 转换为响应格式
     product_response = ProductResponse.model_validate(product)
@@ -214,26 +397,28 @@ async def update_product(
 async def delete_product(
     product_delete: ProductDelete,
     current_admin: CustomerLevel = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
     删除商品（仅管理员可用）
 
     如果商品下有关联的价格，需要先删除价格才能删除商品
     """
-    product = db.query(Product).filter(Product.id == product_delete.id).first()
+    product = await db.scalar(select(Product).where(Product.id == product_delete.id))
     if not product:
         raise NotFoundException("商品不存在")
 
     # 检查是否有关联的价格
-    price_count = db.query(ProductLevelPrice).filter(
-        ProductLevelPrice.product_id == product_delete.id
-    ).count()
+    price_count = await db.scalar(
+        select(func.count())
+        .select_from(ProductLevelPrice)
+        .where(ProductLevelPrice.product_id == product_delete.id)
+    )
     if price_count > 0:
         raise BadRequestException("该商品有价格设置，请先删除价格")
 
-    db.delete(product)
-    db.commit()
+    await db.delete(product)
+    await db.commit()
 
     return success_response(data={"message": "商品删除成功"})
 
@@ -242,7 +427,7 @@ async def delete_product(
 async def update_stock(
     stock_update: StockUpdate,
     current_user: CustomerLevel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
     调整商品库存数量（所有用户可用）
@@ -251,19 +436,15 @@ async def update_stock(
     - **delta**: 库存变化量（正数增加，负数减少）
     - **reason**: 变更原因（选填）
     """
-    product = db.query(Product).filter(Product.id == stock_update.id).first()
-    if not product:
-        raise NotFoundException("商品不存在")
-
-    # 计算新库存
-    new_stock = product.stock_qty + stock_update.delta
-    if new_stock < 0:
+    # 条件更新原子完成校验与调整，并发调整不会丢失更新
+    product = await adjust_stock(db, stock_update.id, stock_update.delta)
+    if product is None:
+        await db.rollback()
+        if not await db.scalar(select(Product.id).where(Product.id == stock_update.id)):
+            raise NotFoundException("商品不存在")
         raise BadRequestException("库存不足")
-
-    # 更新库存
-    product.stock_qty = new_stock
-    db.commit()
-    db.refresh(product)
+    await record_movements(db, [(stock_update.id, stock_update.delta)], stock_update.reason, current_user.id)
+    await db.commit()
 
     # 转换为响应格式
     product_response = ProductResponse.model_validate(product)
@@ -272,3 +453,116 @@ async def update_stock(
         data=product_response.model_dump(),
         msg="库存更新成功"
     )
+
+
+@router.post("/stock-batch", summary="批量调整库存")
+async def update_stock_batch(
+    stock_batch: StockBatchUpdate,
+    current_user: CustomerLevel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response[list[StockLevelResponse]]:
+    """
+    在一个事务中调整多个商品的库存（所有用户可用，结账场景）
+
+    全部成功或全部失败；失败时返回 400，data 中列出失败的商品及原因
+
+    - **lines**: 调整行，每行包含 id（商品ID）和 delta（库存变化量）
+    - **reason**: 变更原因（选填）
+    """
+    # 合并同一商品的多行
+    deltas = {}
+    for line in stock_batch.lines:
+        deltas[line.id] = deltas.get(line.id, 0) + line.delta
+
+    new_stock, failures = await adjust_stock_batch(db, deltas)
+    if failures:
+        await db.rollback()
+        raise BadRequestException("部分商品库存调整失败", data=failures)
+    await record_movements(db, sorted(deltas.items()), stock_batch.reason, current_user.id)
+    await db.commit()
+
+    items = [
+        StockLevelResponse(id=product_id, stock_qty=new_stock[product_id])
+        for product_id in sorted(new_stock)
+    ]
+    return success_response(data=items, msg="库存更新成功")
+
+
+@router.get("/stock-movements", summary="查询库存流水")
+async def get_stock_movements(
+    product_id: int = Query(..., alias="productId", description="商品ID"),
+    start: Optional[datetime] = Query(None, description="开始时间"),
+    end: Optional[datetime] = Query(None, description="结束时间"),
+    cursor: Optional[str] = Query(None, description="游标（上一页返回的 nextCursor，为空表示第一页）"),
+    page_size: int = Query(20, ge=1, le=100, alias="pageSize", description="每页数量"),
+    current_user: CustomerLevel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response[CursorPageResponse[StockMovementResponse]]:
+    """
+    按时间倒序查询商品的库存流水（所有用户可用）
+
+    流水ID即时间键，时间范围与游标都按流水ID过滤
+    """
+    query = select(StockMovement).where(StockMovement.product_id == product_id)
+    if start:
+        query = query.where(StockMovement.id >= snowflake_id_at(start))
+    if end:
+        query = query.where(StockMovement.id < snowflake_id_at(end + timedelta(milliseconds=1)))
+    if cursor:
+        if not cursor.isdigit():
+            raise BadRequestException("无效的游标")
+        query = query.where(StockMovement.id < int(cursor))
+
+    movements = (await db.scalars(query.order_by(StockMovement.id.desc()).limit(page_size + 1))).all()
+    next_cursor = str(movements[page_size - 1].id) if len(movements) > page_size else None
+
+    page_response = CursorPageResponse[StockMovementResponse](
+        items=[StockMovementResponse.model_validate(movement) for movement in movements[:page_size]],
+        next_cursor=next_cursor,
+    )
+    return success_response(data=page_response)
+
+
+@router.get("/stock-at", summary="查询历史库存")
+async def get_stock_at(
+    product_id: int = Query(..., alias="productId", description="商品ID"),
+    at: datetime = Query(..., description="查询时刻"),
+    current_user: CustomerLevel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response[StockAtResponse]:
+    """
+    查询商品在指定时刻的库存（所有用户可用）
+
+    从该时刻之前最近的库存快照开始累加之后的流水
+    """
+    stock_qty = await stock_at(db, product_id, at)
+    return success_response(data=StockAtResponse(id=product_id, at=at, stock_qty=stock_qty))
+
+
+@router.get("/stock-report", summary="库存区间报表")
+async def get_stock_report(
+    product_id: int = Query(..., alias="productId", description="商品ID"),
+    start: datetime = Query(..., description="开始时间"),
+    end: datetime = Query(..., description="结束时间"),
+    current_user: CustomerLevel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response[StockReportResponse]:
+    """
+    统计商品在时间区间内的期初库存、入库、出库与期末库存（所有用户可用）
+    """
+    if end < start:
+        raise BadRequestException("结束时间不能早于开始时间")
+
+    opening_qty = await stock_at(db, product_id, start - timedelta(milliseconds=1))
+    in_qty, out_qty = await movement_totals(db, product_id, start, end)
+
+    report = StockReportResponse(
+        id=product_id,
+        start=start,
+        end=end,
+        opening_qty=opening_qty,
+        in_qty=in_qty,
+        out_qty=-out_qty,
+        closing_qty=opening_qty + in_qty + out_qty,
+    )
+    return success_response(data=report)
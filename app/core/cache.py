@@ -0,0 +1,206 @@
+"""
+进程内缓存与可插拔的共享缓存后端
+
+- LRUCache: 进程内 LRU + TTL 缓存，线程安全，同步接口（无 I/O 的热路径直接使用，如 Token 缓存）
+- CacheBackend: 可插拔的异步缓存后端接口
+  - MemoryCacheBackend: 基于 LRUCache 的进程内缓存
+  - RedisCacheBackend: 基于 redis.asyncio 的共享缓存，多 worker / 多实例部署时使用（需安装 redis）
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LRUCache:
+    """
+    进程内 LRU + TTL 缓存（同步，无 I/O）
+
+    超过 maxsize 时淘汰最久未使用的条目；条目在 TTL 到期后视为不存在。
+    hits / misses 记录命中与未命中次数
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最大条目数
+            ttl: 默认过期时间（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """获取缓存值，不存在或已过期返回 None"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expire_at, value = item
+            if expire_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存值"""
+        expire_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expire_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """删除缓存值"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """返回缓存统计信息"""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """缓存后端接口（异步，共享缓存的读写是网络 I/O，不能阻塞事件循环）"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """获取缓存值，不存在或已过期返回 None"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存值"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """删除缓存值"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """清空缓存"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内缓存后端（LRUCache 的异步接口）"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最大条目数
+            ttl: 默认过期时间（秒）
+        """
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """返回缓存统计信息"""
+        return self._cache.stats()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis 共享缓存（redis.asyncio 客户端，读写不阻塞事件循环）
+
+    值以 JSON 序列化存储，仅适用于可 JSON 序列化的数据
+    """
+
+    def __init__(self, url: str, prefix: str = "shop:", ttl: float = 60):
+        """
+        初始化缓存
+
+        Args:
+            url: Redis 连接字符串，如 redis://localhost:6379/0
+            prefix: 键前缀
+            ttl: 默认过期时间（秒）
+        """
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("使用 Redis 缓存需要安装 redis: pip install redis") from e
+
+        self._client = aioredis.Redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expire = max(1, int(self.ttl if ttl is None else ttl))
+        await self._client.set(self.prefix + key, json.dumps(value), ex=expire)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=self.prefix + "*"):
+            await self._client.delete(key)
+
+
+def create_cache_backend(
+    name: str,
+    maxsize: int,
+    ttl: float,
+    redis_url: Optional[str] = None,
+) -> CacheBackend:
+    """
+    根据配置创建缓存后端
+
+    配置了 redis_url 时使用 Redis 共享缓存，否则使用进程内缓存
+
+    Args:
+        name: 缓存名称，用作 Redis 键前缀
+        maxsize: 进程内缓存最大条目数
+        ttl: 默认过期时间（秒）
+        redis_url: Redis 连接字符串
+
+    Returns:
+        CacheBackend: 缓存后端实例
+    """
+    if redis_url:
+        return RedisCacheBackend(redis_url, prefix=f"shop:{name}:", ttl=ttl)
+    return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
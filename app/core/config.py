@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -12,11 +13,63 @@ class Settings(BaseSettings):
 
     # 数据库配置
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5  # 每个 worker 进程常驻的数据库连接数
+    DB_MAX_OVERFLOW: int = 10  # 连接池满时每个 worker 进程允许额外创建的连接数
+    DB_MAX_CONNECTIONS: Optional[int] = None  # 本服务可用的数据库连接总数，不配置时从 PostgreSQL 读取
+    DB_POOL_TIMEOUT_SECONDS: float = 30  # 连接池耗尽时等待空闲连接的最长时间（秒）
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # 连接使用超过该时间后重建（秒），-1 表示不重建
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30  # 连接空闲超过该时间才在取出时检测可用性（秒），0 表示每次取出都检测
+    DATABASE_READ_URL: Optional[str] = None  # 只读查询使用的数据库地址（只读副本或 PgBouncer），不配置时使用 DATABASE_URL
+    DATABASE_READ_PGBOUNCER: bool = False  # 只读地址是否为事务模式的 PgBouncer（关闭预编译语句缓存）
+
+    # 服务启动配置（python -m app.server）
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # worker 进程数，0 表示按可用 CPU 核数
+    SERVER_LOOP: str = "auto"  # 事件循环: auto / uvloop / asyncio，auto 在已安装 uvloop 时使用 uvloop
+    SERVER_HTTP: str = "auto"  # HTTP 协议实现: auto / httptools / h11，auto 在已安装 httptools 时使用 httptools
+    SERVER_BACKLOG: int = 2048  # 等待 accept 的最大连接数
+    SERVER_KEEPALIVE_SECONDS: int = 65  # Keep-Alive 空闲超时（秒），应大于前置负载均衡的空闲超时
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30  # 优雅关闭时等待进行中请求的最长时间（秒）
+    SERVER_LIMIT_MAX_REQUESTS: int = 0  # 每个 worker 处理该数量请求后重启（控制内存增长），0 表示不重启
+    SERVER_LIMIT_CONCURRENCY: int = 0  # 每个 worker 最大并发连接数，超出返回 503，0 表示不限制
+    SERVER_ACCESS_LOG: bool = True  # 是否输出访问日志
+
+    # Snowflake ID 配置
+    DATACENTER_ID: int = 1  # 数据中心 ID (0-31)，多节点/多容器部署时每个节点必须不同
+    WORKER_ID: Optional[int] = None  # 工作节点 ID (0-31)，不配置时本节点各进程通过文件锁自动租用
+    WORKER_ID_LEASE_DIR: str = ""  # worker ID 租约目录，为空时使用系统临时目录
 
     # JWT配置
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_ENABLED: bool = True  # 是否缓存已验证的 Token
+    TOKEN_CACHE_MAXSIZE: int = 4096  # Token 缓存最大条目数
+
+    # 密码哈希配置
+    BCRYPT_ROUNDS: int = 12  # bcrypt 成本因子 (4-31)，每加 1 耗时翻倍
+    PASSWORD_HASH_POOL_SIZE: int = 2  # 密码哈希专用线程池大小
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64  # 排队+执行中的最大任务数，超出直接拒绝
+
+    # 缓存配置
+    CACHE_REDIS_URL: Optional[str] = None  # 配置后使用 Redis 共享缓存（多 worker 部署）
+    USER_CACHE_ENABLED: bool = True  # 是否缓存已认证用户
+    USER_CACHE_TTL_SECONDS: int = 60  # 用户缓存过期时间（秒）
+    USER_CACHE_MAXSIZE: int = 1024  # 用户缓存最大条目数
+
+    LEVEL_REGISTRY_TTL_SECONDS: int = 60  # 会员等级注册表重新加载间隔（秒）
+
+    # 分页配置
+    PAGE_COUNT_MODE: Literal["exact", "cached", "estimated"] = "exact"  # 分页总数统计模式，加载配置时校验
+    PAGE_COUNT_CACHE_TTL_SECONDS: int = 10  # cached 模式下总数缓存时间（秒）
+    PAGE_COUNT_CACHE_MAXSIZE: int = 1024  # cached 模式下最多缓存的筛选条件组合数
+
+    # 库存流水配置
+    STOCK_SNAPSHOT_INTERVAL_SECONDS: int = 3600  # 库存快照生成间隔（秒），0 表示不自动生成
+
+    # 批量导入配置
+    IMPORT_CHUNK_SIZE: int = 2000  # 每批处理（并提交一次事务）的行数
 
     # CORS配置
     CORS_ORIGINS: str = ""  # 逗号分隔的字符串
@@ -0,0 +1,126 @@
+"""
+分页总数统计策略
+
+- exact: 精确统计，执行 COUNT(*)
+- cached: 精确统计结果按筛选条件缓存一段时间（PAGE_COUNT_CACHE_TTL_SECONDS）
+- estimated: 使用 PostgreSQL 查询规划器的估算值
+  无筛选条件时读取 pg_class.reltuples，有筛选条件时读取 EXPLAIN 的估算行数；
+  非 PostgreSQL 数据库或无统计信息时退回精确统计
+"""
+import json
+from enum import Enum
+from typing import Optional, Union
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import create_cache_backend
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class CountMode(str, Enum):
+    """总数统计模式"""
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+_count_cache = create_cache_backend(
+    "count",
+    maxsize=settings.PAGE_COUNT_CACHE_MAXSIZE,
+    ttl=settings.PAGE_COUNT_CACHE_TTL_SECONDS,
+    redis_url=settings.CACHE_REDIS_URL,
+)
+
+
+async def _count_exact(db: AsyncSession, query: Select) -> int:
+    """精确统计"""
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+
+def _explain_statement(query: Select, dialect) -> tuple[str, Union[tuple, dict]]:
+    """
+    编译 EXPLAIN 语句，筛选条件（含用户输入的搜索词）保持为绑定参数，不拼接进 SQL
+
+    Args:
+        query: 列表查询语句
+        dialect: 数据库方言
+
+    Returns:
+        tuple: (SQL, 驱动参数)，参数按方言的占位符风格为元组或字典
+    """
+    compiled = query.order_by(None).compile(dialect=dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return f"EXPLAIN (FORMAT JSON) {compiled.string}", params
+
+
+async def _count_estimated(db: AsyncSession, query: Select, table: str, filtered: bool) -> Optional[int]:
+    """
+    使用查询规划器估算总数
+
+    Returns:
+        Optional[int]: 估算值，无法估算时返回 None
+    """
+    if db.bind.dialect.name != "postgresql":
+        return None
+
+    if not filtered:
+        reltuples = await db.scalar(
+            text("SELECT reltuples FROM pg_class WHERE relname = :table AND relkind = 'r'"),
+            {"table": table},
+        )
+        # 从未 ANALYZE 过的表 reltuples 为 -1
+        if reltuples is None or reltuples < 0:
+            return None
+        return int(reltuples)
+
+    sql, params = _explain_statement(query, db.bind.dialect)
+    conn = await db.connection()
+    plan = (await conn.exec_driver_sql(sql, params)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_total(
+    db: AsyncSession,
+    query: Select,
+    table: str,
+    filters: tuple,
+    mode: Optional[CountMode] = None,
+) -> tuple[int, CountMode]:
+    """
+    按指定策略统计查询结果总数
+
+    Args:
+        db: 数据库会话
+        query: 列表查询语句（包含筛选条件，不含分页）
+        table: 主表名，用于缓存键和 reltuples 估算
+        filters: 筛选条件元组，用于缓存键；全部为 None 表示无筛选
+        mode: 统计模式，为空时使用配置 PAGE_COUNT_MODE
+
+    Returns:
+        tuple: (总数, 实际使用的统计模式)
+    """
+    mode = CountMode(mode or settings.PAGE_COUNT_MODE)
+
+    if mode == CountMode.ESTIMATED:
+        filtered = any(value is not None for value in filters)
+        estimated = await _count_estimated(db, query, table, filtered)
+        if estimated is not None:
+            return estimated, CountMode.ESTIMATED
+        return await _count_exact(db, query), CountMode.EXACT
+
+    if mode == CountMode.CACHED:
+        cache_key = f"{table}:{filters!r}"
+        total = await _count_cache.get(cache_key)
+        if total is None:
+            total = await _count_exact(db, query)
+            await _count_cache.set(cache_key, total)
+        return total, CountMode.CACHED
+
+    return await _count_exact(db, query), CountMode.EXACT
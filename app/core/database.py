@@ -1,33 +1,246 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from sqlalchemy import Engine, create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+from typing import AsyncGenerator
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
-# 创建数据库引擎
+# 同步驱动 -> 异步驱动 映射
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    将同步数据库连接字符串转换为对应的异步驱动连接字符串
+
+    Args:
+        url: 数据库连接字符串，如 postgresql://... 或 sqlite:///...
+
+    Returns:
+        str: 异步驱动连接字符串，如 postgresql+asyncpg://...
+    """
+    sa_url = make_url(url)
+    driver = _ASYNC_DRIVERS.get(sa_url.drivername)
+    if driver is None:
+        return url
+    return sa_url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+class _WaitTimedQueue(AsyncAdaptedQueue):
+    """阻塞取连接时（连接数已达上限，等待其他请求归还）统计等待时间"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting = 0  # 正在等待空闲连接的请求数
+        self.wait_total = 0.0  # 累计等待时间（秒）
+        self.wait_max = 0.0  # 最长等待时间（秒）
+
+    def get(self, block=True, timeout=None):
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.waiting -= 1
+            elapsed = time.perf_counter() - start
+            self.wait_total += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    记录取连接等待时间与超时次数的连接池，用于发现连接池耗尽
+
+    等待时间只统计等待空闲连接的时间，不含新建连接（建连耗时反映数据库延迟而非连接池容量）
+    """
+
+    _queue_class = _WaitTimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0  # 累计取连接次数
+        self.timeouts = 0  # 取连接超时次数
+
+    @property
+    def waiting(self) -> int:
+        return self._pool.waiting
+
+    @property
+    def wait_total(self) -> float:
+        return self._pool.wait_total
+
+    @property
+    def wait_max(self) -> float:
+        return self._pool.wait_max
+
+    def connect(self):
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"数据库连接池耗尽: {self.status()}")
+            raise
+        finally:
+            self.checkouts += 1
+
+
+def _install_idle_pre_ping(sync_engine: Engine, idle_seconds: float) -> None:
+    """
+    仅在连接空闲超过 idle_seconds 时，取出连接时检测连接是否可用
+
+    代替 pool_pre_ping（每次取出都多一次往返）。检测失败时连接池丢弃该连接并重新获取
+    """
+    dialect = sync_engine.dialect
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if time.monotonic() - connection_record.info.get("last_used", 0) < idle_seconds:
+            return
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            if dialect.is_disconnect(e, dbapi_connection, None):
+                raise exc.DisconnectionError("连接已断开") from e
+            raise
+
+
+def _create_api_engine(url: str, pgbouncer: bool = False) -> AsyncEngine:
+    """
+    创建 API 使用的异步引擎，连接池参数来自 Settings
+
+    Args:
+        url: 数据库连接字符串
+        pgbouncer: 是否经由 PgBouncer（事务模式）连接，是则关闭 asyncpg 预编译语句缓存
+    """
+    async_url = make_url(to_async_url(url))
+    options = {}
+    # SQLite 内存数据库使用驱动默认的单连接池
+    if not (async_url.get_backend_name() == "sqlite" and async_url.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=MonitoredQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    if pgbouncer and async_url.drivername == "postgresql+asyncpg":
+        options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+    engine = create_async_engine(
+        async_url,
+        pool_pre_ping=settings.DB_POOL_PRE_PING_IDLE_SECONDS == 0,
+        echo=settings.DEBUG,
+        **options,
+    )
+    if settings.DB_POOL_PRE_PING_IDLE_SECONDS > 0:
+        _install_idle_pre_ping(engine.sync_engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    return engine
+
+
+# 创建数据库引擎（同步，供建表脚本、命令行工具使用）
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     echo=settings.DEBUG,
 )
 
-# 创建会话工厂
+# 创建会话工厂（同步）
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 创建异步数据库引擎（供 API 路由使用，避免阻塞事件循环）
+async_engine = _create_api_engine(settings.DATABASE_URL)
+
+# 只读引擎（配置 DATABASE_READ_URL 时列表查询走只读地址，否则与主引擎相同）
+if settings.DATABASE_READ_URL:
+    async_read_engine = _create_api_engine(settings.DATABASE_READ_URL, pgbouncer=settings.DATABASE_READ_PGBOUNCER)
+else:
+    async_read_engine = async_engine
+
+# 创建异步会话工厂
+# expire_on_commit=False：提交后不使对象过期，避免在异步上下文中触发隐式懒加载
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+) if async_read_engine is not async_engine else AsyncSessionLocal
+
 # 创建基类
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    数据库会话依赖
+    数据库会话依赖（异步）
     用于FastAPI依赖注入
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    只读数据库会话依赖（异步）
+    用于只读的列表查询，未配置 DATABASE_READ_URL 时与 get_db 相同
+    """
+    async with AsyncReadSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def pool_metrics(engine: AsyncEngine) -> dict:
+    """
+    连接池实时指标
+
+    Args:
+        engine: 异步引擎
+
+    Returns:
+        dict: 连接池大小、已取出连接数、溢出连接数、等待数、等待时间与超时次数
+    """
+    pool = engine.pool
+    if not isinstance(pool, MonitoredQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checkedOut": pool.checkedout(),
+        "checkedIn": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "maxOverflow": pool._max_overflow,
+        "waiting": pool.waiting,
+        "checkouts": pool.checkouts,
+        "waitAvgMs": round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+        "waitMaxMs": round(pool.wait_max * 1000, 3),
+        "timeouts": pool.timeouts,
+    }
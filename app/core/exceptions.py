@@ -68,3 +68,10 @@ class InternalErrorException(AppException):
 
     def __init__(self, msg: str = "服务器内部错误", data: Any = None):
         super().__init__(msg, ResponseCode.INTERNAL_ERROR, data)
+
+
+class ServiceUnavailableException(AppException):
+    """服务暂不可用异常 (503)"""
+
+    def __init__(self, msg: str = "系统繁忙，请稍后重试", data: Any = None):
+        super().__init__(msg, ResponseCode.SERVICE_UNAVAILABLE, data)
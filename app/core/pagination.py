@@ -0,0 +1,90 @@
+"""
+游标（Keyset）分页工具
+
+游标基于 (created_at, id) 排序键：id 为 Snowflake ID，本身按时间递增，
+作为 created_at 相同时的稳定排序依据。
+无论翻到第几页，查询代价都与第一页相同，不受 OFFSET 深度影响。
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Select, tuple_
+
+from app.core.exceptions import BadRequestException
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    生成不透明游标
+
+    Args:
+        created_at: 当前页最后一条记录的创建时间
+        id: 当前页最后一条记录的 ID
+
+    Returns:
+        str: URL 安全的游标字符串
+    """
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    解析游标
+
+    Args:
+        cursor: encode_cursor 生成的游标
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        BadRequestException: 游标格式无效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise BadRequestException("无效的游标")
+
+
+def apply_keyset(query: Select, model, cursor: Optional[str], page_size: int) -> Select:
+    """
+    为查询添加游标条件、排序和数量限制（按创建时间倒序）
+
+    多取一条记录用于判断是否还有下一页，配合 build_next_cursor 使用
+
+    Args:
+        query: 查询语句
+        model: 含 created_at 和 id 字段的模型类
+        cursor: 上一页返回的游标，为空表示第一页
+        page_size: 每页数量
+
+    Returns:
+        Select: 添加分页条件后的查询语句
+    """
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, last_id))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(page_size + 1)
+
+
+def build_next_cursor(rows: list, page_size: int) -> tuple[list, Optional[str]]:
+    """
+    截取当前页数据并生成下一页游标
+
+    Args:
+        rows: apply_keyset 查询返回的记录（最多 page_size + 1 条）
+        page_size: 每页数量
+
+    Returns:
+        tuple: (当前页记录, 下一页游标)，没有下一页时游标为 None
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
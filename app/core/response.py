@@ -15,6 +15,7 @@ class ResponseCode(int, Enum):
     NOT_FOUND = 404
     CONFLICT = 409
     INTERNAL_ERROR = 500
+    SERVICE_UNAVAILABLE = 503
 
 
 T = TypeVar("T")
@@ -47,9 +48,46 @@ class PageResponse(BaseModel, Generic[T]):
     Attributes:
         total: 总记录数
         items: 数据列表
+        total_mode: 总数统计模式（exact / cached / estimated），仅分页列表返回
     """
     total: int = Field(default=0, description="总记录数")
     items: list[T] = Field(default_factory=list, description="数据列表")
+    total_mode: Optional[str] = Field(default=None, serialization_alias="totalMode", description="总数统计模式")
+
+    @model_serializer(mode="wrap")
+    def _omit_total_mode(self, handler):
+        """未执行总数统计（不分页的列表）时不输出 totalMode"""
+        data = handler(self)
+        if self.total_mode is None:
+            data.pop("totalMode", None)
+            data.pop("total_mode", None)
+        return data
+
+
+class CursorPageResponse(BaseModel, Generic[T]):
+    """
+    游标分页响应格式
+
+    Attributes:
+        items: 数据列表
+        next_cursor: 下一页游标，为空表示没有更多数据
+        total: 总记录数（仅在请求时返回）
+    """
+    items: list[T] = Field(default_factory=list, description="数据列表")
+    next_cursor: Optional[str] = Field(default=None, serialization_alias="nextCursor", description="下一页游标")
+    total: Optional[int] = Field(default=None, description="总记录数")
+
+
+class ImportRowError(BaseModel):
+    """
+    批量导入的错误行
+
+    Attributes:
+        line: 行号（从 1 开始，CSV 含表头行）
+        msg: 错误信息
+    """
+    line: int = Field(..., description="行号")
+    msg: str = Field(..., description="错误信息")
 
 
 def success_response(data: Any = None, msg: str = "success", code: ResponseCode = ResponseCode.SUCCESS) -> Response:
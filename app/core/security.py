@@ -1,15 +1,37 @@
 """
 安全相关功能：密码加密、JWT Token 生成和验证
 """
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 from jose import JWTError, jwt
 import bcrypt
+from app.core.cache import LRUCache
 from app.core.config import get_settings
-from app.core.exceptions import UnauthorizedException
+from app.core.exceptions import UnauthorizedException, ServiceUnavailableException
 
 settings = get_settings()
 
+R = TypeVar("R")
+
+# 密码哈希专用线程池
+# bcrypt 计算期间会释放 GIL，放到独立线程池中执行可避免阻塞事件循环，
+# 同时与 FastAPI 默认线程池隔离，登录高峰不会挤占其他同步任务
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_POOL_SIZE,
+    thread_name_prefix="password-hash",
+)
+_password_pending = 0
+_password_pending_lock = threading.Lock()
+
+# 已验证 Token 缓存：Token 摘要 -> 解码后的数据，条目在 Token 过期时淘汰
+# 只缓存签名校验通过的 Token，因此只能在进程内使用
+_token_cache = LRUCache(maxsize=settings.TOKEN_CACHE_MAXSIZE)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -38,10 +60,68 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: 哈希密码
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
+async def _run_password_task(func: Callable[..., R], *args) -> R:
+    """
+    在密码哈希线程池中执行任务
+
+    排队与执行中的任务总数超过 PASSWORD_HASH_QUEUE_LIMIT 时直接拒绝，
+    避免登录洪峰时请求无限堆积
+
+    Args:
+        func: 要执行的函数
+        *args: 函数参数
+
+    Returns:
+        函数返回值
+
+    Raises:
+        ServiceUnavailableException: 队列已满
+    """
+    global _password_pending
+    with _password_pending_lock:
+        if _password_pending >= settings.PASSWORD_HASH_QUEUE_LIMIT:
+            raise ServiceUnavailableException()
+        _password_pending += 1
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        with _password_pending_lock:
+            _password_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    验证密码（异步，在密码哈希线程池中执行）
+
+    Args:
+        plain_password: 明文密码
+        hashed_password: 哈希密码
+
+    Returns:
+        bool: 是否匹配
+    """
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    加密密码（异步，在密码哈希线程池中执行）
+
+    Args:
+        password: 明文密码
+
+    Returns:
+        str: 哈希密码
+    """
+    return await _run_password_task(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     创建 JWT Token
@@ -81,12 +161,37 @@ def decode_access_token(token: str) -> dict:
     Raises:
         UnauthorizedException: Token 无效或过期
     """
+    cache_key = None
+    if settings.TOKEN_CACHE_ENABLED:
+        cache_key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError as e:
         raise UnauthorizedException("Token无效或已过期")
 
+    # 缓存到 Token 过期为止；没有过期时间的 Token 不缓存
+    exp = payload.get("exp")
+    if cache_key is not None and isinstance(exp, (int, float)):
+        ttl = exp - time.time()
+        if ttl > 0:
+            _token_cache.set(cache_key, dict(payload), ttl=ttl)
+
+    return payload
+
+
+def get_token_cache_stats() -> dict:
+    """
+    获取 Token 缓存统计信息
+
+    Returns:
+        dict: 包含 size、maxsize、hits、misses
+    """
+    return _token_cache.stats()
+
 
 def get_user_id_from_token(token: str) -> int:
     """
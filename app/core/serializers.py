@@ -0,0 +1,147 @@
+"""
+响应序列化器注册表
+
+列表接口按响应形状（如 Response[PageResponse[ProductResponse]]）在导入路由模块时预先构建 pydantic-core 序列化器：
+把响应模型的核心 schema 中的模型（model）转换为同结构的 TypedDict，保留字段别名与字段序列化器（ID 转字符串等），
+之后直接把 ORM 对象 / 查询行的字段字典序列化为 JSON 字节。
+
+- 不创建中间的 pydantic 模型实例，也不做校验（数据来自数据库，类型已确定）
+- 输出与 FastAPI 按响应模型序列化的结果逐字节一致
+- 列表查询用 select_fields 只查询响应所需的列，返回 Row 而不是 ORM 实体
+"""
+from typing import Any, Iterable
+
+from fastapi import Response as HTTPResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import SchemaSerializer, core_schema
+from sqlalchemy import Select, inspect, select
+
+from app.core.response import ResponseCode
+
+
+def _to_typed_dict_schema(schema: Any) -> Any:
+    """递归地把核心 schema 中的 model 替换为字段相同的 typed-dict"""
+    if isinstance(schema, list):
+        return [_to_typed_dict_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    if schema.get("type") == "model":
+        fields = schema["schema"]["fields"]
+        return core_schema.typed_dict_schema(
+            {
+                name: core_schema.typed_dict_field(
+                    _to_typed_dict_schema(field["schema"]),
+                    serialization_alias=field.get("serialization_alias"),
+                )
+                for name, field in fields.items()
+            },
+            ref=schema.get("ref"),
+        )
+    return {key: _to_typed_dict_schema(value) for key, value in schema.items()}
+
+
+def model_fields(model: type[BaseModel]) -> tuple[str, ...]:
+    """响应模型的字段名（即需要从 ORM 对象 / 查询行读取的字段）"""
+    return tuple(model.model_fields)
+
+
+def select_fields(entity: Any, fields: tuple[str, ...]) -> Select:
+    """
+    只读投影查询：按响应字段顺序只查询实体上对应的列
+
+    返回的是 Row（命名元组），不创建 ORM 实体：不进入会话标识映射、没有变更跟踪和延迟加载，
+    每行的内存与 CPU 开销远小于实体。实体上不存在的字段（如 level_name）跳过，由调用方补充。
+
+    Args:
+        entity: ORM 模型类
+        fields: 响应字段名（model_fields 的结果）
+
+    Returns:
+        Select: 查询语句，可继续添加筛选、排序与分页条件
+    """
+    columns = inspect(entity).column_attrs
+    return select(*(getattr(entity, field) for field in fields if field in columns))
+
+
+def rows_to_dicts(rows: Iterable[Any], fields: tuple[str, ...]) -> list[dict]:
+    """
+    把 select_fields 查询的行转换为字段字典（行的列与 fields 一一对应）
+
+    Args:
+        rows: 查询行
+        fields: 字段名
+
+    Returns:
+        list[dict]: 字段字典列表
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def to_field_dicts(rows: Iterable[Any], fields: tuple[str, ...]) -> list[dict]:
+    """
+    把 ORM 对象或查询行转换为字段字典
+
+    Args:
+        rows: ORM 对象或 Row
+        fields: 字段名
+
+    Returns:
+        list[dict]: 字段字典列表
+    """
+    return [{field: getattr(row, field) for field in fields} for row in rows]
+
+
+class ResponseSerializer:
+    """单个响应形状的序列化器"""
+
+    def __init__(self, response_type: Any):
+        """
+        Args:
+            response_type: 响应类型，如 Response[PageResponse[ProductResponse]]
+        """
+        self.response_type = response_type
+        schema = _to_typed_dict_schema(TypeAdapter(response_type).core_schema)
+        self._serializer = SchemaSerializer(schema)
+
+    def to_json(self, data: Any, msg: str = "success", code: ResponseCode = ResponseCode.SUCCESS) -> bytes:
+        """
+        序列化统一响应
+
+        Args:
+            data: 与响应模型结构相同的字典（字段名为模型字段名，不是别名；按字典顺序输出，需与模型字段顺序一致）
+            msg: 消息描述
+            code: 状态码
+
+        Returns:
+            bytes: JSON 字节
+        """
+        return self._serializer.to_json({"code": code, "msg": msg, "data": data}, by_alias=True)
+
+    def response(self, data: Any, msg: str = "success", code: ResponseCode = ResponseCode.SUCCESS) -> HTTPResponse:
+        """序列化统一响应并包装为 HTTP 响应（FastAPI 对返回的 Response 对象不再二次序列化）"""
+        return HTTPResponse(content=self.to_json(data, msg, code), media_type="application/json")
+
+
+class SerializerRegistry:
+    """响应序列化器注册表（按响应类型缓存）"""
+
+    def __init__(self):
+        self._serializers: dict[Any, ResponseSerializer] = {}
+
+    def register(self, response_type: Any) -> ResponseSerializer:
+        """注册（构建）响应类型的序列化器，重复注册返回同一实例"""
+        serializer = self._serializers.get(response_type)
+        if serializer is None:
+            serializer = self._serializers[response_type] = ResponseSerializer(response_type)
+        return serializer
+
+    def get(self, response_type: Any) -> ResponseSerializer:
+        """获取已注册的序列化器"""
+        return self._serializers[response_type]
+
+    def __iter__(self):
+        return iter(self._serializers.values())
+
+
+serializer_registry = SerializerRegistry()
@@ -2,14 +2,24 @@
 Snowflake ID 生成器
 生成 64 位整形的唯一 ID
 结构: 1位符号位 + 41位时间戳 + 5位数据中心ID + 5位工作节点ID + 12位序列号
+
+线程安全：序列号与时间戳在锁内更新；批量生成时一次预留同一毫秒内连续的一段序列号
 """
+import os
+import threading
 import time
+from datetime import datetime
 from typing import Optional
 from app.core.config import get_settings
+from app.core.worker_id import WorkerIdLease
 
 settings = get_settings()
 
 
+class ClockMovedBackwardsError(RuntimeError):
+    """时钟回拨超过容忍范围"""
+
+
 class SnowflakeIDGenerator:
     """Snowflake ID 生成器"""
 
@@ -31,6 +41,9 @@ class SnowflakeIDGenerator:
     DATACENTER_ID_SHIFT = SEQUENCE_BITS + WORKER_ID_BITS
     TIMESTAMP_SHIFT = SEQUENCE_BITS + WORKER_ID_BITS + DATACENTER_ID_BITS
 
+    # 可容忍的时钟回拨（毫秒），在此范围内等待时钟追上，超过则报错
+    MAX_CLOCK_BACKWARD_MS = 10
+
     def __init__(self, datacenter_id: int = 1, worker_id: int = 1):
         """
         初始化 ID 生成器
@@ -49,18 +62,71 @@ class SnowflakeIDGenerator:
         self.worker_id = worker_id
         self.sequence = 0
         self.last_timestamp = -1
+        self._lock = threading.Lock()
+        self._node_bits = (datacenter_id << self.DATACENTER_ID_SHIFT) | (worker_id << self.WORKER_ID_SHIFT)
 
     def _current_millis(self) -> int:
         """获取当前时间戳（毫秒）"""
-        return int(time.time() * 1000)
+        return time.time_ns() // 1_000_000
 
-    def _wait_next_millis(self, last_timestamp: int) -> int:
-        """等待下一毫秒"""
+    def _wait_until(self, target: int) -> int:
+        """休眠直到时钟到达 target 毫秒（不忙等）"""
         timestamp = self._current_millis()
-        while timestamp <= last_timestamp:
+        while timestamp < target:
+            time.sleep((target - timestamp) / 1000)
             timestamp = self._current_millis()
         return timestamp
 
+    def _reserve(self, count: int) -> tuple[int, int]:
+        """
+        在锁内预留同一毫秒内连续的一段序列号
+
+        Args:
+            count: 期望数量
+
+        Returns:
+            tuple[int, int]: (第一个 ID, 实际预留数量)，实际数量不超过该毫秒剩余的序列号
+
+        Raises:
+            ClockMovedBackwardsError: 时钟回拨超过 MAX_CLOCK_BACKWARD_MS
+        """
+        with self._lock:
+            timestamp = self._current_millis()
+
+            # 时钟回拨：小幅回拨等待时钟追上，大幅回拨拒绝生成
+            if timestamp < self.last_timestamp:
+                backward = self.last_timestamp - timestamp
+                if backward > self.MAX_CLOCK_BACKWARD_MS:
+                    raise ClockMovedBackwardsError(f"时钟回拨 {backward} 毫秒，拒绝生成 ID")
+                timestamp = self._wait_until(self.last_timestamp)
+
+            if timestamp == self.last_timestamp:
+                start = self.sequence + 1
+                # 本毫秒序列号已用完，等待下一毫秒
+                if start > self.MAX_SEQUENCE:
+                    timestamp = self._wait_until(self.last_timestamp + 1)
+                    start = 0
+            else:
+                start = 0
+
+            reserved = min(count, self.MAX_SEQUENCE + 1 - start)
+            self.sequence = start + reserved - 1
+            self.last_timestamp = timestamp
+        return ((timestamp - self.TWITTER_EPOCH) << self.TIMESTAMP_SHIFT) | self._node_bits | start, reserved
+
+    @classmethod
+    def id_at(cls, timestamp_ms: int) -> int:
+        """
+        返回指定毫秒时间戳生成的最小 ID（用于按时间范围查询以 ID 为时间键的数据）
+
+        Args:
+            timestamp_ms: 毫秒时间戳
+
+        Returns:
+            该毫秒内可能生成的最小 ID
+        """
+        return (timestamp_ms - cls.TWITTER_EPOCH) << cls.TIMESTAMP_SHIFT
+
     def generate_id(self) -> int:
         """
         生成唯一的 Snowflake ID
@@ -68,40 +134,68 @@ class SnowflakeIDGenerator:
         Returns:
             64 位整形的唯一 ID
         """
-        timestamp = self._current_millis()
+        return self._reserve(1)[0]
 
-        # 如果当前时间小于上次生成ID的时间，说明时钟回拨，抛出异常
-        if timestamp < self.last_timestamp:
-            raise Exception(f"时钟回拨。拒绝生成 ID {self.last_timestamp - timestamp} 毫秒")
+    def generate_ids(self, count: int) -> list[int]:
+        """
+        批量生成唯一的 Snowflake ID
 
-        # 如果是同一毫秒内生成的ID
-        if timestamp == self.last_timestamp:
-            # 序列号自增
-            self.sequence = (self.sequence + 1) & self.MAX_SEQUENCE
-            # 如果序列号溢出，等待下一毫秒
-            if self.sequence == 0:
-                timestamp = self._wait_next_millis(self.last_timestamp)
-        else:
-            # 不同毫秒，序列号重置
-            self.sequence = 0
+        每次加锁预留一段连续序列号，一毫秒最多 4096 个，超出部分在下一毫秒继续预留
 
-        self.last_timestamp = timestamp
+        Args:
+            count: 数量
 
-        # 组合生成 ID
-        snowflake_id = (
-            ((timestamp - self.TWITTER_EPOCH) << self.TIMESTAMP_SHIFT)
-            | (self.datacenter_id << self.DATACENTER_ID_SHIFT)
-            | (self.worker_id << self.WORKER_ID_SHIFT)
-            | self.sequence
-        )
+        Returns:
+            按生成顺序（递增）排列的唯一 ID 列表
+        """
+        ids = []
+        while len(ids) < count:
+            first_id, reserved = self._reserve(count - len(ids))
+            ids.extend(range(first_id, first_id + reserved))
+        return ids
+
+
+# 全局 ID 生成器（每个进程一个，首次使用时创建）
+# 未配置 WORKER_ID 时通过文件锁租用本节点空闲的 worker ID，多 worker 进程互不冲突
+_id_generator: Optional[SnowflakeIDGenerator] = None
+_generator_pid: Optional[int] = None
+_worker_lease: Optional[WorkerIdLease] = None
+_generator_lock = threading.Lock()
+
+
+def _get_id_generator() -> SnowflakeIDGenerator:
+    """获取本进程的 ID 生成器（fork 后的子进程会重新分配 worker ID）"""
+    global _id_generator, _generator_pid, _worker_lease
+    if _id_generator is not None and _generator_pid == os.getpid():
+        return _id_generator
+
+    with _generator_lock:
+        if _id_generator is not None and _generator_pid == os.getpid():
+            return _id_generator
 
-        return snowflake_id
+        if _worker_lease is not None:
+            # 继承自父进程的租约，只关闭描述符
+            _worker_lease.release()
+            _worker_lease = None
 
+        worker_id = settings.WORKER_ID
+        if worker_id is None:
+            _worker_lease = WorkerIdLease(settings.WORKER_ID_LEASE_DIR, SnowflakeIDGenerator.MAX_WORKER_ID)
+            worker_id = _worker_lease.acquire()
 
-# 创建全局 ID 生成器实例
-_datacenter_id = getattr(settings, "DATACENTER_ID", 1)
-_worker_id = getattr(settings, "WORKER_ID", 1)
-_id_generator = SnowflakeIDGenerator(datacenter_id=_datacenter_id, worker_id=_worker_id)
+        _id_generator = SnowflakeIDGenerator(datacenter_id=settings.DATACENTER_ID, worker_id=worker_id)
+        _generator_pid = os.getpid()
+        return _id_generator
+
+
+def release_worker_id() -> None:
+    """释放本进程租用的 worker ID（应用关闭时调用）"""
+    global _id_generator, _worker_lease
+    with _generator_lock:
+        if _worker_lease is not None:
+            _worker_lease.release()
+            _worker_lease = None
+        _id_generator = None
 
 
 def generate_snowflake_id() -> int:
@@ -111,4 +205,32 @@ def generate_snowflake_id() -> int:
     Returns:
         64 位整形的唯一 ID
     """
-    return _id_generator.generate_id()
+    return _get_id_generator().generate_id()
+
+
+def generate_snowflake_ids(count: int) -> list[int]:
+    """
+    批量生成 Snowflake ID（批量导入时使用）
+
+    Args:
+        count: 数量
+
+    Returns:
+        按生成顺序排列的唯一 ID 列表
+    """
+    return _get_id_generator().generate_ids(count)
+
+
+def snowflake_id_at(moment: datetime) -> int:
+    """
+    返回指定时间生成的最小 Snowflake ID
+
+    ID < snowflake_id_at(t) 的记录都生成于 t 之前
+
+    Args:
+        moment: 时间（与 created_at 一致，使用本地时间）
+
+    Returns:
+        64 位整形 ID 下界
+    """
+    return SnowflakeIDGenerator.id_at(int(moment.timestamp() * 1000))
@@ -0,0 +1,97 @@
+"""
+Snowflake worker ID 租约
+
+同一节点上的多个进程（uvicorn/gunicorn 多 worker）各自需要不同的 worker ID，
+否则同一毫秒内生成的 ID 会重复。
+
+实现：租约目录下为每个 worker ID 准备一个锁文件（slot-00.lock ~ slot-31.lock），
+进程依次尝试对锁文件加非阻塞排他锁（flock），第一个加锁成功的编号即为本进程的 worker ID。
+- 锁由操作系统持有，进程退出（包括崩溃）时自动释放，不会残留过期租约
+- 正常关闭时调用 release() 主动释放
+- 租约只在同一节点（共享同一租约目录）内互斥，多节点/多容器部署需为每个节点配置不同的 DATACENTER_ID
+"""
+import logging
+import os
+import tempfile
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_DIR = os.path.join(tempfile.gettempdir(), "shop-backend-worker-ids")
+
+
+class WorkerIdLease:
+    """基于文件锁的 worker ID 租约"""
+
+    def __init__(self, lease_dir: str, max_worker_id: int):
+        """
+        Args:
+            lease_dir: 租约目录（同一节点的所有进程必须一致）
+            max_worker_id: 最大 worker ID
+        """
+        self.lease_dir = lease_dir or DEFAULT_LEASE_DIR
+        self.max_worker_id = max_worker_id
+        self.worker_id: Optional[int] = None
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def _slot_path(self, worker_id: int) -> str:
+        return os.path.join(self.lease_dir, f"slot-{worker_id:02d}.lock")
+
+    def acquire(self) -> int:
+        """
+        租用一个空闲的 worker ID
+
+        Returns:
+            int: worker ID
+
+        Raises:
+            RuntimeError: 当前平台不支持文件锁，或所有 worker ID 均已被占用
+        """
+        if self.worker_id is not None:
+            return self.worker_id
+        if fcntl is None:
+            raise RuntimeError("当前平台不支持自动分配 worker ID，请配置 WORKER_ID")
+
+        os.makedirs(self.lease_dir, exist_ok=True)
+        for worker_id in range(self.max_worker_id + 1):
+            fd = os.open(self._slot_path(worker_id), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+
+            # 写入进程号便于排查
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+            self._fd = fd
+            self._pid = os.getpid()
+            self.worker_id = worker_id
+            logger.info(f"进程 {os.getpid()} 租用 worker ID {worker_id}")
+            return worker_id
+
+        raise RuntimeError(f"worker ID 已全部被占用（0-{self.max_worker_id}），请减少进程数或使用不同的 DATACENTER_ID")
+
+    def release(self) -> None:
+        """
+        释放租约
+
+        fork 出的子进程继承了父进程的锁文件描述符（与父进程共享同一把锁），
+        子进程中只关闭描述符，不解锁，以免释放父进程的租约
+        """
+        if self._fd is None:
+            return
+        try:
+            if self._pid == os.getpid():
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            logger.info(f"进程 {os.getpid()} 释放 worker ID {self.worker_id}")
+            self._fd = None
+            self.worker_id = None
@@ -1,85 +1,65 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.snowflake import generate_snowflake_id
 from app.models.user import User
 from app.schemas.user import UserCreate
 
 
 class UserDAO:
-    """用户数据访问对象"""
+    """用户数据访问对象（异步会话）"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_by_id(self, user_id: int) -> Optional[User]:
+    async def get_by_id(self, user_id: int) -> Optional[User]:
         """根据ID获取用户"""
-        return self.db.query(User).filter(User.id == user_id).first()
+        return await self.db.scalar(select(User).where(User.id == user_id))
 
-    def get_by_username(self, username: str) -> Optional[User]:
-        """根据用户名获取用户"""
-        return self.db.query(User).filter(User.username == username).first()
-
-    def get_by_email(self, email: str) -> Optional[User]:
-        """根据邮箱获取用户"""
-        return self.db.query(User).filter(User.email == email).first()
-
-    def get_by_username_or_email(self, identifier: str) -> Optional[User]:
-        """根据用户名或邮箱获取用户"""
-        return (
-            self.db.query(User)
-            .filter(or_(User.username == identifier, User.email == identifier))
-            .first()
-        )
-
-    def create(self, user_create: UserCreate) -> User:
-        """创建新用户"""
-        from passlib.context import CryptContext
-
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        hashed_password = pwd_context.hash(user_create.password)
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """根据登录账号获取用户"""
+        return await self.db.scalar(select(User).where(User.username == username))
 
+    async def create(self, user_create: UserCreate) -> User:
+        """创建新用户（密码在密码哈希线程池中加密）"""
         db_user = User(
+            id=generate_snowflake_id(),
             username=user_create.username,
-            email=user_create.email,
-            full_name=user_create.full_name,
+            name=user_create.name,
+            password=await get_password_hash_async(user_create.password),
+            admin_flag=user_create.admin_flag,
             phone=user_create.phone,
-            hashed_password=hashed_password,
         )
 
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
         return db_user
 
-    def update(self, user: User) -> User:
+    async def update(self, user: User) -> User:
         """更新用户"""
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
         return user
 
-    def delete(self, user_id: int) -> bool:
+    async def delete(self, user_id: int) -> bool:
         """删除用户"""
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if user:
-            self.db.delete(user)
-            self.db.commit()
+            await self.db.delete(user)
+            await self.db.commit()
             return True
         return False
 
-    def list_all(self, skip: int = 0, limit: int = 100) -> list[User]:
+    async def list_all(self, skip: int = 0, limit: int = 100) -> list[User]:
         """获取用户列表"""
-        return self.db.query(User).offset(skip).limit(limit).all()
+        return list((await self.db.scalars(select(User).order_by(User.id).offset(skip).limit(limit))).all())
 
-    def authenticate(self, username: str, password: str) -> Optional[User]:
+    async def authenticate(self, username: str, password: str) -> Optional[User]:
         """验证用户凭据"""
-        from passlib.context import CryptContext
-
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-        user = self.get_by_username_or_email(username)
+        user = await self.get_by_username(username)
         if not user:
             return None
-        if not pwd_context.verify(password, user.hashed_password):
+        if not await verify_password_async(password, user.password):
             return None
         return user
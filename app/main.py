@@ -1,12 +1,13 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError, HTTPException
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from pydantic import BaseModel
-from typing import Any
+import logging
 
 from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, async_engine, async_read_engine, pool_metrics
+from app.core.snowflake import release_worker_id
 from app.core.response import Response
 from app.core.exceptions import AppException
 from app.core.handlers import (
@@ -18,24 +19,41 @@ from app.core.handlers import (
     general_exception_handler,
 )
 from app.api import auth, customer_levels, customers, products, prices
+from app.api.deps import get_current_admin
+from app.models import User
+from app.service.product_search import ensure_sqlite_search_index
+from app.service.stock_ledger import stock_snapshot_scheduler
 
+logger = logging.getLogger(__name__)
 
-class PydanticResponse(JSONResponse):
-    """自定义响应类，确保 Pydantic 模型序列化时使用别名"""
-    def render(self, content: Any) -> bytes:
-        if isinstance(content, BaseModel):
-            content = content.model_dump(by_alias=True, exclude_none=True)
-        return super().render(content)
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时确保搜索索引存在并启动库存快照任务，关闭时停止任务并释放 worker ID"""
+    try:
+        async with AsyncSessionLocal() as db:
+            await ensure_sqlite_search_index(db)
+    except Exception as e:
+        # 索引未就绪不影响启动，商品搜索退回 LIKE
+        logger.warning(f"商品搜索索引初始化失败: {e}")
+    stock_snapshot_scheduler.start()
+    yield
+    await stock_snapshot_scheduler.stop()
+    release_worker_id()
+
+
 # 创建FastAPI应用实例
+# 不设置 default_response_class：声明了响应模型（-> Response[...]）的路由由 FastAPI 通过 pydantic-core
+# 直接序列化为 JSON 字节（使用别名），不再经过 Python dict + json.dumps 两次编码
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="超市后端管理系统API",
     debug=settings.DEBUG,
-    default_response_class=PydanticResponse,
+    lifespan=lifespan,
 )
 
 # 配置CORS
@@ -82,3 +100,16 @@ async def health_check():
     健康检查
     """
     return {"status": "healthy"}
+
+
+@app.get("/health/db-pool")
+async def db_pool_status(current_admin: User = Depends(get_current_admin)):
+    """
+    数据库连接池实时指标（本 worker 进程，仅管理员可访问）
+
+    checkedOut 接近 size + maxOverflow 且 waiting / waitMaxMs 升高时说明连接池即将耗尽
+    """
+    metrics = {"primary": pool_metrics(async_engine)}
+    if async_read_engine is not async_engine:
+        metrics["read"] = pool_metrics(async_read_engine)
+    return metrics
@@ -4,6 +4,7 @@ from app.models.customer_level import CustomerLevel
 from app.models.customer import Customer
 from app.models.product import Product
 from app.models.product_level_price import ProductLevelPrice
+from app.models.stock_movement import StockMovement, StockSnapshot
 
 __all__ = [
     "BaseEntity",
@@ -12,4 +13,6 @@ __all__ = [
     "Customer",
     "Product",
     "ProductLevelPrice",
+    "StockMovement",
+    "StockSnapshot",
 ]
@@ -1,10 +1,29 @@
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy import Column, BigInteger, DateTime
 from app.core.database import Base
 
+MONEY_SCALE = Decimal("0.01")
+
+
+def quantize_money(value):
+    """
+    金额按 Numeric(12, 2) 保留两位小数（四舍五入，与 PostgreSQL 一致）
+
+    写入时即规整，内存中的值与数据库存储值相同，提交后无需 refresh 重新读取
+    """
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(MONEY_SCALE, rounding=ROUND_HALF_UP)
+
 
 class BaseEntity(Base):
-    """基础实体类，包含通用字段"""
+    """
+    基础实体类，包含通用字段
+
+    id 由 Snowflake 生成，created_at / updated_at 为客户端默认值（由 SQLAlchemy 在写入时计算并回填到对象），
+    因此插入、更新后对象上的字段即为数据库中的值，提交后无需 refresh
+    """
     __abstract__ = True
 
     id = Column(BigInteger, primary_key=True, index=True, comment="主键ID (Snowflake ID)")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, BigInteger, ForeignKey
+from sqlalchemy import Column, String, Text, BigInteger, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseEntity
 
@@ -14,6 +14,14 @@ class Customer(BaseEntity):
     contact_person = Column(String(50), nullable=True, comment="联系人")
     address = Column(Text, nullable=False, comment="地址")
 
+    # 二级索引（与 migrations/0003_secondary_indexes.sql 保持一致）
+    __table_args__ = (
+        # 列表按创建时间倒序分页 / 游标翻页
+        Index("idx_customers_created_at", "created_at", "id"),
+        # 按等级筛选 + 创建时间倒序；前缀 level_id 同时支撑删除等级前的客户数统计
+        Index("idx_customers_level_id_created_at", "level_id", "created_at", "id"),
+    )
+
     # 关联关系
     level = relationship("CustomerLevel", backref="customers")
 
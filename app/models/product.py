@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Numeric, Integer, Text
-from app.models.base import BaseEntity
+from sqlalchemy import Column, String, Numeric, Integer, Text, DDL, Index, event
+from sqlalchemy.orm import validates
+from app.models.base import BaseEntity, quantize_money
 
 
 class Product(BaseEntity):
@@ -15,5 +16,47 @@ class Product(BaseEntity):
     purchase_price = Column(Numeric(12, 2), nullable=False, comment="进价")
     stock_qty = Column(Integer, default=0, nullable=False, comment="库存数量")
 
+    # 列表按创建时间倒序分页 / 游标翻页（与 migrations/0003_secondary_indexes.sql 保持一致）
+    __table_args__ = (
+        Index("idx_products_created_at", "created_at", "id"),
+    )
+
+    @validates("purchase_price")
+    def _quantize_price(self, key, value):
+        return quantize_money(value)
+
     def __repr__(self):
         return f"<Product(id={self.id}, name='{self.name}', barcode='{self.barcode}')>"
+
+
+# ============ 商品搜索索引 ============
+# 与 migrations/0001_product_search.sql 保持一致
+
+# PostgreSQL: pg_trgm GIN 索引，支持 LIKE '%关键词%' 走索引及相似度排序
+PRODUCT_SEARCH_DDL_POSTGRESQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_products_short_name_trgm ON products USING gin (short_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_products_barcode_trgm ON products USING gin (barcode gin_trgm_ops)",
+]
+
+# SQLite: FTS5 trigram 全文索引（rowid 即商品ID），由触发器与 products 表保持同步
+PRODUCT_SEARCH_DDL_SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(name, short_name, barcode, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, short_name, barcode)
+        VALUES (new.id, new.name, new.short_name, new.barcode);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        DELETE FROM products_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, short_name, barcode ON products BEGIN
+        UPDATE products_fts SET name = new.name, short_name = new.short_name, barcode = new.barcode
+        WHERE rowid = old.id;
+    END""",
+]
+
+for _statement in PRODUCT_SEARCH_DDL_POSTGRESQL:
+    event.listen(Product.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in PRODUCT_SEARCH_DDL_SQLITE:
+    event.listen(Product.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, BigInteger, Numeric, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship
-from app.models.base import BaseEntity
+from sqlalchemy import Column, BigInteger, Numeric, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship, validates
+from app.models.base import BaseEntity, quantize_money
 
 
 class ProductLevelPrice(BaseEntity):
@@ -12,14 +12,20 @@ class ProductLevelPrice(BaseEntity):
     level_id = Column(BigInteger, ForeignKey("customer_levels.id"), nullable=False, comment="会员等级ID")
     sale_price = Column(Numeric(12, 2), nullable=False, comment="销售价格")
 
-    # 唯一约束：同一商品同一等级只能有一个价格
+    # 唯一约束：同一商品同一等级只能有一个价格（同时支撑按商品查询价格）
+    # level_id 索引支撑删除等级前的价格数统计（与 migrations/0003_secondary_indexes.sql 保持一致）
     __table_args__ = (
         UniqueConstraint('product_id', 'level_id', name='unique_product_level'),
+        Index("idx_product_level_prices_level_id", "level_id"),
     )
 
     # 关联关系
     product = relationship("Product", backref="prices")
     level = relationship("CustomerLevel", backref="product_prices")
 
+    @validates("sale_price")
+    def _quantize_price(self, key, value):
+        return quantize_money(value)
+
     def __repr__(self):
         return f"<ProductLevelPrice(id={self.id}, product_id={self.product_id}, level_id={self.level_id}, sale_price={self.sale_price})>"
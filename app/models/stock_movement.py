@@ -0,0 +1,54 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Index, UniqueConstraint, DDL, event
+from app.models.base import BaseEntity
+
+
+class StockMovement(BaseEntity):
+    """
+    库存流水模型（只追加）
+
+    id 为 Snowflake ID，按时间递增，作为流水的时间键；
+    不设外键，商品删除后流水仍保留
+    """
+
+    __tablename__ = "stock_movements"
+
+    product_id = Column(BigInteger, nullable=False, comment="商品ID")
+    delta = Column(Integer, nullable=False, comment="库存变化量")
+    reason = Column(String(200), nullable=True, comment="变更原因")
+    user_id = Column(BigInteger, nullable=True, comment="操作用户ID")
+
+    __table_args__ = (
+        Index("idx_stock_movements_product_id", "product_id", "id"),
+    )
+
+    def __repr__(self):
+        return f"<StockMovement(id={self.id}, product_id={self.product_id}, delta={self.delta})>"
+
+
+class StockSnapshot(BaseEntity):
+    """
+    库存快照模型
+
+    记录商品截至某条流水（含）的库存，查询历史库存时从最近的快照开始累加之后的流水
+    """
+
+    __tablename__ = "stock_snapshots"
+
+    product_id = Column(BigInteger, nullable=False, comment="商品ID")
+    movement_id = Column(BigInteger, nullable=False, comment="快照包含的最后一条流水ID")
+    stock_qty = Column(Integer, nullable=False, comment="库存数量")
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "movement_id", name="unique_stock_snapshot"),
+    )
+
+    def __repr__(self):
+        return f"<StockSnapshot(product_id={self.product_id}, movement_id={self.movement_id}, stock_qty={self.stock_qty})>"
+
+
+# 期初快照：建表时已有商品的当前库存作为流水起点（movement_id = 0，快照ID沿用商品ID），
+# 与 migrations/0002_stock_ledger.sql 一致；对已有数据库执行 create_all 补建流水表时生效（含 SQLite）
+event.listen(StockSnapshot.__table__, "after_create", DDL(
+    "INSERT INTO stock_snapshots (id, product_id, movement_id, stock_qty, created_at, updated_at) "
+    "SELECT id, id, 0, stock_qty, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM products"
+))
@@ -25,10 +25,19 @@ from app.schemas.product import (
     ProductUpdate,
     ProductDelete,
     ProductById,
+    ProductByBarcode,
     ProductResponse,
     ProductDetailResponse,
+    ProductBarcodeResponse,
     StockUpdate,
+    StockLine,
+    StockBatchUpdate,
+    StockLevelResponse,
+    StockMovementResponse,
+    StockAtResponse,
+    StockReportResponse,
     ProductPriceInDetail,
+    ProductImportResponse,
 )
 from app.schemas.price import (
     PriceCreate,
@@ -40,6 +49,8 @@ from app.schemas.price import (
     BatchPriceResponse,
     ProductPriceListResponse,
     PriceItemResponse,
+    PriceImportRow,
+    PriceImportResponse,
 )
 
 __all__ = [
@@ -67,10 +78,19 @@ __all__ = [
     "ProductUpdate",
     "ProductDelete",
     "ProductById",
+    "ProductByBarcode",
     "ProductResponse",
     "ProductDetailResponse",
+    "ProductBarcodeResponse",
     "StockUpdate",
+    "StockLine",
+    "StockBatchUpdate",
+    "StockLevelResponse",
+    "StockMovementResponse",
+    "StockAtResponse",
+    "StockReportResponse",
     "ProductPriceInDetail",
+    "ProductImportResponse",
     # Price
     "PriceCreate",
     "PriceDelete",
@@ -81,4 +101,6 @@ __all__ = [
     "BatchPriceResponse",
     "ProductPriceListResponse",
     "PriceItemResponse",
+    "PriceImportRow",
+    "PriceImportResponse",
 ]
@@ -1,11 +1,13 @@
 """
 价格相关的 Pydantic Schema
 """
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import AliasChoices, BaseModel, Field, field_serializer, model_validator
 from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
+from app.core.response import ImportRowError
+
 
 class PriceCreate(BaseModel):
     """价格创建 Schema"""
@@ -112,3 +114,36 @@ class BatchPriceResponse(BaseModel):
 
     class Config:
         populate_by_name = True
+
+
+class PriceImportRow(BaseModel):
+    """价格导入行（CSV 表头或 NDJSON 字段名，支持下划线与驼峰两种写法）"""
+    product_id: Optional[int] = Field(
+        None, validation_alias=AliasChoices("product_id", "productId"), description="商品ID（与条形码二选一）"
+    )
+    barcode: Optional[str] = Field(None, max_length=64, description="条形码（与商品ID二选一）")
+    level_id: int = Field(..., validation_alias=AliasChoices("level_id", "levelId"), description="会员等级ID")
+    sale_price: Decimal = Field(
+        ..., gt=0, validation_alias=AliasChoices("sale_price", "salePrice"), description="销售价格"
+    )
+
+    @model_validator(mode="after")
+    def check_product_reference(self) -> "PriceImportRow":
+        """商品ID与条形码至少提供一个"""
+        if self.product_id is None and not self.barcode:
+            raise ValueError("商品ID与条形码至少提供一个")
+        return self
+
+
+class PriceImportResponse(BaseModel):
+    """价格导入响应 Schema"""
+    total_rows: int = Field(0, serialization_alias="totalRows", description="读取的数据行数")
+    created_count: int = Field(0, serialization_alias="createdCount", description="创建数量")
+    updated_count: int = Field(0, serialization_alias="updatedCount", description="更新数量")
+    error_count: int = Field(0, serialization_alias="errorCount", description="错误行数")
+    errors: List[ImportRowError] = Field(
+        default_factory=list, serialization_alias="errors", description="错误行明细（最多返回前 1000 条）"
+    )
+
+    class Config:
+        populate_by_name = True
@@ -2,10 +2,12 @@
 商品相关的 Pydantic Schema
 """
 from pydantic import BaseModel, Field, field_serializer
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
+from app.core.response import ImportRowError
+
 
 class ProductCreate(BaseModel):
     """商品创建 Schema"""
@@ -52,6 +54,15 @@ class ProductById(BaseModel):
         populate_by_name = True
 
 
+class ProductByBarcode(BaseModel):
+    """根据条形码查询商品 Schema"""
+    barcode: str = Field(..., min_length=1, max_length=64, description="条形码")
+    level_id: Optional[int] = Field(None, description="会员等级ID（传入时返回该等级的销售价格）")
+
+    class Config:
+        populate_by_name = True
+
+
 class ProductResponse(BaseModel):
     """商品响应 Schema"""
     id: int = Field(..., serialization_alias="id", description="商品ID")
@@ -97,6 +108,17 @@ class ProductDetailResponse(BaseModel):
         populate_by_name = True
 
 
+class ProductBarcodeResponse(ProductResponse):
+    """条形码查询响应 Schema（带指定等级的销售价格）"""
+    level_id: Optional[int] = Field(None, serialization_alias="levelId", description="会员等级ID")
+    sale_price: Optional[Decimal] = Field(None, serialization_alias="salePrice", description="该等级销售价格（未设置时为空）")
+
+    @field_serializer('level_id')
+    def serialize_level_id(self, value: Optional[int]) -> Optional[str]:
+        """将等级ID序列化为字符串"""
+        return str(value) if value is not None else None
+
+
 class ProductPriceInDetail(BaseModel):
     """商品详情中的价格信息"""
     level_id: int = Field(..., serialization_alias="levelId", description="会员等级ID")
@@ -117,7 +139,105 @@ class StockUpdate(BaseModel):
     """库存更新 Schema"""
     id: int = Field(..., description="商品ID")
     delta: int = Field(..., description="库存变化量（正数增加，负数减少）")
-    reason: Optional[str] = Field(None, description="变更原因")
+    reason: Optional[str] = Field(None, max_length=200, description="变更原因")
+
+    class Config:
+        populate_by_name = True
+
+
+class StockLine(BaseModel):
+    """库存调整行"""
+    id: int = Field(..., description="商品ID")
+    delta: int = Field(..., description="库存变化量（正数增加，负数减少）")
+
+    class Config:
+        populate_by_name = True
+
+
+class StockBatchUpdate(BaseModel):
+    """批量库存调整 Schema"""
+    lines: List[StockLine] = Field(..., min_length=1, max_length=500, description="调整行（同一商品可出现多次，合并计算）")
+    reason: Optional[str] = Field(None, max_length=200, description="变更原因")
+
+    class Config:
+        populate_by_name = True
+
+
+class StockLevelResponse(BaseModel):
+    """调整后的商品库存"""
+    id: int = Field(..., serialization_alias="id", description="商品ID")
+    stock_qty: int = Field(..., serialization_alias="stockQty", description="库存数量")
+
+    @field_serializer('id')
+    def serialize_id(self, value: int) -> str:
+        """将ID序列化为字符串"""
+        return str(value)
+
+    class Config:
+        populate_by_name = True
+
+
+class StockMovementResponse(BaseModel):
+    """库存流水响应 Schema"""
+    id: int = Field(..., serialization_alias="id", description="流水ID")
+    product_id: int = Field(..., serialization_alias="productId", description="商品ID")
+    delta: int = Field(..., serialization_alias="delta", description="库存变化量")
+    reason: Optional[str] = Field(None, serialization_alias="reason", description="变更原因")
+    user_id: Optional[int] = Field(None, serialization_alias="userId", description="操作用户ID")
+    created_at: datetime = Field(..., serialization_alias="createdAt", description="发生时间")
+
+    @field_serializer('id', 'product_id', 'user_id')
+    def serialize_ids(self, value: Optional[int]) -> Optional[str]:
+        """将ID序列化为字符串"""
+        return str(value) if value is not None else None
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+
+
+class StockAtResponse(BaseModel):
+    """历史库存响应 Schema"""
+    id: int = Field(..., serialization_alias="id", description="商品ID")
+    at: datetime = Field(..., serialization_alias="at", description="查询时刻")
+    stock_qty: int = Field(..., serialization_alias="stockQty", description="库存数量")
+
+    @field_serializer('id')
+    def serialize_id(self, value: int) -> str:
+        """将ID序列化为字符串"""
+        return str(value)
+
+    class Config:
+        populate_by_name = True
+
+
+class StockReportResponse(BaseModel):
+    """库存区间报表响应 Schema"""
+    id: int = Field(..., serialization_alias="id", description="商品ID")
+    start: datetime = Field(..., serialization_alias="start", description="开始时间")
+    end: datetime = Field(..., serialization_alias="end", description="结束时间")
+    opening_qty: int = Field(..., serialization_alias="openingQty", description="期初库存")
+    in_qty: int = Field(..., serialization_alias="inQty", description="入库数量")
+    out_qty: int = Field(..., serialization_alias="outQty", description="出库数量")
+    closing_qty: int = Field(..., serialization_alias="closingQty", description="期末库存")
+
+    @field_serializer('id')
+    def serialize_id(self, value: int) -> str:
+        """将ID序列化为字符串"""
+        return str(value)
+
+    class Config:
+        populate_by_name = True
+
+
+class ProductImportResponse(BaseModel):
+    """商品导入响应 Schema"""
+    total_rows: int = Field(0, serialization_alias="totalRows", description="读取的数据行数")
+    created_count: int = Field(0, serialization_alias="createdCount", description="创建数量")
+    error_count: int = Field(0, serialization_alias="errorCount", description="错误行数")
+    errors: List[ImportRowError] = Field(
+        default_factory=list, serialization_alias="errors", description="错误行明细（最多返回前 1000 条）"
+    )
 
     class Config:
         populate_by_name = True
@@ -0,0 +1,167 @@
+"""
+生产环境启动入口
+
+    python -m app.server
+
+按可用 CPU 核数启动多个 uvicorn worker 进程，所有参数来自 Settings（环境变量 / .env），
+开发环境仍使用根目录的 main.py（单进程、自动重载）。
+
+启动前校验:
+- 固定 WORKER_ID 时只能启动 1 个 worker（否则各进程 Snowflake ID 冲突），自动租用时不超过 worker ID 上限
+- worker 数 × 每个 worker 的连接池上限 (DB_POOL_SIZE + DB_MAX_OVERFLOW) 不超过数据库可用连接数
+"""
+import logging
+import math
+import os
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.core.config import Settings, get_settings
+from app.core.snowflake import SnowflakeIDGenerator
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """
+    当前进程可用的 CPU 核数
+
+    考虑 CPU 亲和性（taskset / cpuset）与 cgroup v2 CPU 配额（docker --cpus）
+
+    Returns:
+        int: 可用核数，至少为 1
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def resolve_workers(settings: Settings) -> int:
+    """worker 进程数：SERVER_WORKERS 为 0 时按可用 CPU 核数"""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    return available_cpus()
+
+
+def check_worker_ids(settings: Settings, workers: int) -> None:
+    """
+    校验每个 worker 都能拿到不同的 Snowflake worker ID
+
+    Raises:
+        RuntimeError: 配置会导致 ID 冲突或 worker ID 不足
+    """
+    if settings.WORKER_ID is not None and workers > 1:
+        raise RuntimeError(
+            f"已固定 WORKER_ID={settings.WORKER_ID}，但要启动 {workers} 个 worker，"
+            f"请删除 WORKER_ID 配置以自动租用 worker ID"
+        )
+    if workers > SnowflakeIDGenerator.MAX_WORKER_ID + 1:
+        raise RuntimeError(f"worker 数 {workers} 超过 Snowflake worker ID 上限 {SnowflakeIDGenerator.MAX_WORKER_ID + 1}")
+
+
+def database_max_connections(settings: Settings) -> Optional[int]:
+    """
+    本服务可用的数据库连接总数
+
+    优先使用 DB_MAX_CONNECTIONS；未配置时从 PostgreSQL 读取
+    max_connections - superuser_reserved_connections，其他数据库返回 None（不校验）
+    """
+    if settings.DB_MAX_CONNECTIONS is not None:
+        return settings.DB_MAX_CONNECTIONS
+
+    if make_url(settings.DATABASE_URL).get_backend_name() != "postgresql":
+        return None
+
+    from app.core.database import engine
+
+    try:
+        with engine.connect() as conn:
+            max_connections = int(conn.scalar(text("SHOW max_connections")))
+            reserved = int(conn.scalar(text("SHOW superuser_reserved_connections")))
+    finally:
+        engine.dispose()
+    return max_connections - reserved
+
+
+def check_connection_budget(settings: Settings, workers: int, max_connections: Optional[int]) -> None:
+    """
+    校验 worker 数 × 每个 worker 的连接池上限不超过数据库可用连接数
+
+    Raises:
+        RuntimeError: 连接数超出
+    """
+    if max_connections is None:
+        return
+
+    per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    required = workers * per_worker
+    if required > max_connections:
+        raise RuntimeError(
+            f"{workers} 个 worker × 每个 {per_worker} 个连接 (DB_POOL_SIZE + DB_MAX_OVERFLOW) = {required}，"
+            f"超过数据库可用连接数 {max_connections}，请减少 SERVER_WORKERS 或连接池大小"
+        )
+    logger.info(f"数据库连接预算: {workers} × {per_worker} = {required} / {max_connections}")
+
+
+def build_uvicorn_options(settings: Settings, workers: int) -> dict:
+    """
+    构建 uvicorn.run 参数
+
+    Args:
+        settings: 配置
+        workers: worker 进程数
+
+    Returns:
+        dict: uvicorn.run 关键字参数
+    """
+    return {
+        "app": "app.main:app",
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": workers,
+        "loop": settings.SERVER_LOOP,
+        "http": settings.SERVER_HTTP,
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        # worker 达到请求数后退出，由 uvicorn 主进程重新拉起
+        "limit_max_requests": settings.SERVER_LIMIT_MAX_REQUESTS or None,
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY or None,
+        "access_log": settings.SERVER_ACCESS_LOG,
+    }
+
+
+def main() -> None:
+    """校验配置并启动多 worker 服务"""
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+    workers = resolve_workers(settings)
+
+    try:
+        check_worker_ids(settings, workers)
+        check_connection_budget(settings, workers, database_max_connections(settings))
+    except RuntimeError as e:
+        raise SystemExit(f"启动检查失败: {e}")
+
+    options = build_uvicorn_options(settings, workers)
+    logger.info(f"启动 {workers} 个 worker: {options}")
+    uvicorn.run(**options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+商品等级价格查询
+
+商品详情与商品价格列表共用同一查询，由 unique_product_level (product_id, level_id) 的前缀定位
+"""
+from sqlalchemy import Select, select
+
+from app.models.product_level_price import ProductLevelPrice
+
+
+def build_product_prices_query(product_id: int) -> Select:
+    """
+    构建商品所有等级价格的查询（只取所需列，等级名称由等级注册表补充）
+
+    Args:
+        product_id: 商品ID
+
+    Returns:
+        Select: 返回 (id, level_id, sale_price, updated_at) 行的查询语句
+    """
+    return select(
+        ProductLevelPrice.id,
+        ProductLevelPrice.level_id,
+        ProductLevelPrice.sale_price,
+        ProductLevelPrice.updated_at,
+    ).where(ProductLevelPrice.product_id == product_id)
@@ -0,0 +1,146 @@
+"""
+会员等级注册表
+
+会员等级表数据量小且几乎不变，进程内缓存全部等级，
+用于等级存在性校验和列表接口填充等级名称，避免每次查询或关联等级表。
+
+一致性:
+- 本进程内的等级创建、更新、删除会同步更新注册表
+- 超过 LEVEL_REGISTRY_TTL_SECONDS 后整体重新加载（多 worker 部署的兜底）
+- 查询不存在的等级时立即重新加载一次，及时发现其他进程新建的等级
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.customer_level import CustomerLevel
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class LevelInfo:
+    """会员等级快照"""
+    id: int
+    level_name: str
+    created_at: Optional[datetime]
+
+
+class LevelRegistry:
+    """会员等级注册表"""
+
+    def __init__(self, ttl: float):
+        """
+        初始化注册表
+
+        Args:
+            ttl: 整体重新加载的间隔（秒）
+        """
+        self.ttl = ttl
+        self._levels: dict[int, LevelInfo] = {}
+        self._loaded_at: Optional[float] = None
+
+    @staticmethod
+    def _to_info(level: CustomerLevel) -> LevelInfo:
+        return LevelInfo(id=level.id, level_name=level.level_name, created_at=level.created_at)
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def load(self, db: AsyncSession) -> None:
+        """从数据库重新加载全部等级"""
+        levels = (await db.scalars(select(CustomerLevel).order_by(CustomerLevel.id))).all()
+        self._levels = {level.id: self._to_info(level) for level in levels}
+        self._loaded_at = time.monotonic()
+
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        if self._expired():
+            await self.load(db)
+
+    async def get(self, db: AsyncSession, level_id: int) -> Optional[LevelInfo]:
+        """
+        获取等级
+
+        Args:
+            db: 数据库会话（仅在需要加载时使用）
+            level_id: 等级ID
+
+        Returns:
+            Optional[LevelInfo]: 等级，不存在返回 None
+        """
+        await self._ensure_loaded(db)
+        level = self._levels.get(level_id)
+        if level is None:
+            # 可能是其他进程新建的等级，重新加载一次
+            await self.load(db)
+            level = self._levels.get(level_id)
+        return level
+
+    async def missing(self, db: AsyncSession, level_ids) -> set[int]:
+        """
+        返回不存在的等级ID集合
+
+        Args:
+            db: 数据库会话（仅在需要加载时使用）
+            level_ids: 要校验的等级ID
+
+        Returns:
+            set[int]: 不存在的等级ID
+        """
+        await self._ensure_loaded(db)
+        missing = set(level_ids) - self._levels.keys()
+        if missing:
+            await self.load(db)
+            missing = set(level_ids) - self._levels.keys()
+        return missing
+
+    async def names(self, db: AsyncSession, level_ids=()) -> dict[int, str]:
+        """
+        获取 等级ID -> 等级名称 映射
+
+        Args:
+            db: 数据库会话（仅在需要加载时使用）
+            level_ids: 本次需要的等级ID，有未知等级时重新加载一次
+
+        Returns:
+            dict[int, str]: 等级名称映射
+        """
+        await self.missing(db, level_ids)
+        return {level_id: level.level_name for level_id, level in self._levels.items()}
+
+    async def all(self, db: AsyncSession) -> list[LevelInfo]:
+        """
+        获取全部等级（按ID即创建顺序排列）
+
+        Args:
+            db: 数据库会话（仅在需要加载时使用）
+
+        Returns:
+            list[LevelInfo]: 等级列表
+        """
+        await self._ensure_loaded(db)
+        return list(self._levels.values())
+
+    def put(self, level: CustomerLevel) -> None:
+        """新增或更新等级（在事务提交后调用）"""
+        levels = dict(self._levels)
+        levels[level.id] = self._to_info(level)
+        self._levels = dict(sorted(levels.items()))
+
+    def remove(self, level_id: int) -> None:
+        """删除等级（在事务提交后调用）"""
+        levels = dict(self._levels)
+        levels.pop(level_id, None)
+        self._levels = levels
+
+    def invalidate(self) -> None:
+        """使注册表失效，下次使用时重新加载"""
+        self._loaded_at = None
+
+
+level_registry = LevelRegistry(ttl=settings.LEVEL_REGISTRY_TTL_SECONDS)
@@ -0,0 +1,120 @@
+"""
+批量导入商品等级价格
+
+逐批（IMPORT_CHUNK_SIZE 行）处理流式读入的记录：
+1. 用 PriceImportRow 校验每行
+2. 集合查询校验引用：商品ID一次 IN 查询、条形码一次 IN 查询、会员等级取自等级注册表
+3. 批量 upsert 写入并提交，每批一个事务，单个事务的大小有上限
+
+无效行记入错误报告并跳过，不影响同批其他行；
+写入失败（如校验后商品被删除、价格超出列精度）时回滚该批，本批各行记入错误报告，已提交的批次不受影响
+"""
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.product import Product
+from app.schemas.price import PriceImportRow, PriceImportResponse
+from app.service.level_registry import level_registry
+from app.service.price_upsert import upsert_level_prices
+from app.service.record_stream import Record, add_import_error, format_validation_error, iter_chunks
+
+settings = get_settings()
+
+
+async def _resolve_products(db: AsyncSession, rows: list[PriceImportRow]) -> tuple[set[int], dict[str, int]]:
+    """一次查询校验商品ID，一次查询将条形码解析为商品ID"""
+    product_ids = {row.product_id for row in rows if row.product_id is not None}
+    barcodes = {row.barcode for row in rows if row.product_id is None}
+
+    existing_ids = set()
+    if product_ids:
+        existing_ids = set((await db.scalars(select(Product.id).where(Product.id.in_(product_ids)))).all())
+
+    barcode_ids = {}
+    if barcodes:
+        barcode_ids = dict((await db.execute(
+            select(Product.barcode, Product.id).where(Product.barcode.in_(barcodes))
+        )).all())
+
+    return existing_ids, barcode_ids
+
+
+async def import_level_prices(db: AsyncSession, records: AsyncIterator[Record]) -> PriceImportResponse:
+    """
+    批量导入商品等级价格
+
+    每行提供商品ID或条形码（同时提供时以商品ID为准）、会员等级ID和销售价格；
+    同一商品同一等级出现多次时以最后一次为准
+
+    Args:
+        db: 数据库会话
+        records: 流式解析的 (行号, 记录, 错误信息)
+
+    Returns:
+        PriceImportResponse: 导入结果与逐行错误报告
+    """
+    report = PriceImportResponse()
+
+    async for chunk in iter_chunks(records, settings.IMPORT_CHUNK_SIZE):
+        report.total_rows += len(chunk)
+
+        # 逐行校验格式
+        valid = []
+        for line, data, error in chunk:
+            if error is not None:
+                add_import_error(report, line, error)
+                continue
+            try:
+                valid.append((line, PriceImportRow.model_validate(data)))
+            except ValidationError as e:
+                add_import_error(report, line, format_validation_error(e))
+
+        # 集合查询校验引用
+        existing_ids, barcode_ids = await _resolve_products(db, [row for _, row in valid])
+        missing_levels = await level_registry.missing(db, {row.level_id for _, row in valid})
+
+        lines = []
+        prices = []
+        for line, row in valid:
+            if row.product_id is not None:
+                product_id = row.product_id if row.product_id in existing_ids else None
+                if product_id is None:
+                    add_import_error(report, line, f"商品不存在: {row.product_id}")
+                    continue
+            else:
+                product_id = barcode_ids.get(row.barcode)
+                if product_id is None:
+                    add_import_error(report, line, f"条形码对应的商品不存在: {row.barcode}")
+                    continue
+            if row.level_id in missing_levels:
+                add_import_error(report, line, f"会员等级不存在: {row.level_id}")
+                continue
+            lines.append(line)
+            prices.append((product_id, row.level_id, row.sale_price))
+
+        # 批量写入，每批一个事务
+        if prices:
+            try:
+                created, updated = await upsert_level_prices(db, prices)
+                await db.commit()
+            except IntegrityError:
+                # 校验之后商品或等级被删除，本批整体回滚
+                await db.rollback()
+                for line in lines:
+                    add_import_error(report, line, "引用的商品或会员等级已被删除，本批未导入，请重试")
+                continue
+            except DataError:
+                await db.rollback()
+                for line in lines:
+                    add_import_error(report, line, "数据超出数据库列的范围（如价格过大），本批未导入")
+                continue
+            report.created_count += created
+            report.updated_count += updated
+
+    report.errors.sort(key=lambda error: error.line)
+    return report
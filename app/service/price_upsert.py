@@ -0,0 +1,131 @@
+"""
+商品等级价格批量写入
+
+按 (product_id, level_id) 唯一约束 unique_product_level 批量 upsert：
+- PostgreSQL / SQLite: INSERT ... ON CONFLICT (product_id, level_id) DO UPDATE，
+  RETURNING id 与本次生成的新 ID 比较区分新建与更新
+- 其他数据库: 一次查询已存在的价格，再批量更新与批量插入
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import bindparam, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.snowflake import generate_snowflake_id
+from app.models.base import quantize_money
+from app.models.product_level_price import ProductLevelPrice
+
+# 每次执行写入的最大行数
+UPSERT_CHUNK_SIZE = 500
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _dedupe(rows: Iterable[tuple[int, int, Decimal]]) -> list[tuple[int, int, Decimal]]:
+    """按 (product_id, level_id) 去重，同一组合以最后一次出现的价格为准；价格按两位小数规整（Core 写入不经过模型校验）"""
+    prices = {}
+    for product_id, level_id, sale_price in rows:
+        prices[(product_id, level_id)] = quantize_money(sale_price)
+    return [(product_id, level_id, sale_price) for (product_id, level_id), sale_price in prices.items()]
+
+
+async def _upsert_on_conflict(db: AsyncSession, insert, rows: list[tuple[int, int, Decimal]]) -> tuple[int, int]:
+    now = datetime.now()
+    values = [
+        {
+            "id": generate_snowflake_id(),
+            "product_id": product_id,
+            "level_id": level_id,
+            "sale_price": sale_price,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for product_id, level_id, sale_price in rows
+    ]
+    # 语句结构固定，编译结果可缓存；批量参数由 insertmanyvalues 合并为多行 VALUES 执行
+    stmt = insert(ProductLevelPrice.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProductLevelPrice.product_id, ProductLevelPrice.level_id],
+        set_={"sale_price": stmt.excluded.sale_price, "updated_at": stmt.excluded.updated_at},
+    ).returning(ProductLevelPrice.id)
+
+    new_ids = {value["id"] for value in values}
+    returned_ids = (await db.execute(stmt, values)).scalars().all()
+    # 冲突更新的行返回的是已有行的 ID
+    created_count = sum(1 for price_id in returned_ids if price_id in new_ids)
+    return created_count, len(returned_ids) - created_count
+
+
+async def _upsert_generic(db: AsyncSession, rows: list[tuple[int, int, Decimal]]) -> tuple[int, int]:
+    keys = [(product_id, level_id) for product_id, level_id, _ in rows]
+    existing = (await db.execute(
+        select(ProductLevelPrice.id, ProductLevelPrice.product_id, ProductLevelPrice.level_id)
+        .where(tuple_(ProductLevelPrice.product_id, ProductLevelPrice.level_id).in_(keys))
+    )).all()
+    existing_ids = {(row.product_id, row.level_id): row.id for row in existing}
+
+    now = datetime.now()
+    updates = []
+    inserts = []
+    for product_id, level_id, sale_price in rows:
+        price_id = existing_ids.get((product_id, level_id))
+        if price_id is not None:
+            updates.append({"price_id": price_id, "sale_price": sale_price, "updated_at": now})
+        else:
+            inserts.append({
+                "id": generate_snowflake_id(),
+                "product_id": product_id,
+                "level_id": level_id,
+                "sale_price": sale_price,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+    if updates:
+        await db.execute(
+            update(ProductLevelPrice.__table__)
+            .where(ProductLevelPrice.id == bindparam("price_id"))
+            .values(sale_price=bindparam("sale_price"), updated_at=bindparam("updated_at")),
+            updates,
+        )
+    if inserts:
+        await db.execute(ProductLevelPrice.__table__.insert(), inserts)
+    return len(inserts), len(updates)
+
+
+async def upsert_level_prices(
+    db: AsyncSession,
+    rows: Iterable[tuple[int, int, Decimal]],
+) -> tuple[int, int]:
+    """
+    批量设置商品等级价格（已存在则更新，不存在则创建）
+
+    不提交事务，由调用方提交；调用方需保证商品与等级存在
+
+    Args:
+        db: 数据库会话
+        rows: (product_id, level_id, sale_price) 列表
+
+    Returns:
+        tuple[int, int]: (创建数量, 更新数量)
+    """
+    rows = _dedupe(rows)
+    insert = _DIALECT_INSERTS.get(db.bind.dialect.name)
+
+    created_count = 0
+    updated_count = 0
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+        if insert is not None:
+            created, updated = await _upsert_on_conflict(db, insert, chunk)
+        else:
+            created, updated = await _upsert_generic(db, chunk)
+        created_count += created
+        updated_count += updated
+    return created_count, updated_count
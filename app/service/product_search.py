@@ -0,0 +1,173 @@
+"""
+商品搜索
+
+根据数据库类型选择索引化的搜索方式：
+- PostgreSQL: LIKE 条件由 pg_trgm GIN 索引支撑，按 similarity 相似度排序
+- SQLite: FTS5 trigram 全文索引，按 bm25 相关度排序；关键词不足 3 个字符时退回 LIKE
+  （索引在应用启动时由 ensure_sqlite_search_index 确保存在，搜索路径只读；索引未就绪时退回 LIKE）
+- 其他数据库: LIKE
+
+条形码完全匹配时直接命中唯一索引，跳过模糊搜索
+"""
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Row, Select, and_, column, func, literal, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product, PRODUCT_SEARCH_DDL_SQLITE
+from app.models.product_level_price import ProductLevelPrice
+
+# FTS5 trigram 分词器要求关键词至少 3 个字符
+FTS_MIN_LENGTH = 3
+
+_products_fts = table("products_fts", column("rowid"), column("rank"))
+
+# SQLite 全文索引是否就绪（应用启动时确认）
+_sqlite_fts_ready = False
+
+
+async def ensure_sqlite_search_index(db: AsyncSession) -> None:
+    """
+    确保 SQLite 全文索引存在（应用启动时调用，非 SQLite 数据库直接返回）
+
+    对于在引入全文索引之前创建的数据库，创建索引表与同步触发器并回填已有商品。
+    DDL 均为 IF NOT EXISTS，回填跳过已索引的商品，多个 worker 同时启动时重复执行也不会出错
+    """
+    global _sqlite_fts_ready
+    if db.bind.dialect.name != "sqlite":
+        return
+
+    exists = await db.scalar(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+    )
+    if not exists:
+        conn = await db.connection()
+        for statement in PRODUCT_SEARCH_DDL_SQLITE:
+            await conn.exec_driver_sql(statement)
+        await conn.exec_driver_sql(
+            "INSERT INTO products_fts(rowid, name, short_name, barcode) "
+            "SELECT id, name, short_name, barcode FROM products "
+            "WHERE id NOT IN (SELECT rowid FROM products_fts)"
+        )
+        await db.commit()
+    _sqlite_fts_ready = True
+
+
+def _like_condition(search: str):
+    """LIKE 模糊匹配条件"""
+    search_pattern = f"%{search}%"
+    return (
+        (Product.name.like(search_pattern))
+        | (Product.short_name.like(search_pattern))
+        | (Product.barcode.like(search_pattern))
+    )
+
+
+def _fts_match_expression(search: str) -> str:
+    """将关键词转为 FTS5 短语查询（整体作为子串匹配，转义双引号）"""
+    return '"' + search.replace('"', '""') + '"'
+
+
+async def apply_product_search(
+    db: AsyncSession,
+    query: Select,
+    search: str,
+    ranked: bool = True,
+) -> Select:
+    """
+    为商品查询添加搜索条件
+
+    Args:
+        db: 数据库会话（用于判断数据库类型）
+        query: 商品查询语句
+        search: 搜索关键词（商品名称、简称或条形码）
+        ranked: 是否按相关度排序（在已有排序之前）
+
+    Returns:
+        Select: 添加搜索条件（及相关度排序）后的查询语句
+    """
+    return build_product_search(db.bind.dialect.name, query, search, ranked)
+
+
+def build_product_search(dialect: str, query: Select, search: str, ranked: bool = True) -> Select:
+    """
+    按数据库类型为商品查询添加搜索条件（apply_product_search 的实现，查询计划检查直接使用）
+
+    Args:
+        dialect: 数据库类型（方言名称）
+        query: 商品查询语句
+        search: 搜索关键词
+        ranked: 是否按相关度排序
+
+    Returns:
+        Select: 添加搜索条件（及相关度排序）后的查询语句
+    """
+    if dialect == "postgresql":
+        query = query.where(_like_condition(search))
+        if ranked:
+            query = query.order_by(func.greatest(
+                func.similarity(Product.name, search),
+                func.similarity(Product.short_name, search),
+                func.similarity(func.coalesce(Product.barcode, ""), search),
+            ).desc())
+        return query
+
+    if dialect == "sqlite" and _sqlite_fts_ready and len(search) >= FTS_MIN_LENGTH:
+        match = text("products_fts MATCH :fts_query").bindparams(
+            fts_query=_fts_match_expression(search)
+        )
+        if ranked:
+            query = query.join(_products_fts, _products_fts.c.rowid == Product.id).where(match)
+            return query.order_by(_products_fts.c.rank)
+        matched_ids = select(_products_fts.c.rowid).where(match)
+        return query.where(Product.id.in_(matched_ids))
+
+    return query.where(_like_condition(search))
+
+
+async def find_product_by_barcode(db: AsyncSession, query: Select, barcode: str) -> Optional[Row]:
+    """
+    按条形码完全匹配查找商品（走唯一索引）
+
+    Args:
+        db: 数据库会话
+        query: 带筛选条件的商品查询语句（实体查询或列投影查询）
+        barcode: 条形码
+
+    Returns:
+        Optional[Row]: 匹配的记录（列与查询语句一致），不存在返回 None
+    """
+    return (await db.execute(query.where(Product.barcode == barcode))).first()
+
+
+async def lookup_product_by_barcode(
+    db: AsyncSession,
+    barcode: str,
+    level_id: Optional[int] = None,
+) -> Optional[tuple[Product, Optional[Decimal]]]:
+    """
+    按条形码查找商品及指定等级的销售价格（收银扫码场景）
+
+    一条语句完成：条形码唯一索引定位商品，左连接 (product_id, level_id) 唯一约束取价格，
+    只有一次数据库往返，库存与价格始终是最新的
+
+    Args:
+        db: 数据库会话
+        barcode: 条形码
+        level_id: 会员等级ID，为空时不查询价格
+
+    Returns:
+        Optional[tuple]: (商品, 销售价格)，价格未设置时为 None；商品不存在返回 None
+    """
+    if level_id is None:
+        query = select(Product, literal(None).label("sale_price"))
+    else:
+        query = select(Product, ProductLevelPrice.sale_price).outerjoin(
+            ProductLevelPrice,
+            and_(ProductLevelPrice.product_id == Product.id, ProductLevelPrice.level_id == level_id),
+        )
+    row = (await db.execute(query.where(Product.barcode == barcode))).first()
+    if row is None:
+        return None
+    return row[0], row[1]
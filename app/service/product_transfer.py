@@ -0,0 +1,225 @@
+"""
+商品批量导入与导出
+
+导入: 逐批（IMPORT_CHUNK_SIZE 行）处理流式读入的记录
+1. 用 ProductCreate 校验每行
+2. 一次 IN 查询预取本批条形码中已存在的条形码，连同文件内重复的条形码一起报错
+3. 按批分配 Snowflake ID，批量插入（PostgreSQL 使用 COPY，其他数据库使用多行 INSERT），每批提交一次
+
+导出: 服务端游标分批读取（只取所需列），逐批写出 CSV / NDJSON，内存占用与商品总数无关
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.snowflake import generate_snowflake_ids
+from app.models.base import quantize_money
+from app.models.product import Product
+from app.schemas.product import ProductCreate, ProductImportResponse
+from app.service.record_stream import Record, add_import_error, format_validation_error, iter_chunks
+from app.service.stock_ledger import record_movements
+
+settings = get_settings()
+
+# 导入写入的列（COPY 与 INSERT 共用）
+IMPORT_COLUMNS = (
+    "id", "name", "short_name", "spec", "barcode", "image_url",
+    "purchase_price", "stock_qty", "created_at", "updated_at",
+)
+
+# 导出的列（CSV 表头与 NDJSON 字段名相同，导出文件可直接重新导入）
+EXPORT_COLUMNS = (
+    "id", "name", "short_name", "spec", "barcode", "image_url",
+    "purchase_price", "stock_qty", "created_at",
+)
+
+# 导出时每次从服务端游标读取的行数
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    """导出格式"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+async def _insert_products(db: AsyncSession, rows: list[dict]) -> None:
+    """批量插入商品（PostgreSQL 使用 COPY）"""
+    conn = await db.connection()
+    if db.bind.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        if not raw.driver_connection.is_in_transaction():
+            # 驱动层事务在首条语句时才开启，COPY 需要与本批其他语句在同一事务中
+            await conn.exec_driver_sql("SELECT 1")
+        try:
+            await raw.driver_connection.copy_records_to_table(
+                Product.__tablename__,
+                records=[tuple(row[column] for column in IMPORT_COLUMNS) for row in rows],
+                columns=list(IMPORT_COLUMNS),
+            )
+        except Exception as e:
+            # 直接调用驱动时异常未经 SQLAlchemy 包装，唯一约束冲突统一转换为 IntegrityError
+            if getattr(e, "sqlstate", None) == "23505":
+                raise IntegrityError(f"COPY {Product.__tablename__}", None, e) from e
+            raise
+        return
+    await conn.execute(Product.__table__.insert(), rows)
+
+
+async def import_products(
+    db: AsyncSession,
+    records: AsyncIterator[Record],
+    user_id: Optional[int] = None,
+) -> ProductImportResponse:
+    """
+    批量导入商品
+
+    条形码已存在或在文件中重复的行报错跳过；每批一个事务
+
+    Args:
+        db: 数据库会话
+        records: 流式解析的 (行号, 记录, 错误信息)
+        user_id: 操作用户ID（记入期初库存流水）
+
+    Returns:
+        ProductImportResponse: 导入结果与逐行错误报告
+    """
+    report = ProductImportResponse()
+    seen_barcodes = set()
+
+    async for chunk in iter_chunks(records, settings.IMPORT_CHUNK_SIZE):
+        report.total_rows += len(chunk)
+
+        # 逐行校验格式
+        valid = []
+        for line, data, error in chunk:
+            if error is not None:
+                add_import_error(report, line, error)
+                continue
+            try:
+                valid.append((line, ProductCreate.model_validate(data)))
+            except ValidationError as e:
+                add_import_error(report, line, format_validation_error(e))
+
+        # 一次查询预取已存在的条形码
+        barcodes = {product.barcode for _, product in valid if product.barcode}
+        existing_barcodes = set()
+        if barcodes:
+            existing_barcodes = set((await db.scalars(
+                select(Product.barcode).where(Product.barcode.in_(barcodes))
+            )).all())
+
+        products = []
+        for line, product in valid:
+            if product.barcode:
+                if product.barcode in existing_barcodes:
+                    add_import_error(report, line, f"条形码已存在: {product.barcode}")
+                    continue
+                if product.barcode in seen_barcodes:
+                    add_import_error(report, line, f"条形码在文件中重复: {product.barcode}")
+                    continue
+                seen_barcodes.add(product.barcode)
+            products.append((line, product))
+
+        if not products:
+            continue
+
+        # 按批分配ID并写入
+        now = datetime.now()
+        ids = generate_snowflake_ids(len(products))
+        rows = [
+            {
+                "id": product_id,
+                "name": product.name,
+                "short_name": product.short_name,
+                "spec": product.spec,
+                "barcode": product.barcode,
+                "image_url": product.image_url,
+                # Core 批量写入不经过模型校验，金额在此规整
+                "purchase_price": quantize_money(product.purchase_price),
+                "stock_qty": product.stock_qty,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for product_id, (_, product) in zip(ids, products)
+        ]
+        try:
+            await _insert_products(db, rows)
+            await record_movements(db, [(row["id"], row["stock_qty"]) for row in rows], "批量导入", user_id)
+            await db.commit()
+        except IntegrityError:
+            # 预取之后其他请求写入了相同条形码，本批整体回滚
+            await db.rollback()
+            for line, _ in products:
+                add_import_error(report, line, "条形码冲突，本批未导入，请重试")
+            continue
+
+        report.created_count += len(rows)
+
+    report.errors.sort(key=lambda error: error.line)
+    return report
+
+
+def _format_csv(rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+    return buffer.getvalue()
+
+
+def _format_ndjson(rows) -> str:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({
+            "id": str(row.id),
+            "name": row.name,
+            "short_name": row.short_name,
+            "spec": row.spec,
+            "barcode": row.barcode,
+            "image_url": row.image_url,
+            "purchase_price": str(row.purchase_price),
+            "stock_qty": row.stock_qty,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }, ensure_ascii=False))
+    return "".join(line + "\n" for line in lines)
+
+
+async def export_products(export_format: ExportFormat) -> AsyncIterator[str]:
+    """
+    流式导出全部商品（按ID即创建顺序）
+
+    使用独立的数据库会话，在响应发送期间通过服务端游标分批读取
+
+    Args:
+        export_format: 导出格式
+
+    Returns:
+        AsyncIterator[str]: 文本块异步迭代器
+    """
+    query = select(*(getattr(Product, column) for column in EXPORT_COLUMNS)).order_by(Product.id)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        header = True
+        if export_format == ExportFormat.CSV:
+            async for rows in result.partitions():
+                yield _format_csv(rows, header)
+                header = False
+            if header:
+                yield _format_csv([], header)
+        else:
+            async for rows in result.partitions():
+                yield _format_ndjson(rows)
@@ -0,0 +1,173 @@
+"""
+流式读取 CSV / NDJSON 请求体
+
+按行增量读取并解码请求体，逐条产出记录，不把整个文件读入内存。
+产出 (行号, 记录, 错误信息)：解析成功时错误信息为 None，解析失败时记录为 None，
+由调用方通过 add_import_error 汇总到逐行错误报告中
+"""
+import csv
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from pydantic import ValidationError
+
+from app.core.exceptions import BadRequestException
+from app.core.response import ImportRowError
+
+# (行号, 记录, 错误信息)
+Record = tuple[int, Optional[dict], Optional[str]]
+
+CSV_MEDIA_TYPES = ("text/csv", "application/csv")
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json")
+
+# 错误报告中最多返回的错误行数
+IMPORT_MAX_ERRORS = 1000
+
+ENCODING_ERROR = "不是有效的 UTF-8 编码"
+
+
+def _decode_line(raw: bytes, line_no: int) -> Optional[str]:
+    """解码一行（首行去除 BOM），不是有效的 UTF-8 编码时返回 None"""
+    try:
+        return raw.decode("utf-8-sig" if line_no == 1 else "utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[tuple[int, Optional[str]]]:
+    """
+    按行产出 (行号, 行内容)
+
+    先按字节切分再逐行解码（UTF-8 多字节字符不含换行字节），
+    某行编码无效时行内容为 None，由解析器记为该行的错误，不影响其他行
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            line_no += 1
+            yield line_no, _decode_line(raw, line_no)
+    if buffer:
+        yield line_no + 1, _decode_line(buffer, line_no + 1)
+
+
+async def _iter_csv(lines: AsyncIterator[tuple[int, Optional[str]]]) -> AsyncIterator[Record]:
+    """解析 CSV（首行为表头，空值视为未填写，使用字段默认值）"""
+    header = None
+    pending = ""
+    start = 0
+    async for line_no, line in lines:
+        if line is None:
+            # 编码无效的行（及其所在的多行记录）整体报错
+            yield (start if pending else line_no), None, ENCODING_ERROR
+            pending = ""
+            continue
+        if pending:
+            pending += "\n" + line
+        else:
+            pending, start = line, line_no
+        # 引号未闭合说明字段内含换行，继续拼接下一行
+        if pending.count('"') % 2:
+            continue
+        text, pending = pending, ""
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, None, f"列数 {len(values)} 与表头列数 {len(header)} 不一致"
+            continue
+        yield start, {name: value.strip() for name, value in zip(header, values) if value.strip()}, None
+
+    if pending:
+        yield start, None, "引号未闭合"
+
+
+async def _iter_ndjson(lines: AsyncIterator[tuple[int, Optional[str]]]) -> AsyncIterator[Record]:
+    """解析 NDJSON（每行一个 JSON 对象）"""
+    async for line_no, line in lines:
+        if line is None:
+            yield line_no, None, ENCODING_ERROR
+            continue
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"JSON 格式错误: {e.msg}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "每行必须是一个 JSON 对象"
+            continue
+        yield line_no, data, None
+
+
+def iter_records(request: Request) -> AsyncIterator[Record]:
+    """
+    按 Content-Type 流式解析请求体
+
+    Args:
+        request: 请求对象，Content-Type 为 text/csv 或 application/x-ndjson
+
+    Returns:
+        AsyncIterator[Record]: (行号, 记录, 错误信息) 异步迭代器
+
+    Raises:
+        BadRequestException: 不支持的 Content-Type
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in CSV_MEDIA_TYPES:
+        return _iter_csv(_iter_lines(request))
+    if media_type in NDJSON_MEDIA_TYPES:
+        return _iter_ndjson(_iter_lines(request))
+    raise BadRequestException("仅支持 text/csv 或 application/x-ndjson 格式的请求体")
+
+
+async def iter_chunks(records: AsyncIterator[Record], size: int) -> AsyncIterator[list[Record]]:
+    """
+    将记录按固定条数分批
+
+    Args:
+        records: 记录异步迭代器
+        size: 每批条数
+
+    Returns:
+        AsyncIterator[list[Record]]: 记录批次
+    """
+    chunk = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """将 Pydantic 校验错误格式化为一行错误信息"""
+    messages = []
+    for item in error.errors():
+        field = " -> ".join(str(loc) for loc in item["loc"])
+        messages.append(f"{field}: {item['msg']}" if field else item["msg"])
+    return "; ".join(messages)
+
+
+def add_import_error(report, line: int, msg: str) -> None:
+    """
+    向导入报告记录一条错误行（超过 IMPORT_MAX_ERRORS 时只计数）
+
+    Args:
+        report: 导入响应（包含 error_count 与 errors 字段）
+        line: 行号
+        msg: 错误信息
+    """
+    report.error_count += 1
+    if len(report.errors) < IMPORT_MAX_ERRORS:
+        report.errors.append(ImportRowError(line=line, msg=msg))
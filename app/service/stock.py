@@ -0,0 +1,139 @@
+"""
+库存调整
+
+库存变更使用单条条件 UPDATE 原子完成：
+    UPDATE products SET stock_qty = stock_qty + :delta
+    WHERE id = :id AND stock_qty + :delta >= 0
+    RETURNING ...
+读取、计算、校验与写入在数据库内一步完成，并发调整不会丢失更新，库存不会被扣成负数
+
+直接设置库存（修改商品信息）使用比较并设置：WHERE stock_qty = 读取时的库存，
+读取后库存已被其他请求调整时不写入，由调用方报冲突，流水中的变化量与实际变化一致
+
+多行调整（结账）在一个事务内全部成功或全部失败：按商品ID顺序加行锁，
+再用一条 CASE 条件 UPDATE 完成全部调整
+"""
+from typing import Optional
+
+from sqlalchemy import Row, case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+
+# 调整后返回的商品列（与 ProductResponse 字段一致）
+STOCK_RETURNING_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.short_name,
+    Product.spec,
+    Product.barcode,
+    Product.image_url,
+    Product.purchase_price,
+    Product.stock_qty,
+    Product.created_at,
+)
+
+
+async def adjust_stock(db: AsyncSession, product_id: int, delta: int) -> Optional[Row]:
+    """
+    原子调整商品库存
+
+    不提交事务，由调用方提交
+
+    Args:
+        db: 数据库会话
+        product_id: 商品ID
+        delta: 库存变化量（正数增加，负数减少）
+
+    Returns:
+        Optional[Row]: 调整后的商品行；商品不存在或库存不足时返回 None
+    """
+    new_stock = Product.stock_qty + delta
+    result = await db.execute(
+        update(Product)
+        .where(Product.id == product_id, new_stock >= 0)
+        .values(stock_qty=new_stock)
+        .returning(*STOCK_RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+async def set_stock(db: AsyncSession, product_id: int, stock_qty: int, expected_qty: int) -> Optional[Row]:
+    """
+    将商品库存设置为指定值（仅当当前库存仍为 expected_qty 时）
+
+    不提交事务，由调用方提交；变化量为 stock_qty - expected_qty
+
+    Args:
+        db: 数据库会话
+        product_id: 商品ID
+        stock_qty: 新库存
+        expected_qty: 读取时的库存
+
+    Returns:
+        Optional[Row]: 调整后的商品行；商品不存在或库存已被其他请求修改时返回 None
+    """
+    result = await db.execute(
+        update(Product)
+        .where(Product.id == product_id, Product.stock_qty == expected_qty)
+        .values(stock_qty=stock_qty)
+        .returning(*STOCK_RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+async def adjust_stock_batch(db: AsyncSession, deltas: dict[int, int]) -> tuple[dict[int, int], list[dict]]:
+    """
+    原子调整多个商品的库存（全部成功或全部失败）
+
+    1. 按商品ID升序 SELECT ... FOR UPDATE 加行锁，固定加锁顺序避免并发结账互相死锁
+    2. 校验商品存在且库存充足，有失败时不做任何修改
+    3. 一条 CASE 条件 UPDATE 完成全部调整
+
+    不提交事务，由调用方提交；有失败时调用方需回滚
+
+    Args:
+        db: 数据库会话
+        deltas: 商品ID -> 库存变化量
+
+    Returns:
+        tuple[dict[int, int], list[dict]]: (商品ID -> 调整后库存, 失败明细)，失败明细非空时未做任何修改
+    """
+    product_ids = sorted(deltas)
+    current = dict((await db.execute(
+        select(Product.id, Product.stock_qty)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update()
+    )).all())
+
+    failures = []
+    for product_id in product_ids:
+        delta = deltas[product_id]
+        stock_qty = current.get(product_id)
+        if stock_qty is None:
+            failures.append({"id": str(product_id), "delta": delta, "stockQty": None, "msg": "商品不存在"})
+        elif stock_qty + delta < 0:
+            failures.append({"id": str(product_id), "delta": delta, "stockQty": stock_qty, "msg": "库存不足"})
+    if failures:
+        return {}, failures
+
+    # WHEN 条件写成 Product.id == :id，使参数按 BIGINT 绑定
+    delta_expr = case(*((Product.id == product_id, delta) for product_id, delta in deltas.items()))
+    new_stock = dict((await db.execute(
+        update(Product)
+        .where(Product.id.in_(product_ids), Product.stock_qty + delta_expr >= 0)
+        .values(stock_qty=Product.stock_qty + delta_expr)
+        .returning(Product.id, Product.stock_qty)
+        .execution_options(synchronize_session=False)
+    )).all())
+
+    # 不支持行锁的数据库上，加锁查询与更新之间库存可能被其他事务修改
+    for product_id in product_ids:
+        if product_id not in new_stock:
+            failures.append({"id": str(product_id), "delta": deltas[product_id], "stockQty": None, "msg": "库存不足"})
+    if failures:
+        return {}, failures
+    return new_stock, []
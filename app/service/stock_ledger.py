@@ -0,0 +1,243 @@
+"""
+库存流水与快照
+
+流水（stock_movements）只追加，记录每次库存变化；products.stock_qty 仍是当前库存。
+
+写入: 库存调整在同一事务内调用 record_movements，用一条多行 INSERT 写入本次调整的全部流水，
+与库存 UPDATE 一起提交或回滚，进程崩溃也不会出现库存已变而流水缺失的情况
+
+快照: 后台任务定期为有新流水的商品生成快照（上一快照 + 之后的流水合计），
+查询某时刻库存或区间流水报表时，从最近的快照开始累加之后的流水，无需回放全部历史
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.snowflake import generate_snowflake_ids, snowflake_id_at
+from app.models.stock_movement import StockMovement, StockSnapshot
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 快照只包含早于该时间的流水：流水ID在事务内生成，提交前其他事务不可见，
+# 留出足够的时间让进行中的事务提交，避免快照越过尚未提交的流水
+SNAPSHOT_SAFETY_LAG = timedelta(seconds=60)
+
+
+async def record_movements(
+    db: AsyncSession,
+    movements: list[tuple[int, int]],
+    reason: Optional[str],
+    user_id: Optional[int],
+) -> int:
+    """
+    在当前事务中写入库存流水（一条多行 INSERT，变化量为 0 的跳过）
+
+    不提交事务，由调用方与库存调整一起提交
+
+    Args:
+        db: 数据库会话
+        movements: (商品ID, 库存变化量) 列表
+        reason: 变更原因
+        user_id: 操作用户ID
+
+    Returns:
+        int: 写入的条数
+    """
+    movements = [(product_id, delta) for product_id, delta in movements if delta]
+    if not movements:
+        return 0
+
+    now = datetime.now()
+    ids = generate_snowflake_ids(len(movements))
+    await db.execute(StockMovement.__table__.insert().values([
+        {
+            "id": movement_id,
+            "product_id": product_id,
+            "delta": delta,
+            "reason": reason,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for movement_id, (product_id, delta) in zip(ids, movements)
+    ]))
+    return len(movements)
+
+
+class StockSnapshotScheduler:
+    """库存快照定时生成任务"""
+
+    def __init__(self, snapshot_interval: float):
+        """
+        Args:
+            snapshot_interval: 快照生成间隔（秒），0 表示不自动生成
+        """
+        self.snapshot_interval = snapshot_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    count = await take_stock_snapshots(db)
+                logger.info(f"已生成 {count} 个库存快照")
+            except Exception as e:
+                logger.error(f"库存快照生成失败: {e}")
+
+    def start(self) -> None:
+        """启动后台任务（应用启动时调用）"""
+        if self._task is None and self.snapshot_interval:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务（应用关闭时调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+stock_snapshot_scheduler = StockSnapshotScheduler(settings.STOCK_SNAPSHOT_INTERVAL_SECONDS)
+
+
+def _latest_snapshots(before_id: Optional[int] = None):
+    """每个商品最近一次快照（可限定快照的流水ID上界）的子查询"""
+    latest = select(
+        StockSnapshot.product_id,
+        func.max(StockSnapshot.movement_id).label("movement_id"),
+    ).group_by(StockSnapshot.product_id)
+    if before_id is not None:
+        latest = latest.where(StockSnapshot.movement_id < before_id)
+    latest = latest.subquery()
+    return (
+        select(StockSnapshot.product_id, StockSnapshot.movement_id, StockSnapshot.stock_qty)
+        .join(latest, and_(
+            StockSnapshot.product_id == latest.c.product_id,
+            StockSnapshot.movement_id == latest.c.movement_id,
+        ))
+        .subquery()
+    )
+
+
+async def take_stock_snapshots(db: AsyncSession) -> int:
+    """
+    为上次快照之后有新流水的商品生成快照
+
+    快照库存 = 上一快照库存 + 之后的流水合计，只统计 SNAPSHOT_SAFETY_LAG 之前的流水
+
+    Args:
+        db: 数据库会话
+
+    Returns:
+        int: 生成的快照数量
+    """
+    cutoff_id = snowflake_id_at(datetime.now() - SNAPSHOT_SAFETY_LAG)
+    snapshot = _latest_snapshots()
+    rows = (await db.execute(
+        select(
+            StockMovement.product_id,
+            func.max(StockMovement.id).label("movement_id"),
+            func.sum(StockMovement.delta).label("delta"),
+            func.coalesce(func.max(snapshot.c.stock_qty), 0).label("base_qty"),
+        )
+        .outerjoin(snapshot, snapshot.c.product_id == StockMovement.product_id)
+        .where(
+            StockMovement.id > func.coalesce(snapshot.c.movement_id, 0),
+            StockMovement.id < cutoff_id,
+        )
+        .group_by(StockMovement.product_id)
+    )).all()
+    if not rows:
+        return 0
+
+    now = datetime.now()
+    ids = generate_snowflake_ids(len(rows))
+    try:
+        await db.execute(StockSnapshot.__table__.insert(), [
+            {
+                "id": snapshot_id,
+                "product_id": row.product_id,
+                "movement_id": row.movement_id,
+                "stock_qty": row.base_qty + row.delta,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for snapshot_id, row in zip(ids, rows)
+        ])
+        await db.commit()
+    except IntegrityError:
+        # 其他进程已生成相同的快照
+        await db.rollback()
+        return 0
+    return len(rows)
+
+
+async def stock_at(db: AsyncSession, product_id: int, moment: datetime) -> int:
+    """
+    查询商品在指定时刻的库存
+
+    从该时刻之前最近的快照开始，累加快照之后到该时刻的流水
+
+    Args:
+        db: 数据库会话
+        product_id: 商品ID
+        moment: 时刻
+
+    Returns:
+        int: 库存数量
+    """
+    bound_id = snowflake_id_at(moment + timedelta(milliseconds=1))
+    snapshot = (await db.execute(
+        select(StockSnapshot.movement_id, StockSnapshot.stock_qty)
+        .where(StockSnapshot.product_id == product_id, StockSnapshot.movement_id < bound_id)
+        .order_by(StockSnapshot.movement_id.desc())
+        .limit(1)
+    )).first()
+    base_id, base_qty = (snapshot.movement_id, snapshot.stock_qty) if snapshot else (0, 0)
+
+    delta = await db.scalar(
+        select(func.coalesce(func.sum(StockMovement.delta), 0)).where(
+            StockMovement.product_id == product_id,
+            StockMovement.id > base_id,
+            StockMovement.id < bound_id,
+        )
+    )
+    return base_qty + delta
+
+
+async def movement_totals(db: AsyncSession, product_id: int, start: datetime, end: datetime) -> tuple[int, int]:
+    """
+    统计商品在时间区间 [start, end] 内的入库与出库数量
+
+    Args:
+        db: 数据库会话
+        product_id: 商品ID
+        start: 开始时间
+        end: 结束时间
+
+    Returns:
+        tuple[int, int]: (入库数量, 出库数量（负数）)
+    """
+    row = (await db.execute(
+        select(
+            func.coalesce(func.sum(case((StockMovement.delta > 0, StockMovement.delta), else_=0)), 0),
+            func.coalesce(func.sum(case((StockMovement.delta < 0, StockMovement.delta), else_=0)), 0),
+        ).where(
+            StockMovement.product_id == product_id,
+            StockMovement.id >= snowflake_id_at(start),
+            StockMovement.id < snowflake_id_at(end + timedelta(milliseconds=1)),
+        )
+    )).one()
+    return row[0], row[1]
@@ -0,0 +1,94 @@
+"""
+性能基准测试公共工具
+
+默认使用临时 SQLite 数据库在进程内启动应用（通过 httpx ASGITransport），
+无需外部服务；设置 DATABASE_URL 环境变量可指向真实的 PostgreSQL。
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+_tmp_dir = tempfile.mkdtemp(prefix="shop-bench-")
+os.environ.setdefault("APP_NAME", "shop-bench")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+# 基准测试默认使用较低成本因子，可通过环境变量覆盖
+os.environ.setdefault("BCRYPT_ROUNDS", "10")
+
+ADMIN_USERNAME = "admin"
+ADMIN_PASSWORD = "admin123"
+
+
+def setup_database() -> None:
+    """重建所有表并写入管理员账号"""
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import get_password_hash
+    from app.core.snowflake import generate_snowflake_id
+    from app.models import User
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add(User(
+            id=generate_snowflake_id(),
+            username=ADMIN_USERNAME,
+            name="基准测试管理员",
+            password=get_password_hash(ADMIN_PASSWORD),
+            admin_flag=True,
+        ))
+        db.commit()
+
+
+def make_client():
+    """创建进程内 ASGI 客户端"""
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1")
+
+
+async def login(client) -> dict:
+    """登录并返回带 Token 的请求头"""
+    resp = await client.post(
+        "/auth/login",
+        json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD},
+    )
+    token = resp.json()["data"]["accessToken"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """计算百分位数"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+def report(title: str, samples: list[float]) -> None:
+    """打印耗时统计（单位：毫秒）"""
+    print(
+        f"{title:<40} n={len(samples):<6} "
+        f"p50={percentile(samples, 50) * 1000:8.2f}ms "
+        f"p99={percentile(samples, 99) * 1000:8.2f}ms "
+        f"max={max(samples, default=0) * 1000:8.2f}ms"
+    )
+
+
+class Timer:
+    """简单计时器"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
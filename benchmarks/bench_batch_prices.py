@@ -0,0 +1,92 @@
+"""
+批量设置价格基准测试
+
+对比逐条查询 + 逐条写入（原实现）与单条 upsert 语句在不同等级数量下的
+单次 /prices/batch 写入耗时（一半新建、一半更新）。
+
+用法:
+    python benchmarks/bench_batch_prices.py [重复次数，默认 20]
+"""
+import asyncio
+import sys
+import time
+from decimal import Decimal
+
+from _common import report, setup_database
+
+LEVEL_COUNTS = [10, 100, 1000]
+
+
+def seed(level_count: int) -> tuple[int, list[int]]:
+    """写入一个商品与 level_count 个会员等级"""
+    from app.core.database import engine
+    from app.core.snowflake import generate_snowflake_id
+    from app.models import CustomerLevel, Product
+
+    product_id = generate_snowflake_id()
+    level_ids = [generate_snowflake_id() for _ in range(level_count)]
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), [{
+            "id": product_id, "name": "商品", "short_name": "商品",
+            "purchase_price": Decimal("1.00"), "stock_qty": 0,
+        }])
+        conn.execute(CustomerLevel.__table__.insert(), [
+            {"id": level_id, "level_name": f"等级{i}"} for i, level_id in enumerate(level_ids)
+        ])
+    return product_id, level_ids
+
+
+async def main(repeat: int) -> None:
+    from sqlalchemy import delete, select
+
+    from app.core.database import AsyncSessionLocal
+    from app.core.snowflake import generate_snowflake_id
+    from app.models import ProductLevelPrice
+    from app.service.price_upsert import upsert_level_prices
+
+    async def run_row_by_row(db, product_id: int, rows) -> None:
+        for level_id, sale_price in rows:
+            existing_price = await db.scalar(
+                select(ProductLevelPrice).where(
+                    ProductLevelPrice.product_id == product_id,
+                    ProductLevelPrice.level_id == level_id,
+                )
+            )
+            if existing_price:
+                existing_price.sale_price = sale_price
+            else:
+                db.add(ProductLevelPrice(
+                    id=generate_snowflake_id(),
+                    product_id=product_id,
+                    level_id=level_id,
+                    sale_price=sale_price,
+                ))
+        await db.commit()
+
+    async def run_upsert(db, product_id: int, rows) -> None:
+        await upsert_level_prices(db, ((product_id, level_id, sale_price) for level_id, sale_price in rows))
+        await db.commit()
+
+    for level_count in LEVEL_COUNTS:
+        setup_database()
+        product_id, level_ids = seed(level_count)
+        rows = [(level_id, Decimal("9.99")) for level_id in level_ids]
+        half = [(product_id, level_id, Decimal("1.00")) for level_id in level_ids[: level_count // 2]]
+
+        for name, runner in (("row by row", run_row_by_row), ("upsert", run_upsert)):
+            samples = []
+            for _ in range(repeat):
+                async with AsyncSessionLocal() as db:
+                    # 预置一半价格，使每轮都有一半新建、一半更新
+                    await db.execute(delete(ProductLevelPrice))
+                    await upsert_level_prices(db, half)
+                    await db.commit()
+
+                    begin = time.perf_counter()
+                    await runner(db, product_id, rows)
+                    samples.append(time.perf_counter() - begin)
+            report(f"{name:<10} levels={level_count}", samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -0,0 +1,69 @@
+"""
+列表查询基准测试
+
+向商品表写入 N 条数据后，对比商品列表一页数据（查询 + 序列化为 JSON）的两种查询方式（每页 20 / 100 条）:
+- entity: select(Product) 加载 ORM 实体（标识映射、变更跟踪），再读取属性生成字段字典
+- projection: select_fields 只查询 ProductResponse 所需的列，Row 直接生成字段字典
+
+用法:
+    python benchmarks/bench_list_queries.py [商品数量，默认 10000] [重复次数，默认 500]
+"""
+import asyncio
+import sys
+
+from _common import report, setup_database
+from bench_search import seed_products
+
+PAGE_SIZES = [20, 100]
+
+
+async def run(repeat: int) -> None:
+    import time
+
+    from sqlalchemy import select
+
+    from app.api.products import PRODUCT_FIELDS, PRODUCT_PAGE_SERIALIZER
+    from app.core.database import AsyncSessionLocal
+    from app.core.serializers import rows_to_dicts, select_fields, to_field_dicts
+    from app.models import Product
+
+    async def via_entity(db, page_size: int) -> bytes:
+        query = select(Product).order_by(Product.created_at.desc()).limit(page_size)
+        products = (await db.scalars(query)).all()
+        return PRODUCT_PAGE_SERIALIZER.to_json(
+            {"total": 0, "items": to_field_dicts(products, PRODUCT_FIELDS), "total_mode": "exact"}
+        )
+
+    async def via_projection(db, page_size: int) -> bytes:
+        query = select_fields(Product, PRODUCT_FIELDS).order_by(Product.created_at.desc()).limit(page_size)
+        rows = (await db.execute(query)).all()
+        return PRODUCT_PAGE_SERIALIZER.to_json(
+            {"total": 0, "items": rows_to_dicts(rows, PRODUCT_FIELDS), "total_mode": "exact"}
+        )
+
+    for page_size in PAGE_SIZES:
+        # 与接口一致：每个请求使用新的会话
+        async with AsyncSessionLocal() as db:
+            assert await via_entity(db, page_size) == await via_projection(db, page_size)
+        for name, runner in (("entity", via_entity), ("projection", via_projection)):
+            samples = []
+            for _ in range(repeat):
+                async with AsyncSessionLocal() as db:
+                    begin = time.perf_counter()
+                    await runner(db, page_size)
+                    samples.append(time.perf_counter() - begin)
+            report(f"{name:<10} pageSize={page_size}", samples)
+
+
+def main(count: int, repeat: int) -> None:
+    setup_database()
+    print(f"seeding {count} products ...")
+    seed_products(count)
+    asyncio.run(run(repeat))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    )
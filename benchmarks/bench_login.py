@@ -0,0 +1,79 @@
+"""
+登录吞吐基准测试
+
+并发发起大量登录请求的同时，持续请求 /health，
+观察 bcrypt 计算是否阻塞其他接口。
+
+用法:
+    python benchmarks/bench_login.py [登录并发数]
+"""
+import asyncio
+import sys
+import time
+
+from _common import ADMIN_PASSWORD, ADMIN_USERNAME, Timer, make_client, report, setup_database
+
+
+async def _probe_health(client, stop: asyncio.Event, samples: list[float]) -> None:
+    """登录期间持续探测 /health 的延迟"""
+    import httpx
+
+    async with httpx.AsyncClient(transport=client._transport, base_url="http://bench") as probe:
+        while not stop.is_set():
+            start = time.perf_counter()
+            await probe.get("/health")
+            samples.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+
+async def main(concurrency: int) -> None:
+    setup_database()
+    async with make_client() as client:
+        # 预热
+        await client.post("/auth/login", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+
+        idle: list[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, stop, idle))
+        await asyncio.sleep(0.5)
+        stop.set()
+        await probe
+
+        login_samples: list[float] = []
+        health_samples: list[float] = []
+
+        async def _login():
+            start = time.perf_counter()
+            resp = await client.post(
+                "/auth/login",
+                json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD},
+            )
+            login_samples.append(time.perf_counter() - start)
+            return resp.json()["code"]
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, stop, health_samples))
+        with Timer() as timer:
+            codes = await asyncio.gather(*(_login() for _ in range(concurrency)))
+        stop.set()
+        await probe
+
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    print(
+        f"bcrypt rounds={settings.BCRYPT_ROUNDS} "
+        f"pool={settings.PASSWORD_HASH_POOL_SIZE} "
+        f"queue_limit={settings.PASSWORD_HASH_QUEUE_LIMIT}"
+    )
+    print(
+        f"logins={concurrency} ok={codes.count(200)} rejected={codes.count(503)} "
+        f"elapsed={timer.elapsed:.2f}s throughput={concurrency / timer.elapsed:.1f} req/s"
+    )
+    report("login", login_samples)
+    report("/health (idle)", idle)
+    report("/health (during login burst)", health_samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
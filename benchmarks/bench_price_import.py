@@ -0,0 +1,72 @@
+"""
+批量导入价格基准测试
+
+生成 商品数 × 等级数 条价格的 CSV（一半按商品ID、一半按条形码引用），
+通过 /prices/import 流式导入，分别测量首次导入（全部新建）与再次导入（全部更新）的耗时。
+
+用法:
+    python benchmarks/bench_price_import.py [商品数量，默认 5000] [等级数量，默认 10]
+"""
+import asyncio
+import sys
+import time
+from decimal import Decimal
+
+from _common import login, make_client, setup_database
+
+
+def seed(product_count: int, level_count: int) -> tuple[list[tuple[int, str]], list[int]]:
+    """写入商品与会员等级"""
+    from app.core.database import engine
+    from app.core.snowflake import generate_snowflake_id
+    from app.models import CustomerLevel, Product
+
+    products = [(generate_snowflake_id(), f"69{i:011d}") for i in range(product_count)]
+    level_ids = [generate_snowflake_id() for _ in range(level_count)]
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), [
+            {"id": product_id, "name": f"商品{i}", "short_name": f"商品{i}", "barcode": barcode,
+             "purchase_price": Decimal("1.00"), "stock_qty": 0}
+            for i, (product_id, barcode) in enumerate(products)
+        ])
+        conn.execute(CustomerLevel.__table__.insert(), [
+            {"id": level_id, "level_name": f"等级{i}"} for i, level_id in enumerate(level_ids)
+        ])
+    return products, level_ids
+
+
+def build_csv(products, level_ids, price: str) -> bytes:
+    lines = ["product_id,barcode,level_id,sale_price"]
+    for i, (product_id, barcode) in enumerate(products):
+        for level_id in level_ids:
+            if i % 2:
+                lines.append(f",{barcode},{level_id},{price}")
+            else:
+                lines.append(f"{product_id},,{level_id},{price}")
+    return "\n".join(lines).encode()
+
+
+async def main(product_count: int, level_count: int) -> None:
+    setup_database()
+    products, level_ids = seed(product_count, level_count)
+    rows = product_count * level_count
+
+    async with make_client() as client:
+        headers = {**await login(client), "Content-Type": "text/csv"}
+        for name, price in (("first import (create)", "9.99"), ("second import (update)", "8.88")):
+            body = build_csv(products, level_ids, price)
+            begin = time.perf_counter()
+            resp = await client.post("/prices/import", content=body, headers=headers, timeout=None)
+            elapsed = time.perf_counter() - begin
+            data = resp.json()["data"]
+            print(
+                f"{name:<24} rows={rows:<7} {elapsed:6.2f}s  {rows / elapsed:9.0f} rows/s  "
+                f"created={data['createdCount']} updated={data['updatedCount']} errors={data['errorCount']}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    ))
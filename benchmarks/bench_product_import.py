@@ -0,0 +1,66 @@
+"""
+商品批量导入与导出基准测试
+
+对比逐个调用 /products/create 与 /products/import 流式导入的吞吐，
+并测量 /products/export 流式导出全部商品的耗时。
+
+用法:
+    python benchmarks/bench_product_import.py [导入商品数量，默认 200000] [逐个创建的样本数量，默认 500]
+"""
+import asyncio
+import sys
+import time
+
+from _common import login, make_client, setup_database
+
+
+def build_csv(count: int, offset: int = 0) -> bytes:
+    lines = ["name,short_name,spec,barcode,purchase_price,stock_qty"]
+    for i in range(offset, offset + count):
+        lines.append(f"商品{i},商品{i},500ml,69{i:011d},{1 + i % 100}.50,{i % 50}")
+    return "\n".join(lines).encode()
+
+
+async def main(count: int, sample: int) -> None:
+    setup_database()
+
+    async with make_client() as client:
+        headers = await login(client)
+
+        begin = time.perf_counter()
+        for i in range(sample):
+            await client.post(
+                "/products/create",
+                json={"name": f"样本{i}", "short_name": f"样本{i}", "barcode": f"68{i:011d}", "purchase_price": "1.00"},
+                headers=headers,
+            )
+        elapsed = time.perf_counter() - begin
+        print(f"{'/products/create one by one':<30} rows={sample:<7} {elapsed:6.2f}s  {sample / elapsed:9.0f} rows/s")
+
+        body = build_csv(count)
+        begin = time.perf_counter()
+        resp = await client.post(
+            "/products/import", content=body, headers={**headers, "Content-Type": "text/csv"}, timeout=None
+        )
+        elapsed = time.perf_counter() - begin
+        data = resp.json()["data"]
+        print(
+            f"{'/products/import':<30} rows={count:<7} {elapsed:6.2f}s  {count / elapsed:9.0f} rows/s  "
+            f"created={data['createdCount']} errors={data['errorCount']}"
+        )
+
+        total = count + sample
+        begin = time.perf_counter()
+        size = 0
+        async with client.stream("GET", "/products/export", headers=headers, timeout=None) as resp:
+            async for chunk in resp.aiter_bytes():
+                size += len(chunk)
+        elapsed = time.perf_counter() - begin
+        print(f"{'/products/export':<30} rows={total:<7} {elapsed:6.2f}s  {total / elapsed:9.0f} rows/s  {size / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    ))
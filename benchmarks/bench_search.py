@@ -0,0 +1,101 @@
+"""
+商品搜索基准测试
+
+向商品表写入 N 条数据后，对比原始 LIKE '%关键词%' 扫描与索引化搜索
+（PostgreSQL pg_trgm / SQLite FTS5）的单次搜索耗时（含总数统计）。
+
+用法:
+    python benchmarks/bench_search.py [商品数量，默认 100000] [重复次数]
+    python benchmarks/bench_search.py 1000000
+"""
+import asyncio
+import random
+import sys
+import time
+from decimal import Decimal
+
+from _common import report, setup_database
+
+WORDS = ["可口可乐", "百事", "雪碧", "矿泉水", "牛奶", "酸奶", "面包", "饼干", "薯片", "巧克力",
+         "洗发水", "牙膏", "纸巾", "大米", "食用油", "酱油", "方便面", "火腿肠", "啤酒", "绿茶"]
+SPECS = ["330ml", "500ml", "1L", "100g", "250g", "1kg", "5kg", "12入", "家庭装", "礼盒"]
+SEARCHES = ["可口可乐", "绿茶 500", "家庭装", "6900000012345", "巧克力礼盒"]
+
+
+def seed_products(count: int) -> None:
+    """批量写入商品数据"""
+    from app.core.database import engine
+    from app.core.snowflake import generate_snowflake_id
+    from app.models import Product
+
+    rng = random.Random(42)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(count):
+            word = rng.choice(WORDS)
+            spec = rng.choice(SPECS)
+            batch.append({
+                "id": generate_snowflake_id(),
+                "name": f"{rng.choice(WORDS)}{word} {spec}",
+                "short_name": f"{word}{i % 1000}",
+                "barcode": f"69{i:011d}",
+                "purchase_price": Decimal("1.00"),
+                "stock_qty": rng.randint(0, 100),
+            })
+            if len(batch) == 5000:
+                conn.execute(Product.__table__.insert(), batch)
+                batch.clear()
+        if batch:
+            conn.execute(Product.__table__.insert(), batch)
+        if engine.dialect.name == "postgresql":
+            conn.exec_driver_sql("ANALYZE products")
+
+
+async def main(count: int, repeat: int) -> None:
+    setup_database()
+    print(f"seeding {count} products ...")
+    start = time.perf_counter()
+    seed_products(count)
+    print(f"seeded in {time.perf_counter() - start:.1f}s")
+
+    from sqlalchemy import func, select
+
+    from app.core.database import AsyncSessionLocal
+    from app.models import Product
+    from app.service.product_search import apply_product_search, ensure_sqlite_search_index, find_product_by_barcode
+
+    async def run_like(db, search: str) -> None:
+        pattern = f"%{search}%"
+        query = select(Product).where(
+            Product.name.like(pattern) | Product.short_name.like(pattern) | Product.barcode.like(pattern)
+        )
+        await db.scalar(select(func.count()).select_from(query.subquery()))
+        (await db.scalars(query.order_by(Product.created_at.desc()).limit(20))).all()
+
+    async def run_indexed(db, search: str) -> None:
+        query = select(Product)
+        if await find_product_by_barcode(db, query, search):
+            return
+        query = await apply_product_search(db, query, search)
+        await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        (await db.scalars(query.order_by(Product.created_at.desc()).limit(20))).all()
+
+    async with AsyncSessionLocal() as db:
+        # 与应用启动时一致：确认商品搜索索引就绪
+        await ensure_sqlite_search_index(db)
+        print(f"dialect={db.bind.dialect.name}")
+        for search in SEARCHES:
+            for name, runner in (("LIKE scan", run_like), ("indexed", run_indexed)):
+                samples = []
+                for _ in range(repeat):
+                    begin = time.perf_counter()
+                    await runner(db, search)
+                    samples.append(time.perf_counter() - begin)
+                report(f"{name:<10} '{search}'", samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    ))
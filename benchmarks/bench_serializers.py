@@ -0,0 +1,60 @@
+"""
+列表响应序列化基准测试
+
+对比商品列表两种把 ORM 对象序列化为 JSON 的方式（每页 20 / 100 条）:
+- model: ProductResponse.model_validate 逐行创建模型 + PageResponse + 按 Response[...] 校验后 dump_json
+  （FastAPI 按响应模型序列化的路径）
+- registry: 预构建的序列化器直接序列化字段字典，不创建中间模型实例
+
+用法:
+    python benchmarks/bench_serializers.py [迭代次数，默认 2000]
+"""
+import sys
+from datetime import datetime
+from decimal import Decimal
+
+from _common import Timer
+
+PAGE_SIZES = [20, 100]
+
+
+def main(iterations: int) -> None:
+    from pydantic import TypeAdapter
+
+    from app.core.response import PageResponse, Response, success_response
+    from app.core.serializers import model_fields, serializer_registry, to_field_dicts
+    from app.models import Product
+    from app.schemas.product import ProductResponse
+
+    response_type = Response[PageResponse[ProductResponse]]
+    adapter = TypeAdapter(response_type)
+    serializer = serializer_registry.register(response_type)
+    fields = model_fields(ProductResponse)
+
+    def via_model(products) -> bytes:
+        items = [ProductResponse.model_validate(product) for product in products]
+        content = success_response(data=PageResponse[ProductResponse](total=len(items), items=items, total_mode="exact"))
+        return adapter.dump_json(adapter.validate_python(content), by_alias=True)
+
+    def via_registry(products) -> bytes:
+        return serializer.to_json({"total": len(products), "items": to_field_dicts(products, fields), "total_mode": "exact"})
+
+    for page_size in PAGE_SIZES:
+        products = [
+            Product(
+                id=369704208582180864 + i, name=f"商品{i}", short_name=f"商品{i}", spec="500ml", barcode=f"69{i:011d}",
+                image_url=None, purchase_price=Decimal("12.50"), stock_qty=i, created_at=datetime.now(),
+            )
+            for i in range(page_size)
+        ]
+        assert via_model(products) == via_registry(products)
+        for name, func in (("model", via_model), ("registry", via_registry)):
+            with Timer() as timer:
+                for _ in range(iterations):
+                    func(products)
+            per_page = timer.elapsed / iterations
+            print(f"{name:<10} pageSize={page_size:<4} {per_page * 1e6:8.1f} us/page  {page_size / per_page:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
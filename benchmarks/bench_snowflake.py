@@ -0,0 +1,48 @@
+"""
+Snowflake ID 生成基准测试
+
+分别测量单线程逐个生成、多线程并发逐个生成与批量生成（generate_ids）的吞吐量，
+并校验所有 ID 唯一。
+
+用法:
+    python benchmarks/bench_snowflake.py [每项生成数量，默认 200000] [线程数，默认 32]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _common  # noqa: F401  设置环境变量与导入路径
+
+
+def run(title: str, count: int, func) -> None:
+    begin = time.perf_counter()
+    ids = func()
+    elapsed = time.perf_counter() - begin
+    assert len(ids) == count and len(set(ids)) == count, "存在重复 ID"
+    print(f"{title:<32} n={count:<8} {elapsed:6.3f}s  {count / elapsed:12.0f} ids/s")
+
+
+def main(count: int, threads: int) -> None:
+    from app.core.snowflake import SnowflakeIDGenerator
+
+    generator = SnowflakeIDGenerator(datacenter_id=1, worker_id=1)
+    run("single thread generate_id", count, lambda: [generator.generate_id() for _ in range(count)])
+
+    per_thread = count // threads
+
+    def worker(_):
+        return [generator.generate_id() for _ in range(per_thread)]
+
+    def concurrent():
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return [i for chunk in pool.map(worker, range(threads)) for i in chunk]
+
+    run(f"{threads} threads generate_id", per_thread * threads, concurrent)
+    run("single thread generate_ids", count, lambda: generator.generate_ids(count))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 32,
+    )
@@ -0,0 +1,78 @@
+"""
+写接口延迟基准测试
+
+测量创建 / 更新类接口每次请求的耗时与执行的 SQL 语句数，
+用于对比提交后 refresh（多一次 SELECT）与直接使用写入时已知值的差异。
+
+用法:
+    python benchmarks/bench_writes.py [每个接口请求次数，默认 300]
+"""
+import asyncio
+import sys
+import time
+
+from _common import login, make_client, percentile, setup_database
+
+
+async def main(repeat: int) -> None:
+    from sqlalchemy import event
+
+    from app.core.database import async_engine
+
+    setup_database()
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+    async with make_client() as client:
+        headers = await login(client)
+
+        async def measure(title: str, requests) -> list:
+            samples = []
+            results = []
+            statements.clear()
+            for path, body in requests:
+                begin = time.perf_counter()
+                resp = await client.post(path, json=body, headers=headers)
+                samples.append(time.perf_counter() - begin)
+                assert resp.json()["code"] == 200, resp.text
+                results.append(resp.json()["data"])
+            print(
+                f"{title:<28} n={len(samples):<5} "
+                f"p50={percentile(samples, 50) * 1000:7.2f}ms "
+                f"p99={percentile(samples, 99) * 1000:7.2f}ms "
+                f"sql/req={len(statements) / len(samples):5.2f}"
+            )
+            return results
+
+        levels = await measure("customer-levels/create", [
+            ("/customer-levels/create", {"level_name": f"等级{i}"}) for i in range(repeat)
+        ])
+        await measure("customer-levels/update", [
+            ("/customer-levels/update", {"id": level["id"], "level_name": f"新等级{i}"}) for i, level in enumerate(levels)
+        ])
+        customers = await measure("customers/create", [
+            ("/customers/create", {"level_id": levels[0]["id"], "name": f"客户{i}", "phone": f"138{i:08d}", "address": "地址"})
+            for i in range(repeat)
+        ])
+        await measure("customers/update", [
+            ("/customers/update", {"id": customer["id"], "name": f"新客户{i}"}) for i, customer in enumerate(customers)
+        ])
+        products = await measure("products/create", [
+            ("/products/create", {"name": f"商品{i}", "short_name": f"商品{i}", "purchase_price": "1.5", "stock_qty": 10})
+            for i in range(repeat)
+        ])
+        await measure("products/update", [
+            ("/products/update", {"id": product["id"], "purchase_price": "2.25"}) for product in products
+        ])
+        await measure("prices/set (create)", [
+            ("/prices/set", {"product_id": product["id"], "level_id": levels[0]["id"], "sale_price": "3.00"})
+            for product in products
+        ])
+        await measure("prices/set (update)", [
+            ("/prices/set", {"product_id": product["id"], "level_id": levels[0]["id"], "sale_price": "3.50"})
+            for product in products
+        ])
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
@@ -55,6 +55,10 @@ COMMENT ON COLUMN customers.phone IS '联系电话';
 COMMENT ON COLUMN customers.contact_person IS '联系人';
 COMMENT ON COLUMN customers.address IS '地址';
 
+-- 列表按创建时间倒序分页；按等级筛选 + 创建时间倒序（前缀 level_id 支撑删除等级前的客户数统计）
+CREATE INDEX idx_customers_created_at ON customers (created_at, id);
+CREATE INDEX idx_customers_level_id_created_at ON customers (level_id, created_at, id);
+
 -- 4. 创建商品表
 CREATE TABLE products (
     id BIGINT PRIMARY KEY,
@@ -78,6 +82,15 @@ COMMENT ON COLUMN products.image_url IS '商品图片URL';
 COMMENT ON COLUMN products.purchase_price IS '进价';
 COMMENT ON COLUMN products.stock_qty IS '库存数量';
 
+-- 列表按创建时间倒序分页
+CREATE INDEX idx_products_created_at ON products (created_at, id);
+
+-- 商品搜索索引 (pg_trgm)，支持 LIKE '%关键词%' 走索引
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX idx_products_short_name_trgm ON products USING gin (short_name gin_trgm_ops);
+CREATE INDEX idx_products_barcode_trgm ON products USING gin (barcode gin_trgm_ops);
+
 -- 5. 创建商品等级价格表
 CREATE TABLE product_level_prices (
     id BIGINT PRIMARY KEY,
@@ -96,6 +109,44 @@ COMMENT ON COLUMN product_level_prices.product_id IS '商品ID';
 COMMENT ON COLUMN product_level_prices.level_id IS '会员等级ID';
 COMMENT ON COLUMN product_level_prices.sale_price IS '销售价格';
 
+-- 删除等级前的价格数统计（按商品查询由唯一约束 (product_id, level_id) 支撑）
+CREATE INDEX idx_product_level_prices_level_id ON product_level_prices (level_id);
+
+-- 6. 创建库存流水表（只追加，id 为 Snowflake ID 即时间键；不设外键，商品删除后流水保留）
+CREATE TABLE stock_movements (
+    id BIGINT PRIMARY KEY,
+    product_id BIGINT NOT NULL,
+    delta INTEGER NOT NULL,
+    reason VARCHAR(200),
+    user_id BIGINT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_stock_movements_product_id ON stock_movements (product_id, id);
+
+COMMENT ON TABLE stock_movements IS '库存流水表';
+COMMENT ON COLUMN stock_movements.product_id IS '商品ID';
+COMMENT ON COLUMN stock_movements.delta IS '库存变化量';
+COMMENT ON COLUMN stock_movements.reason IS '变更原因';
+COMMENT ON COLUMN stock_movements.user_id IS '操作用户ID';
+
+-- 7. 创建库存快照表
+CREATE TABLE stock_snapshots (
+    id BIGINT PRIMARY KEY,
+    product_id BIGINT NOT NULL,
+    movement_id BIGINT NOT NULL,
+    stock_qty INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT unique_stock_snapshot UNIQUE (product_id, movement_id)
+);
+
+COMMENT ON TABLE stock_snapshots IS '库存快照表';
+COMMENT ON COLUMN stock_snapshots.product_id IS '商品ID';
+COMMENT ON COLUMN stock_snapshots.movement_id IS '快照包含的最后一条流水ID';
+COMMENT ON COLUMN stock_snapshots.stock_qty IS '库存数量';
+
 -- ============================================
 -- 插入默认管理员账号
 -- ============================================
@@ -0,0 +1,11 @@
+-- ============================================
+-- 商品搜索索引 (PostgreSQL)
+-- 为商品名称、简称、条形码建立 pg_trgm GIN 索引，
+-- 使 LIKE '%关键词%' 搜索可以走索引并支持相似度排序
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_short_name_trgm ON products USING gin (short_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_barcode_trgm ON products USING gin (barcode gin_trgm_ops);
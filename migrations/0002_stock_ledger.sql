@@ -0,0 +1,43 @@
+-- ============================================
+-- 库存流水与快照 (PostgreSQL)
+-- stock_movements 只追加，记录每次库存变化，id 为 Snowflake ID（时间键）
+-- stock_snapshots 记录商品截至某条流水的库存，用于查询历史库存与区间报表
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS stock_movements (
+    id BIGINT PRIMARY KEY,
+    product_id BIGINT NOT NULL,
+    delta INTEGER NOT NULL,
+    reason VARCHAR(200),
+    user_id BIGINT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_movements_product_id ON stock_movements (product_id, id);
+
+COMMENT ON TABLE stock_movements IS '库存流水表';
+COMMENT ON COLUMN stock_movements.product_id IS '商品ID';
+COMMENT ON COLUMN stock_movements.delta IS '库存变化量';
+COMMENT ON COLUMN stock_movements.reason IS '变更原因';
+COMMENT ON COLUMN stock_movements.user_id IS '操作用户ID';
+
+CREATE TABLE IF NOT EXISTS stock_snapshots (
+    id BIGINT PRIMARY KEY,
+    product_id BIGINT NOT NULL,
+    movement_id BIGINT NOT NULL,
+    stock_qty INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT unique_stock_snapshot UNIQUE (product_id, movement_id)
+);
+
+COMMENT ON TABLE stock_snapshots IS '库存快照表';
+COMMENT ON COLUMN stock_snapshots.product_id IS '商品ID';
+COMMENT ON COLUMN stock_snapshots.movement_id IS '快照包含的最后一条流水ID';
+COMMENT ON COLUMN stock_snapshots.stock_qty IS '库存数量';
+
+-- 期初快照：已有商品的当前库存作为流水起点（movement_id = 0，快照ID沿用商品ID）
+INSERT INTO stock_snapshots (id, product_id, movement_id, stock_qty)
+SELECT id, id, 0, stock_qty FROM products
+ON CONFLICT DO NOTHING;
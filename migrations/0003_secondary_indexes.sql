@@ -0,0 +1,23 @@
+-- ============================================
+-- 二级索引 (PostgreSQL)
+-- 支撑列表的 ORDER BY created_at DESC 分页 / (created_at, id) 游标翻页、
+-- 客户列表的等级筛选，以及删除等级 / 商品前的 count() 校验
+--
+-- 使用 CONCURRENTLY 建索引，不阻塞线上读写（不能放在事务中执行，psql -f 默认逐条自动提交）
+-- ============================================
+
+-- 客户列表按创建时间倒序
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_customers_created_at ON customers (created_at, id);
+
+-- 客户列表按等级筛选 + 创建时间倒序；前缀 level_id 同时支撑删除等级前的客户数统计
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_customers_level_id_created_at ON customers (level_id, created_at, id);
+
+-- 商品列表按创建时间倒序
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_created_at ON products (created_at, id);
+
+-- 删除等级前的价格数统计（按商品查询 / 删除商品前的价格数统计由唯一约束 (product_id, level_id) 支撑）
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_product_level_prices_level_id ON product_level_prices (level_id);
+
+ANALYZE customers;
+ANALYZE products;
+ANALYZE product_level_prices;
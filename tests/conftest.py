@@ -0,0 +1,108 @@
+"""
+测试公共配置
+
+使用临时 SQLite 数据库在进程内运行应用，每个测试前重建所有表
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+_tmp_dir = tempfile.mkdtemp(prefix="shop-test-")
+os.environ.setdefault("APP_NAME", "shop-test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/test.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.api.deps import user_cache
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.core.security import create_access_token, get_password_hash
+from app.core.snowflake import generate_snowflake_id
+from app.main import app
+from app.models import User
+from app.service.level_registry import level_registry
+from app.service.product_search import ensure_sqlite_search_index
+
+
+@pytest.fixture(autouse=True)
+async def reset_database():
+    """重建所有表并清空进程内缓存"""
+    Base.metadata.drop_all(bind=engine)
+    # 全文索引虚拟表不在 metadata 中，需单独删除（否则残留的 rowid 与新数据冲突）
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE IF EXISTS products_fts")
+    Base.metadata.create_all(bind=engine)
+    await user_cache.clear()
+    # 与应用启动时一致：确认商品搜索索引就绪
+    async with AsyncSessionLocal() as db:
+        await ensure_sqlite_search_index(db)
+    level_registry.invalidate()
+    yield
+
+
+@pytest.fixture
+def admin() -> User:
+    """创建管理员用户"""
+    with SessionLocal() as db:
+        user = User(
+            id=generate_snowflake_id(),
+            username="admin",
+            name="管理员",
+            password=get_password_hash("admin123"),
+            admin_flag=True,
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+    return user
+
+
+@pytest.fixture
+def admin_headers(admin: User) -> dict:
+    """管理员请求头"""
+    token = create_access_token({"sub": str(admin.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def client():
+    """进程内 ASGI 客户端"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as c:
+        yield c
+
+
+class QueryCounter:
+    """SQL 语句计数器"""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    统计代码块内 API 使用的异步引擎执行的 SQL 语句数
+
+    使用示例:
+        with count_queries() as counter:
+            await client.get(...)
+        assert counter.count <= 3
+    """
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
@@ -0,0 +1,25 @@
+"""
+分页总数统计
+"""
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.api.products import _build_products_query
+from app.core.config import Settings
+from app.core.counting import _explain_statement
+from app.models import Product
+
+
+def test_explain_keeps_search_as_bound_parameter():
+    search = "%x' OR 1=1; DROP TABLE products; --%"
+    sql, params = _explain_statement(_build_products_query(True).where(Product.name.like(search)), asyncpg.dialect())
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "DROP TABLE" not in sql
+    assert params == (0, search)
+
+
+def test_invalid_page_count_mode_rejected_at_load():
+    with pytest.raises(ValidationError):
+        Settings(PAGE_COUNT_MODE="fast")
+    assert Settings(PAGE_COUNT_MODE="estimated").PAGE_COUNT_MODE == "estimated"
@@ -0,0 +1,105 @@
+"""
+数据库连接池
+
+空闲超过阈值才检测连接，连接池耗尽时记录超时并通过 /health/db-pool 暴露实时指标
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import exc, text
+
+from app.core import database
+from app.core.database import MonitoredQueuePool, pool_metrics
+from app.main import app
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """按给定连接池配置创建独立的引擎"""
+
+    def factory(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setattr(database.settings, name, value)
+        return database._create_api_engine(f"sqlite:///{tmp_path}/pool.db")
+
+    return factory
+
+
+async def test_pre_ping_only_after_idle(make_engine, monkeypatch):
+    engine = make_engine(DB_POOL_PRE_PING_IDLE_SECONDS=0.2, DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0)
+    pings = []
+    original = engine.dialect.do_ping
+    monkeypatch.setattr(engine.dialect, "do_ping", lambda conn: pings.append(1) or original(conn))
+
+    for _ in range(3):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    assert pings == []
+
+    await asyncio.sleep(0.3)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert pings == [1]
+    await engine.dispose()
+
+
+async def test_pool_timeout_is_counted(make_engine):
+    engine = make_engine(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT_SECONDS=0.1)
+    assert isinstance(engine.pool, MonitoredQueuePool)
+
+    async with engine.connect() as held:
+        await held.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+
+    metrics = pool_metrics(engine)
+    assert metrics["timeouts"] == 1
+    assert metrics["waiting"] == 0
+    assert metrics["checkedOut"] == 0
+    assert metrics["waitMaxMs"] >= 100
+    await engine.dispose()
+
+
+async def test_wait_excludes_connection_setup(make_engine, monkeypatch):
+    """新建连接的耗时不计入等待时间，只有连接数已满时等待归还才计入"""
+    engine = make_engine(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT_SECONDS=1)
+    create_connection = engine.pool._create_connection
+
+    def slow_create_connection():
+        time.sleep(0.1)
+        return create_connection()
+
+    monkeypatch.setattr(engine.pool, "_create_connection", slow_create_connection)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    metrics = pool_metrics(engine)
+    assert metrics["checkouts"] == 1
+    assert metrics["waitMaxMs"] == 0
+
+    async def hold():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.1)
+
+    await asyncio.gather(hold(), hold())
+    metrics = pool_metrics(engine)
+    assert metrics["checkouts"] == 3
+    assert metrics["waitMaxMs"] >= 50
+    assert metrics["waiting"] == 0
+    await engine.dispose()
+
+
+async def test_pool_metrics_endpoint(client, admin_headers):
+    await client.get("/products/page", headers=admin_headers)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as root_client:
+        assert (await root_client.get("/health/db-pool")).status_code == 401
+        resp = await root_client.get("/health/db-pool", headers=admin_headers)
+    primary = resp.json()["primary"]
+    assert primary["checkouts"] > 0
+    assert primary["checkedOut"] == 0
+    assert {"size", "overflow", "waiting", "waitAvgMs", "timeouts"} <= primary.keys()
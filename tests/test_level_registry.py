@@ -0,0 +1,76 @@
+"""
+会员等级注册表
+
+等级的增删改同步到注册表；列表与校验不再查询等级表
+"""
+from app.core.database import SessionLocal
+from app.core.snowflake import generate_snowflake_id
+from app.models import CustomerLevel
+from app.service.level_registry import level_registry
+from tests.conftest import count_queries
+
+
+async def test_registry_follows_level_changes(client, admin_headers):
+    resp = await client.post("/customer-levels/create", json={"level_name": "普通"}, headers=admin_headers)
+    level_id = resp.json()["data"]["id"]
+
+    resp = await client.post(
+        "/customer-levels/update", json={"id": level_id, "level_name": "黄金"}, headers=admin_headers
+    )
+    assert resp.json()["code"] == 200
+
+    resp = await client.post(
+        "/customers/create",
+        json={"level_id": level_id, "name": "客户", "phone": "13800000000", "address": "地址"},
+        headers=admin_headers,
+    )
+    assert resp.json()["data"]["levelName"] == "黄金"
+
+    resp = await client.get("/customer-levels/list", headers=admin_headers)
+    assert [item["levelName"] for item in resp.json()["data"]["items"]] == ["黄金"]
+
+    customer_id = (await client.get("/customers/page", headers=admin_headers)).json()["data"]["items"][0]["id"]
+    await client.post("/customers/delete", json={"id": customer_id}, headers=admin_headers)
+    resp = await client.post("/customer-levels/delete", json={"id": level_id}, headers=admin_headers)
+    assert resp.json()["code"] == 200
+
+    resp = await client.get("/customer-levels/list", headers=admin_headers)
+    assert resp.json()["data"]["items"] == []
+
+
+async def test_registry_serves_lookups_from_memory(client, admin_headers):
+    resp = await client.post("/customer-levels/create", json={"level_name": "普通"}, headers=admin_headers)
+    level_id = resp.json()["data"]["id"]
+    await client.get("/customer-levels/list", headers=admin_headers)
+
+    with count_queries() as counter:
+        await client.get("/customer-levels/list", headers=admin_headers)
+    assert not any("customer_levels" in sql for sql in counter.statements)
+
+    with count_queries() as counter:
+        resp = await client.post(
+            "/customers/create",
+            json={"level_id": level_id, "name": "客户", "phone": "13800000000", "address": "地址"},
+            headers=admin_headers,
+        )
+    assert resp.json()["code"] == 200
+    assert not any("FROM customer_levels" in sql for sql in counter.statements)
+
+
+async def test_registry_reloads_on_unknown_level(client, admin_headers):
+    await client.get("/customer-levels/list", headers=admin_headers)
+
+    # 模拟其他进程新建的等级
+    with SessionLocal() as db:
+        level = CustomerLevel(id=generate_snowflake_id(), level_name="其他进程")
+        db.add(level)
+        db.commit()
+        level_id = level.id
+
+    resp = await client.post(
+        "/customers/create",
+        json={"level_id": str(level_id), "name": "客户", "phone": "13800000000", "address": "地址"},
+        headers=admin_headers,
+    )
+    assert resp.json()["data"]["levelName"] == "其他进程"
+    assert level_registry._levels[level_id].level_name == "其他进程"
@@ -0,0 +1,51 @@
+"""
+游标分页
+
+按 (created_at, id) 倒序翻页：创建时间相同的记录按 ID 区分，逐页翻到末尾不重复、不遗漏
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.core.database import engine
+from app.models import Product
+
+
+def _seed_products(count: int) -> list[int]:
+    """写入商品，每 3 个共用同一创建时间"""
+    start = datetime(2025, 1, 1)
+    rows = [
+        {
+            "id": 1000 + i, "name": f"商品{i}", "short_name": f"商品{i}", "purchase_price": Decimal("1.00"),
+            "stock_qty": 0, "created_at": start + timedelta(minutes=i // 3),
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), rows)
+    return [row["id"] for row in rows]
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 4])
+async def test_scroll_to_end(client, admin_headers, page_size):
+    product_ids = _seed_products(11)
+
+    seen = []
+    cursor = None
+    for _ in range(len(product_ids) + 1):
+        params = {"pageSize": page_size, **({"cursor": cursor} if cursor else {})}
+        data = (await client.get("/products/scroll", params=params, headers=admin_headers)).json()["data"]
+        seen.extend(int(item["id"]) for item in data["items"])
+        cursor = data["nextCursor"]
+        if cursor is None:
+            break
+
+    # 创建时间倒序，相同创建时间按 ID 倒序
+    assert seen == sorted(product_ids, reverse=True)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "W10", "eyJjIjoieCIsImkiOiIxIn0", "游标"])
+async def test_scroll_rejects_malformed_cursor(client, admin_headers, cursor):
+    resp = await client.get("/products/scroll", params={"cursor": cursor}, headers=admin_headers)
+    assert resp.status_code == 400
@@ -0,0 +1,129 @@
+"""
+批量导入价格
+
+CSV / NDJSON 流式导入，按商品ID或条形码引用商品，返回逐行错误报告
+"""
+import json
+
+from app.service import price_import
+
+
+async def _setup(client, headers) -> tuple[int, list[int]]:
+    level_ids = []
+    for i in range(2):
+        resp = await client.post("/customer-levels/create", json={"level_name": f"等级{i}"}, headers=headers)
+        level_ids.append(int(resp.json()["data"]["id"]))
+    resp = await client.post(
+        "/products/create",
+        json={"name": "商品", "short_name": "商品", "barcode": "6900000000001", "purchase_price": "1.00"},
+        headers=headers,
+    )
+    return int(resp.json()["data"]["id"]), level_ids
+
+
+async def test_import_csv(client, admin_headers, monkeypatch):
+    product_id, (level_a, level_b) = await _setup(client, admin_headers)
+    monkeypatch.setattr(price_import.settings, "IMPORT_CHUNK_SIZE", 2)
+
+    body = "\n".join([
+        "product_id,barcode,level_id,sale_price",
+        f"{product_id},,{level_a},2.50",
+        f",6900000000001,{level_b},3.50",
+        f"1,,{level_a},2.00",
+        f",0000,{level_a},2.00",
+        f"{product_id},,1,2.00",
+        f"{product_id},,{level_a},-1",
+        f"{product_id},,{level_a}",
+        f"{product_id},,{level_a},4.00",
+    ])
+    resp = await client.post(
+        "/prices/import", content=body.encode(), headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    data = resp.json()["data"]
+    assert data["totalRows"] == 8
+    assert data["createdCount"] == 2
+    assert data["updatedCount"] == 1
+    assert data["errorCount"] == 5
+    assert [error["line"] for error in data["errors"]] == [4, 5, 6, 7, 8]
+
+    resp = await client.post("/prices/product-prices", json={"product_id": product_id}, headers=admin_headers)
+    prices = {int(price["levelId"]): price["salePrice"] for price in resp.json()["data"]["prices"]}
+    assert prices == {level_a: "4.00", level_b: "3.50"}
+
+
+async def test_import_ndjson(client, admin_headers):
+    product_id, (level_a, level_b) = await _setup(client, admin_headers)
+
+    lines = [
+        json.dumps({"productId": str(product_id), "levelId": str(level_a), "salePrice": "5.00"}),
+        "not json",
+        json.dumps({"barcode": "6900000000001", "levelId": level_b, "salePrice": 6}),
+    ]
+    resp = await client.post(
+        "/prices/import",
+        content="\n".join(lines).encode(),
+        headers={**admin_headers, "Content-Type": "application/x-ndjson"},
+    )
+    data = resp.json()["data"]
+    assert (data["createdCount"], data["updatedCount"], data["errorCount"]) == (2, 0, 1)
+    assert data["errors"][0]["line"] == 2
+
+
+async def test_import_rejects_unknown_content_type(client, admin_headers):
+    resp = await client.post(
+        "/prices/import", content=b"x", headers={**admin_headers, "Content-Type": "text/plain"}
+    )
+    assert resp.status_code == 400
+
+
+async def test_import_reports_invalid_encoding_as_row_error(client, admin_headers, monkeypatch):
+    """编码无效的行记入错误报告，前后的行照常导入（已提交的批次不受影响）"""
+    product_id, (level_a, level_b) = await _setup(client, admin_headers)
+    monkeypatch.setattr(price_import.settings, "IMPORT_CHUNK_SIZE", 1)
+
+    body = b"\n".join([
+        b"product_id,barcode,level_id,sale_price",
+        f"{product_id},,{level_a},2.50".encode(),
+        f"{product_id},,{level_b},3.50".encode("gbk") + b",\xb2\xe2",
+        f"{product_id},,{level_b},1.005".encode(),
+    ])
+    resp = await client.post(
+        "/prices/import", content=body, headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert (data["totalRows"], data["createdCount"], data["errorCount"]) == (3, 2, 1)
+    assert data["errors"][0]["line"] == 3
+
+    resp = await client.post("/prices/product-prices", json={"product_id": product_id}, headers=admin_headers)
+    prices = {int(price["levelId"]): price["salePrice"] for price in resp.json()["data"]["prices"]}
+    assert prices == {level_a: "2.50", level_b: "1.01"}
+
+
+async def test_import_reports_failed_chunk(client, admin_headers, monkeypatch):
+    """某批写入失败时回滚该批并记入错误报告，已提交与后续的批次照常导入"""
+    from sqlalchemy.exc import IntegrityError
+
+    product_id, (level_a, level_b) = await _setup(client, admin_headers)
+    monkeypatch.setattr(price_import.settings, "IMPORT_CHUNK_SIZE", 1)
+    upsert_level_prices = price_import.upsert_level_prices
+
+    async def upsert_failing_for_level_b(db, rows):
+        if rows[0][1] == level_b:
+            raise IntegrityError("INSERT INTO product_level_prices", None, Exception("FOREIGN KEY constraint failed"))
+        return await upsert_level_prices(db, rows)
+
+    monkeypatch.setattr(price_import, "upsert_level_prices", upsert_failing_for_level_b)
+    body = "\n".join([
+        "product_id,barcode,level_id,sale_price",
+        f"{product_id},,{level_a},2.50",
+        f"{product_id},,{level_b},3.50",
+        f"{product_id},,{level_a},4.00",
+    ])
+    resp = await client.post(
+        "/prices/import", content=body.encode(), headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert (data["createdCount"], data["updatedCount"], data["errorCount"]) == (1, 1, 1)
+    assert data["errors"][0]["line"] == 3
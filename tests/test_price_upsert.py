@@ -0,0 +1,68 @@
+"""
+批量设置价格
+
+一条 upsert 语句完成创建与更新，并返回准确的创建/更新数量
+"""
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models import ProductLevelPrice
+from app.service.price_upsert import _upsert_generic
+from tests.conftest import count_queries
+
+
+async def _setup(client, headers, level_count: int) -> tuple[int, list[int]]:
+    level_ids = []
+    for i in range(level_count):
+        resp = await client.post("/customer-levels/create", json={"level_name": f"等级{i}"}, headers=headers)
+        level_ids.append(int(resp.json()["data"]["id"]))
+    resp = await client.post(
+        "/products/create",
+        json={"name": "商品", "short_name": "商品", "purchase_price": "1.00"},
+        headers=headers,
+    )
+    return int(resp.json()["data"]["id"]), level_ids
+
+
+async def test_batch_prices_counts(client, admin_headers):
+    product_id, level_ids = await _setup(client, admin_headers, 4)
+
+    body = {"product_id": product_id, "prices": [{"level_id": i, "sale_price": "2.00"} for i in level_ids[:2]]}
+    resp = await client.post("/prices/batch", json=body, headers=admin_headers)
+    assert resp.json()["data"]["createdCount"] == 2
+    assert resp.json()["data"]["updatedCount"] == 0
+
+    body = {"product_id": product_id, "prices": [{"level_id": i, "sale_price": "3.00"} for i in level_ids]}
+    with count_queries() as counter:
+        resp = await client.post("/prices/batch", json=body, headers=admin_headers)
+    assert resp.json()["data"]["createdCount"] == 2
+    assert resp.json()["data"]["updatedCount"] == 2
+    assert sum("product_level_prices" in sql for sql in counter.statements) == 1
+
+    resp = await client.post("/prices/product-prices", json={"product_id": product_id}, headers=admin_headers)
+    prices = resp.json()["data"]["prices"]
+    assert len(prices) == 4
+    assert {price["salePrice"] for price in prices} == {"3.00"}
+
+
+async def test_generic_upsert_counts(client, admin_headers):
+    product_id, level_ids = await _setup(client, admin_headers, 3)
+    await client.post(
+        "/prices/set",
+        json={"product_id": product_id, "level_id": level_ids[0], "sale_price": "2.00"},
+        headers=admin_headers,
+    )
+
+    async with AsyncSessionLocal() as db:
+        created, updated = await _upsert_generic(
+            db, [(product_id, level_id, Decimal("5.00")) for level_id in level_ids]
+        )
+        await db.commit()
+        prices = (await db.scalars(
+            select(ProductLevelPrice.sale_price).where(ProductLevelPrice.product_id == product_id)
+        )).all()
+
+    assert (created, updated) == (2, 1)
+    assert sorted(prices) == [Decimal("5.00")] * 3
@@ -0,0 +1,40 @@
+"""
+商品搜索
+"""
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, engine
+from app.service.product_search import ensure_sqlite_search_index
+from tests.conftest import count_queries
+
+
+async def test_search_is_read_only(client, admin_headers):
+    for i in range(3):
+        await client.post(
+            "/products/create",
+            json={"name": f"矿泉水{i}", "short_name": f"水{i}", "purchase_price": "2"},
+            headers=admin_headers,
+        )
+
+    with count_queries() as counter:
+        resp = await client.get("/products/page", params={"search": "矿泉水"}, headers=admin_headers)
+    assert resp.json()["data"]["total"] == 3
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in counter.statements), counter.statements
+
+
+async def test_startup_backfills_search_index_for_existing_database(client, admin_headers):
+    await client.post(
+        "/products/create", json={"name": "旧商品可口可乐", "short_name": "可乐", "purchase_price": "2"}, headers=admin_headers,
+    )
+    # 模拟引入全文索引之前创建的数据库
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE products_fts")
+
+    async with AsyncSessionLocal() as db:
+        await ensure_sqlite_search_index(db)
+        await ensure_sqlite_search_index(db)
+        indexed = await db.scalar(text("SELECT count(*) FROM products_fts"))
+    assert indexed == 1
+
+    resp = await client.get("/products/page", params={"search": "可口可乐"}, headers=admin_headers)
+    assert resp.json()["data"]["total"] == 1
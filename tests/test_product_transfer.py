@@ -0,0 +1,100 @@
+"""
+商品批量导入与导出
+"""
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.database import engine
+from app.models import Product
+from app.service import product_transfer
+
+
+async def test_import_csv_reports_bad_rows(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(product_transfer.settings, "IMPORT_CHUNK_SIZE", 2)
+    await client.post(
+        "/products/create",
+        json={"name": "已有商品", "short_name": "已有", "barcode": "6900000000001", "purchase_price": "1.00"},
+        headers=admin_headers,
+    )
+
+    body = "\n".join([
+        "name,short_name,spec,barcode,purchase_price,stock_qty",
+        "可乐,可乐,330ml,6900000000002,2.50,10",
+        "雪碧,雪碧,,,2.00,",
+        "重复,重复,,6900000000001,1.00,0",
+        "文件内重复,重复,,6900000000002,1.00,0",
+        ",缺少名称,,,1.00,0",
+        '"含逗号, 的名称",简称,,6900000000003,3.00,1',
+    ])
+    resp = await client.post(
+        "/products/import", content=body.encode(), headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    data = resp.json()["data"]
+    assert (data["totalRows"], data["createdCount"], data["errorCount"]) == (6, 3, 3)
+    assert [error["line"] for error in data["errors"]] == [4, 5, 6]
+
+    resp = await client.post("/products/barcode", json={"barcode": "6900000000002"}, headers=admin_headers)
+    assert resp.json()["data"]["stockQty"] == 10
+
+
+async def test_import_ndjson_and_export(client, admin_headers):
+    lines = [
+        json.dumps({"name": f"商品{i}", "short_name": f"商品{i}", "barcode": f"69{i:011d}", "purchase_price": "1.50"})
+        for i in range(5)
+    ]
+    resp = await client.post(
+        "/products/import",
+        content="\n".join(lines).encode(),
+        headers={**admin_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert resp.json()["data"]["createdCount"] == 5
+
+    resp = await client.get("/products/export", headers=admin_headers)
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [row["name"] for row in rows] == [f"商品{i}" for i in range(5)]
+    assert rows[0]["purchase_price"] == "1.50"
+
+    resp = await client.get("/products/export", params={"format": "ndjson"}, headers=admin_headers)
+    items = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(items) == 5
+    assert items[0]["short_name"] == "商品0"
+    assert set(items[0]) == set(product_transfer.EXPORT_COLUMNS)
+
+
+@pytest.mark.parametrize("export_format, content_type", [("csv", "text/csv"), ("ndjson", "application/x-ndjson")])
+async def test_export_reimport_round_trip(client, admin_headers, export_format, content_type):
+    for i in range(3):
+        await client.post(
+            "/products/create",
+            json={
+                "name": f"商品{i}", "short_name": f"简称{i}", "spec": "500ml" if i else None, "barcode": f"69{i:011d}",
+                "image_url": None, "purchase_price": "2.35", "stock_qty": i,
+            },
+            headers=admin_headers,
+        )
+    fields = ("name", "shortName", "spec", "barcode", "imageUrl", "purchasePrice", "stockQty")
+    before = sorted(
+        tuple(item[field] for field in fields)
+        for item in (await client.get("/products/page", headers=admin_headers)).json()["data"]["items"]
+    )
+
+    exported = (await client.get("/products/export", params={"format": export_format}, headers=admin_headers)).content
+    with engine.begin() as conn:
+        conn.execute(delete(Product))
+
+    resp = await client.post(
+        "/products/import", content=exported, headers={**admin_headers, "Content-Type": content_type}
+    )
+    data = resp.json()["data"]
+    assert (data["createdCount"], data["errorCount"]) == (3, 0), data["errors"]
+
+    after = sorted(
+        tuple(item[field] for field in fields)
+        for item in (await client.get("/products/page", headers=admin_headers)).json()["data"]["items"]
+    )
+    assert after == before
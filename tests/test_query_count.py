@@ -0,0 +1,145 @@
+"""
+SQL 语句数量守卫
+
+列表接口执行的语句数必须是固定值，不能随每页条数增长（N+1 查询）；
+写接口提交后不再 refresh 重新读取
+"""
+import pytest
+
+from tests.conftest import count_queries
+
+# 单个列表请求允许的最大语句数（含认证查询用户、总数统计）
+MAX_STATEMENTS = 4
+
+
+async def _create_levels(client, headers, count: int) -> list[int]:
+    level_ids = []
+    for i in range(count):
+        resp = await client.post("/customer-levels/create", json={"level_name": f"等级{i}"}, headers=headers)
+        level_ids.append(int(resp.json()["data"]["id"]))
+    return level_ids
+
+
+async def _create_product(client, headers, index: int) -> int:
+    resp = await client.post(
+        "/products/create",
+        json={"name": f"商品{index}", "short_name": f"商品{index}", "purchase_price": "1.00"},
+        headers=headers,
+    )
+    return int(resp.json()["data"]["id"])
+
+
+@pytest.mark.parametrize("size", [2, 20])
+async def test_customers_page_statement_count(client, admin_headers, size):
+    level_ids = await _create_levels(client, admin_headers, size)
+    for i in range(size):
+        await client.post(
+            "/customers/create",
+            json={"level_id": level_ids[i], "name": f"客户{i}", "phone": "13800000000", "address": "地址"},
+            headers=admin_headers,
+        )
+
+    for endpoint in ("/customers/page", "/customers/scroll"):
+        with count_queries() as counter:
+            resp = await client.get(endpoint, params={"pageSize": size}, headers=admin_headers)
+        data = resp.json()["data"]
+        assert len(data["items"]) == size
+        assert all(item["levelName"] for item in data["items"])
+        assert counter.count <= MAX_STATEMENTS, counter.statements
+
+
+@pytest.mark.parametrize("size", [2, 20])
+async def test_products_page_statement_count(client, admin_headers, size):
+    for i in range(size):
+        await _create_product(client, admin_headers, i)
+
+    for endpoint in ("/products/page", "/products/scroll"):
+        with count_queries() as counter:
+            resp = await client.get(endpoint, params={"pageSize": size}, headers=admin_headers)
+        assert len(resp.json()["data"]["items"]) == size
+        assert counter.count <= MAX_STATEMENTS, counter.statements
+
+
+@pytest.mark.parametrize("size", [2, 20])
+async def test_product_prices_statement_count(client, admin_headers, size):
+    level_ids = await _create_levels(client, admin_headers, size)
+    product_id = await _create_product(client, admin_headers, 0)
+    await client.post(
+        "/prices/batch",
+        json={"product_id": product_id, "prices": [{"level_id": lid, "sale_price": "9.90"} for lid in level_ids]},
+        headers=admin_headers,
+    )
+
+    with count_queries() as counter:
+        resp = await client.post("/prices/product-prices", json={"product_id": product_id}, headers=admin_headers)
+    prices = resp.json()["data"]["prices"]
+    assert len(prices) == size
+    assert all(price["levelName"] for price in prices)
+    assert counter.count <= MAX_STATEMENTS, counter.statements
+
+    with count_queries() as counter:
+        resp = await client.post("/products/detail", json={"id": product_id}, headers=admin_headers)
+    assert len(resp.json()["data"]["prices"]) == size
+    assert counter.count <= MAX_STATEMENTS, counter.statements
+
+
+async def test_writes_skip_refresh(client, admin_headers):
+    """写接口提交后不再 refresh：创建 / 更新各只执行必要的语句，返回值与数据库一致"""
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+    from app.models import Product
+
+    # 预热用户缓存，只统计写接口自身的语句
+    await client.get("/customer-levels/list", headers=admin_headers)
+
+    with count_queries() as counter:
+        resp = await client.post(
+            "/products/create",
+            json={"name": "商品", "short_name": "商品", "purchase_price": "1.005", "stock_qty": 3},
+            headers=admin_headers,
+        )
+    data = resp.json()["data"]
+    # 商品 INSERT + 同一事务内的库存流水 INSERT
+    assert counter.count == 2, counter.statements
+    assert data["purchasePrice"] == "1.01"
+
+    with count_queries() as counter:
+        resp = await client.post(
+            "/products/update", json={"id": data["id"], "purchase_price": "2.5"}, headers=admin_headers
+        )
+    assert counter.count == 2, counter.statements
+    assert resp.json()["data"]["purchasePrice"] == "2.50"
+
+    async with AsyncSessionLocal() as db:
+        product = await db.scalar(select(Product).where(Product.id == int(data["id"])))
+    assert str(product.purchase_price) == "2.50"
+    assert product.created_at.isoformat() == data["createdAt"]
+    assert product.updated_at > product.created_at
+
+
+async def test_barcode_lookup_single_statement(client, admin_headers):
+    """条形码查询：商品与等级价格一条语句取回"""
+    (level_id,) = await _create_levels(client, admin_headers, 1)
+    resp = await client.post(
+        "/products/create",
+        json={"name": "可乐", "short_name": "可乐", "barcode": "6900000000001", "purchase_price": "2.00", "stock_qty": 5},
+        headers=admin_headers,
+    )
+    product_id = resp.json()["data"]["id"]
+    await client.post(
+        "/prices/set", json={"product_id": product_id, "level_id": level_id, "sale_price": "3.5"}, headers=admin_headers,
+    )
+
+    with count_queries() as counter:
+        resp = await client.post(
+            "/products/barcode", json={"barcode": "6900000000001", "level_id": level_id}, headers=admin_headers
+        )
+    data = resp.json()["data"]
+    assert (data["id"], data["stockQty"], data["levelId"], data["salePrice"]) == (product_id, 5, str(level_id), "3.50")
+    assert counter.count == 1, counter.statements
+
+    resp = await client.post("/products/barcode", json={"barcode": "6900000000001"}, headers=admin_headers)
+    assert resp.json()["data"]["salePrice"] is None
+    resp = await client.post("/products/barcode", json={"barcode": "6900000000999"}, headers=admin_headers)
+    assert resp.json()["code"] != 200
@@ -0,0 +1,160 @@
+"""
+查询计划检查（仅检查 SQLite 的查询计划）
+
+向 SQLite 写入一批数据并 ANALYZE 后，对各路由的代表性查询执行 EXPLAIN QUERY PLAN，
+出现全表扫描（SCAN 且未使用索引）、整个索引扫描（SCAN ... USING COVERING INDEX，如筛选列不是索引前缀）
+或排序无法走索引（USE TEMP B-TREE FOR ORDER BY）时失败。允许的情况：
+- 按索引顺序遍历（SCAN ... USING INDEX，配合 LIMIT），如客户 LIKE 搜索按创建时间索引顺序过滤
+- 全文索引驱动的搜索（SCAN ... VIRTUAL TABLE INDEX），只对命中的行排序
+
+查询语句由路由使用的同一组构建函数生成（_build_*_query、build_product_search、build_product_prices_query），
+路由修改查询时这里同步生效；新增查询形状时在 QUERY_SHAPES / SEARCH_SHAPES 中补充对应条目。
+PostgreSQL 的计划（pg_trgm GIN 索引等）不在这里检查；LIKE '%关键词%' 的总数统计在 SQLite 上必然全表扫描，
+不在检查范围内（大表使用 PAGE_COUNT_MODE=estimated / cached）
+"""
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Select, func, select
+
+from app.api.customers import _build_customers_query
+from app.api.products import _build_products_query
+from app.core.database import engine
+from app.core.pagination import apply_keyset, encode_cursor
+from app.models import Customer, CustomerLevel, Product, ProductLevelPrice, StockMovement
+from app.service.level_prices import build_product_prices_query
+from app.service.product_search import build_product_search
+
+LEVEL_ID = 1
+PRODUCT_ID = 1000
+CURSOR = encode_cursor(datetime(2025, 6, 1), 1500)
+
+
+def _page(query: Select, model) -> Select:
+    return query.order_by(model.created_at.desc()).offset(40).limit(20)
+
+
+def _count(query: Select) -> Select:
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+QUERY_SHAPES = {
+    # 商品
+    "products.page": _page(_build_products_query(None), Product),
+    "products.page.in_stock": _page(_build_products_query(True), Product),
+    "products.page.barcode": _build_products_query(None).where(Product.barcode == "6900000000042"),
+    "products.scroll": apply_keyset(_build_products_query(None), Product, CURSOR, 20),
+    "products.detail": select(Product).where(Product.id == PRODUCT_ID),
+    "products.detail.prices": build_product_prices_query(PRODUCT_ID),
+    "products.delete.price_count": select(func.count())
+    .select_from(ProductLevelPrice).where(ProductLevelPrice.product_id == PRODUCT_ID),
+    "products.stock_movements": select(StockMovement)
+    .where(StockMovement.product_id == PRODUCT_ID).order_by(StockMovement.id.desc()).limit(21),
+    # 客户
+    "customers.page": _page(_build_customers_query(None, None), Customer),
+    "customers.page.level": _page(_build_customers_query(None, LEVEL_ID), Customer),
+    "customers.page.level.count": _count(_build_customers_query(None, LEVEL_ID)),
+    "customers.scroll": apply_keyset(_build_customers_query(None, None), Customer, CURSOR, 20),
+    "customers.scroll.level": apply_keyset(_build_customers_query(None, LEVEL_ID), Customer, CURSOR, 20),
+    "customers.detail": select(Customer).where(Customer.id == 1500),
+    # 会员等级
+    "customer_levels.delete.customer_count": select(func.count())
+    .select_from(Customer).where(Customer.level_id == LEVEL_ID),
+    "customer_levels.delete.price_count": select(func.count())
+    .select_from(ProductLevelPrice).where(ProductLevelPrice.level_id == LEVEL_ID),
+    # 价格
+    "prices.product_prices": build_product_prices_query(PRODUCT_ID),
+    "prices.set.existing": select(ProductLevelPrice)
+    .where(ProductLevelPrice.product_id == PRODUCT_ID, ProductLevelPrice.level_id == LEVEL_ID),
+    # 客户搜索（LIKE，按创建时间索引顺序过滤）
+    "customers.page.search": _page(_build_customers_query("客户12", None), Customer),
+    "customers.scroll.search": apply_keyset(_build_customers_query("客户12", None), Customer, None, 20),
+}
+
+
+def _product_search(search: str, ranked: bool):
+    return build_product_search(engine.dialect.name, _build_products_query(None), search, ranked)
+
+
+# 商品搜索：全文索引在应用启动时确认就绪后才使用，因此在测试运行时（索引就绪后）再构建
+SEARCH_SHAPES = {
+    "products.page.search": lambda: _page(_product_search("商品12", ranked=True), Product),
+    "products.page.search.count": lambda: _count(_product_search("商品12", ranked=True)),
+    "products.page.search.short": lambda: _page(_product_search("商品", ranked=True), Product),
+    "products.scroll.search": lambda: apply_keyset(_product_search("商品12", ranked=False), Product, CURSOR, 20),
+}
+
+
+def _seed() -> None:
+    """写入 4 个等级、2000 个客户、1000 个商品（每个商品 4 个等级价格）及库存流水"""
+    rng = random.Random(7)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(CustomerLevel.__table__.insert(), [
+            {"id": level_id, "level_name": f"等级{level_id}"} for level_id in range(1, 5)
+        ])
+        conn.execute(Product.__table__.insert(), [
+            {
+                "id": 1000 + i, "name": f"商品{i}", "short_name": f"商品{i}", "barcode": f"69{i:011d}",
+                "purchase_price": Decimal("1.00"), "stock_qty": rng.randint(0, 10),
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(1000)
+        ])
+        conn.execute(ProductLevelPrice.__table__.insert(), [
+            {"id": 10000 + i * 4 + level_id, "product_id": 1000 + i, "level_id": level_id, "sale_price": Decimal("2.00")}
+            for i in range(1000)
+            for level_id in range(1, 5)
+        ])
+        conn.execute(Customer.__table__.insert(), [
+            {
+                "id": 1000 + i, "level_id": rng.randint(1, 4), "name": f"客户{i}", "phone": "13800000000",
+                "address": "地址", "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(2000)
+        ])
+        conn.execute(StockMovement.__table__.insert(), [
+            {"id": 100000 + i, "product_id": 1000 + i % 1000, "delta": 1}
+            for i in range(5000)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _plan_problems(plan: list[str]) -> list[str]:
+    """查询计划中的全表扫描、整个索引扫描与临时排序（全文索引命中的行排序除外）"""
+    full_text = any(" VIRTUAL TABLE INDEX " in detail for detail in plan)
+    problems = []
+    for detail in plan:
+        if " VIRTUAL TABLE INDEX " in detail:
+            continue
+        if detail.startswith("SCAN ") and (" USING " not in detail or " USING COVERING INDEX " in detail):
+            problems.append(detail)
+        if detail.startswith("USE TEMP B-TREE FOR ORDER BY") and not full_text:
+            problems.append(detail)
+    return problems
+
+
+@pytest.fixture
+def seeded():
+    """写入测试数据"""
+    _seed()
+
+
+@pytest.mark.parametrize("name", list(QUERY_SHAPES) + list(SEARCH_SHAPES))
+def test_query_uses_index(seeded, name):
+    query = QUERY_SHAPES[name] if name in QUERY_SHAPES else SEARCH_SHAPES[name]()
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    assert not _plan_problems(plan), f"{name} 未走索引:\n{sql}\n" + "\n".join(plan)
+
+
+def test_product_search_uses_full_text_index(seeded):
+    """关键词不少于 3 个字符时商品搜索由全文索引驱动，而不是按创建时间索引逐行过滤"""
+    for name in ("products.page.search", "products.page.search.count", "products.scroll.search"):
+        sql = str(SEARCH_SHAPES[name]().compile(engine, compile_kwargs={"literal_binds": True}))
+        with engine.connect() as conn:
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+        assert any(" VIRTUAL TABLE INDEX " in detail for detail in plan), f"{name}:\n" + "\n".join(plan)
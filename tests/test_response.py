@@ -0,0 +1,44 @@
+"""
+响应序列化
+
+声明了响应模型的路由走 FastAPI 的单次序列化路径（pydantic-core 直接输出 JSON 字节），输出格式不变
+"""
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+
+from app.main import app
+
+
+def test_model_routes_use_direct_json_serialization():
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.response_field is not None:
+            # 自定义 response_class 会使 FastAPI 退回 dict + json.dumps 的两次编码
+            assert isinstance(route.response_class, DefaultPlaceholder), route.path
+
+
+async def test_page_response_format(client, admin_headers):
+    await client.post(
+        "/products/create",
+        json={"name": "商品“一”", "short_name": "商品", "purchase_price": "1.5"},
+        headers=admin_headers,
+    )
+    resp = await client.get("/products/page", headers=admin_headers)
+
+    assert resp.headers["content-type"] == "application/json"
+    body = resp.json()
+    assert body["code"] == 200 and body["data"]["totalMode"] == "exact"
+    item = body["data"]["items"][0]
+    assert isinstance(item["id"], str)
+    assert item["shortName"] == "商品"
+    assert item["purchasePrice"] == "1.50"
+    assert item["spec"] is None
+    # 非 ASCII 字符不转义
+    assert "商品“一”".encode() in resp.content
+
+
+async def test_unpaginated_list_omits_total_mode(client, admin_headers):
+    await client.post("/customer-levels/create", json={"level_name": "金卡"}, headers=admin_headers)
+    resp = await client.get("/customer-levels/list", headers=admin_headers)
+    data = resp.json()["data"]
+    assert [item["levelName"] for item in data["items"]] == ["金卡"]
+    assert "totalMode" not in data
@@ -0,0 +1,114 @@
+"""
+密码哈希线程池与 Token 缓存
+
+- 密码哈希排队与执行中的任务数有上限，超出时直接返回 503
+- 已验证的 Token 缓存到过期为止，重复请求不再校验签名；无效 / 过期 Token 不缓存
+"""
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core import security
+from app.core.cache import LRUCache
+from app.core.exceptions import UnauthorizedException
+
+
+async def test_password_pool_rejects_when_full(client, admin, monkeypatch):
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_QUEUE_LIMIT", 2)
+    release = threading.Event()
+
+    tasks = [asyncio.create_task(security._run_password_task(release.wait, 5)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert security._password_pending == 2
+
+    resp = await client.post("/auth/login", json={"username": "admin", "password": "admin123"})
+    assert resp.status_code == 503
+    assert security._password_pending == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert security._password_pending == 0
+
+    resp = await client.post("/auth/login", json={"username": "admin", "password": "admin123"})
+    assert resp.status_code == 200
+    assert security._password_pending == 0
+
+
+async def test_password_pool_releases_slot_on_error(monkeypatch):
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_QUEUE_LIMIT", 1)
+
+    def fail():
+        raise ValueError("invalid salt")
+
+    for _ in range(2):
+        try:
+            await security._run_password_task(fail)
+        except ValueError:
+            pass
+    assert security._password_pending == 0
+    assert await security.verify_password_async("secret", security.get_password_hash("secret"))
+
+
+@pytest.fixture
+def jwt_decodes(monkeypatch):
+    """使用独立的 Token 缓存，返回签名校验记录（每次校验追加一项）"""
+    monkeypatch.setattr(security.settings, "TOKEN_CACHE_ENABLED", True)
+    monkeypatch.setattr(security, "_token_cache", LRUCache(maxsize=16))
+    decodes = []
+    jwt_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *args, **kwargs: decodes.append(1) or jwt_decode(*args, **kwargs))
+    return decodes
+
+
+def test_repeated_token_is_cache_hit(jwt_decodes):
+    token = security.create_access_token({"sub": "1"})
+    assert security.decode_access_token(token)["sub"] == "1"
+    assert security.decode_access_token(token)["sub"] == "1"
+    assert len(jwt_decodes) == 1
+
+    # 返回副本，调用方修改不影响缓存
+    security.decode_access_token(token)["sub"] = "2"
+    assert security.get_user_id_from_token(token) == 1
+    assert len(jwt_decodes) == 1
+    assert security.get_token_cache_stats() == {"size": 1, "maxsize": 16, "hits": 3, "misses": 1}
+
+
+def test_cache_entry_expires_at_token_exp(jwt_decodes, monkeypatch):
+    now = [time.monotonic()]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    token = security.create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=60))
+    security.decode_access_token(token)
+
+    now[0] += 58
+    security.decode_access_token(token)
+    assert len(jwt_decodes) == 1
+
+    now[0] += 3
+    security.decode_access_token(token)
+    assert len(jwt_decodes) == 2
+    assert security.get_token_cache_stats()["hits"] == 1
+
+
+def test_invalid_and_expired_tokens_are_not_cached(jwt_decodes):
+    expired = security.create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=-10))
+    tampered = security.create_access_token({"sub": "1"})[:-2] + "xx"
+    for token in (expired, tampered, "not-a-token"):
+        for _ in range(2):
+            with pytest.raises(UnauthorizedException):
+                security.decode_access_token(token)
+    assert len(jwt_decodes) == 6
+    assert security.get_token_cache_stats() == {"size": 0, "maxsize": 16, "hits": 0, "misses": 6}
+
+
+def test_cache_disabled(jwt_decodes, monkeypatch):
+    monkeypatch.setattr(security.settings, "TOKEN_CACHE_ENABLED", False)
+    token = security.create_access_token({"sub": "1"})
+    security.decode_access_token(token)
+    security.decode_access_token(token)
+    assert len(jwt_decodes) == 2
+    assert security.get_token_cache_stats()["size"] == 0
@@ -0,0 +1,123 @@
+"""
+响应序列化器注册表
+
+预构建的序列化器直接序列化字段字典，输出与按响应模型序列化逐字节一致
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.core.response import CursorPageResponse, PageResponse, Response, success_response
+from app.core.serializers import model_fields, serializer_registry, to_field_dicts
+from app.models import Customer, Product
+from app.schemas.customer import CustomerListResponse
+from app.schemas.product import ProductResponse
+
+
+def _dump_with_model(response_type, data) -> bytes:
+    adapter = TypeAdapter(response_type)
+    return adapter.dump_json(adapter.validate_python(success_response(data=data)), by_alias=True)
+
+
+def test_serializer_matches_model_serialization():
+    products = [
+        ProductResponse(
+            id=369704208582180864 + i, name=f"商品\"{i}\"", short_name="简称", spec=None, barcode=f"69{i}",
+            image_url=None, purchase_price=Decimal("12.50"), stock_qty=i, created_at=datetime.now(),
+        )
+        for i in range(3)
+    ]
+    serializer = serializer_registry.register(Response[CursorPageResponse[ProductResponse]])
+    assert serializer is serializer_registry.register(Response[CursorPageResponse[ProductResponse]])
+
+    data = {"items": to_field_dicts(products, model_fields(ProductResponse)), "next_cursor": "abc", "total": None}
+    expected = _dump_with_model(
+        Response[CursorPageResponse[ProductResponse]],
+        CursorPageResponse[ProductResponse](items=products, next_cursor="abc"),
+    )
+    assert serializer.to_json(data) == expected
+
+
+async def test_list_endpoints_match_model_serialization(client, admin_headers):
+    resp = await client.post("/customer-levels/create", json={"level_name": "金卡"}, headers=admin_headers)
+    level_id = resp.json()["data"]["id"]
+    for i in range(3):
+        await client.post(
+            "/products/create",
+            json={"name": f"商品{i}", "short_name": f"商品{i}", "purchase_price": "1.5", "barcode": f"69{i}"},
+            headers=admin_headers,
+        )
+        await client.post(
+            "/customers/create",
+            json={"level_id": level_id, "name": f"客户{i}", "phone": "13800000000", "address": "地址"},
+            headers=admin_headers,
+        )
+
+    async with AsyncSessionLocal() as db:
+        products = (await db.scalars(select(Product).order_by(Product.created_at.desc()))).all()
+        customers = (await db.scalars(select(Customer).order_by(Customer.created_at.desc()))).all()
+
+    resp = await client.get("/products/page", headers=admin_headers)
+    assert resp.content == _dump_with_model(
+        Response[PageResponse[ProductResponse]],
+        PageResponse[ProductResponse](
+            total=3, items=[ProductResponse.model_validate(p) for p in products], total_mode="exact",
+        ),
+    )
+
+    resp = await client.get("/customers/page", headers=admin_headers)
+    assert resp.content == _dump_with_model(
+        Response[PageResponse[CustomerListResponse]],
+        PageResponse[CustomerListResponse](
+            total=3,
+            items=[
+                CustomerListResponse(
+                    id=c.id, level_id=c.level_id, level_name="金卡", name=c.name, phone=c.phone,
+                    contact_person=c.contact_person, address=c.address, created_at=c.created_at,
+                )
+                for c in customers
+            ],
+            total_mode="exact",
+        ),
+    )
+
+
+async def test_projected_list_queries(client, admin_headers):
+    resp = await client.post("/customer-levels/create", json={"level_name": "银卡"}, headers=admin_headers)
+    level_id = resp.json()["data"]["id"]
+    for i in range(5):
+        resp = await client.post(
+            "/products/create",
+            json={"name": f"矿泉水{i}", "short_name": f"水{i}", "purchase_price": "2", "barcode": f"6900{i}"},
+            headers=admin_headers,
+        )
+        product_id = resp.json()["data"]["id"]
+    await client.post(
+        "/prices/set", json={"product_id": product_id, "level_id": level_id, "sale_price": "3.5"}, headers=admin_headers,
+    )
+
+    # 条形码完全匹配、全文搜索
+    resp = await client.get("/products/page", params={"search": "69004"}, headers=admin_headers)
+    assert [item["id"] for item in resp.json()["data"]["items"]] == [product_id]
+    resp = await client.get("/products/page", params={"search": "矿泉水"}, headers=admin_headers)
+    assert resp.json()["data"]["total"] == 5
+
+    # 游标翻页
+    seen, cursor = [], None
+    while True:
+        params = {"pageSize": 2, **({"cursor": cursor} if cursor else {})}
+        data = (await client.get("/products/scroll", params=params, headers=admin_headers)).json()["data"]
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["nextCursor"]
+        if not cursor:
+            break
+    assert len(set(seen)) == 5 and seen[0] == product_id
+
+    # 商品价格列表
+    resp = await client.post("/prices/product-prices", json={"product_id": product_id}, headers=admin_headers)
+    data = resp.json()["data"]
+    assert data["productId"] == product_id and data["productName"] == "矿泉水4"
+    assert [(p["levelId"], p["levelName"], p["salePrice"]) for p in data["prices"]] == [(level_id, "银卡", "3.50")]
@@ -0,0 +1,59 @@
+"""
+生产启动入口
+
+worker 数按 CPU 核数推算，启动前校验 worker ID 与数据库连接预算
+"""
+import pytest
+
+from app.core.config import get_settings
+from app.server import (
+    available_cpus,
+    build_uvicorn_options,
+    check_connection_budget,
+    check_worker_ids,
+    resolve_workers,
+)
+
+
+@pytest.fixture
+def settings():
+    return get_settings().model_copy()
+
+
+def test_resolve_workers(settings):
+    settings.SERVER_WORKERS = 0
+    assert resolve_workers(settings) == available_cpus() >= 1
+
+    settings.SERVER_WORKERS = 3
+    assert resolve_workers(settings) == 3
+
+
+def test_fixed_worker_id_allows_single_worker(settings):
+    settings.WORKER_ID = 5
+    check_worker_ids(settings, 1)
+    with pytest.raises(RuntimeError):
+        check_worker_ids(settings, 2)
+
+    settings.WORKER_ID = None
+    check_worker_ids(settings, 32)
+    with pytest.raises(RuntimeError):
+        check_worker_ids(settings, 33)
+
+
+def test_connection_budget(settings):
+    settings.DB_POOL_SIZE = 5
+    settings.DB_MAX_OVERFLOW = 10
+    check_connection_budget(settings, 6, 97)
+    check_connection_budget(settings, 100, None)
+    with pytest.raises(RuntimeError, match="90"):
+        check_connection_budget(settings, 6, 89)
+
+
+def test_uvicorn_options(settings):
+    settings.SERVER_LIMIT_MAX_REQUESTS = 0
+    settings.SERVER_LIMIT_CONCURRENCY = 500
+    options = build_uvicorn_options(settings, 4)
+    assert options["workers"] == 4
+    assert options["limit_max_requests"] is None
+    assert options["limit_concurrency"] == 500
+    assert options["timeout_graceful_shutdown"] == settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
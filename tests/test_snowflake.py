@@ -0,0 +1,73 @@
+"""
+Snowflake ID 生成器
+
+多线程并发生成不重复，批量生成预留连续序列号，小幅时钟回拨等待、大幅回拨报错
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.snowflake import ClockMovedBackwardsError, SnowflakeIDGenerator
+
+
+def test_concurrent_generate_id_unique():
+    generator = SnowflakeIDGenerator(datacenter_id=1, worker_id=1)
+
+    def worker(_):
+        return [generator.generate_id() for _ in range(2000)]
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        ids = [i for chunk in pool.map(worker, range(32)) for i in chunk]
+
+    assert len(set(ids)) == 32 * 2000
+
+
+def test_generate_ids_contiguous_and_unique():
+    generator = SnowflakeIDGenerator(datacenter_id=1, worker_id=1)
+    single = generator.generate_id()
+
+    # 超过一毫秒的序列号容量，需跨多个毫秒预留
+    ids = generator.generate_ids(10000)
+
+    assert len(set(ids)) == 10000
+    assert ids == sorted(ids)
+    assert ids[0] > single
+    assert generator.generate_id() > ids[-1]
+
+    # 同一毫秒内的 ID 连续
+    first_block = [i for i in ids if i >> SnowflakeIDGenerator.TIMESTAMP_SHIFT == ids[0] >> SnowflakeIDGenerator.TIMESTAMP_SHIFT]
+    assert first_block == list(range(first_block[0], first_block[0] + len(first_block)))
+
+
+def test_concurrent_generate_ids_unique():
+    generator = SnowflakeIDGenerator(datacenter_id=1, worker_id=1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ids = [i for chunk in pool.map(generator.generate_ids, [3000] * 16) for i in chunk]
+
+    assert len(set(ids)) == 3000 * 16
+
+
+def test_small_clock_regression_waits(monkeypatch):
+    generator = SnowflakeIDGenerator(datacenter_id=1, worker_id=1)
+    now = generator._current_millis()
+    clock = iter([now, now - 3, now - 1, now + 1])
+    monkeypatch.setattr(generator, "_current_millis", lambda: next(clock))
+    monkeypatch.setattr("app.core.snowflake.time.sleep", lambda seconds: None)
+
+    first = generator.generate_id()
+    second = generator.generate_id()
+
+    assert second > first
+    assert generator.last_timestamp == now + 1
+
+
+def test_large_clock_regression_raises(monkeypatch):
+    generator = SnowflakeIDGenerator(datacenter_id=1, worker_id=1)
+    now = generator._current_millis()
+    clock = iter([now, now - 1000])
+    monkeypatch.setattr(generator, "_current_millis", lambda: next(clock))
+
+    generator.generate_id()
+    with pytest.raises(ClockMovedBackwardsError):
+        generator.generate_id()
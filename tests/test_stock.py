@@ -0,0 +1,86 @@
+"""
+库存调整
+
+条件 UPDATE 原子调整库存：并发调整不丢失更新，库存不会被扣成负数
+"""
+import asyncio
+
+import pytest
+
+
+async def _create_product(client, headers, stock_qty: int) -> str:
+    resp = await client.post(
+        "/products/create",
+        json={"name": "商品", "short_name": "商品", "purchase_price": "1.00", "stock_qty": stock_qty},
+        headers=headers,
+    )
+    return resp.json()["data"]["id"]
+
+
+async def _stock(client, headers, product_id: str) -> int:
+    resp = await client.post("/products/detail", json={"id": product_id}, headers=headers)
+    return resp.json()["data"]["stockQty"]
+
+
+async def test_stock_update_errors(client, admin_headers):
+    product_id = await _create_product(client, admin_headers, 5)
+
+    resp = await client.post("/products/stock", json={"id": product_id, "delta": -3}, headers=admin_headers)
+    assert resp.json()["data"]["stock_qty"] == 2
+
+    resp = await client.post("/products/stock", json={"id": product_id, "delta": -3}, headers=admin_headers)
+    assert resp.status_code == 400
+    assert await _stock(client, admin_headers, product_id) == 2
+
+    resp = await client.post("/products/stock", json={"id": "1", "delta": 1}, headers=admin_headers)
+    assert resp.status_code == 404
+
+
+@pytest.mark.parametrize("initial, decrements, increments", [(500, 1000, 0), (100, 300, 200)])
+async def test_concurrent_stock_updates(client, admin_headers, initial, decrements, increments):
+    product_id = await _create_product(client, admin_headers, initial)
+
+    async def adjust(delta: int) -> int:
+        resp = await client.post("/products/stock", json={"id": product_id, "delta": delta}, headers=admin_headers)
+        return resp.status_code
+
+    deltas = [-1] * decrements + [1] * increments
+    statuses = await asyncio.gather(*(adjust(delta) for delta in deltas))
+
+    succeeded = sum(1 for delta, status in zip(deltas, statuses) if status == 200 and delta < 0)
+    assert set(statuses) <= {200, 400}
+    assert all(status == 200 for delta, status in zip(deltas, statuses) if delta > 0)
+    assert await _stock(client, admin_headers, product_id) == initial + increments - succeeded
+    assert succeeded >= min(decrements, initial)
+
+
+async def test_stock_batch_all_or_nothing(client, admin_headers):
+    first = await _create_product(client, admin_headers, 5)
+    second = await _create_product(client, admin_headers, 1)
+
+    lines = [{"id": first, "delta": -2}, {"id": second, "delta": -1}, {"id": first, "delta": -1}]
+    resp = await client.post("/products/stock-batch", json={"lines": lines}, headers=admin_headers)
+    items = {item["id"]: item["stockQty"] for item in resp.json()["data"]}
+    assert items == {first: 2, second: 0}
+
+    lines = [{"id": first, "delta": -1}, {"id": second, "delta": -1}, {"id": "1", "delta": 1}]
+    resp = await client.post("/products/stock-batch", json={"lines": lines}, headers=admin_headers)
+    assert resp.status_code == 400
+    failures = {item["id"]: item["msg"] for item in resp.json()["data"]}
+    assert failures == {second: "库存不足", "1": "商品不存在"}
+    assert await _stock(client, admin_headers, first) == 2
+
+
+async def test_concurrent_stock_batches(client, admin_headers):
+    products = [await _create_product(client, admin_headers, 100) for _ in range(3)]
+
+    async def checkout(i: int) -> int:
+        # 行顺序各不相同，服务端按商品ID排序加锁
+        lines = [{"id": product_id, "delta": -1} for product_id in products[i % 3:] + products[:i % 3]]
+        resp = await client.post("/products/stock-batch", json={"lines": lines}, headers=admin_headers)
+        return resp.status_code
+
+    statuses = await asyncio.gather(*(checkout(i) for i in range(150)))
+    assert statuses.count(200) == 100
+    for product_id in products:
+        assert await _stock(client, admin_headers, product_id) == 0
@@ -0,0 +1,154 @@
+"""
+库存流水与快照
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models import StockMovement, StockSnapshot
+from app.service import stock_ledger as ledger_module
+from app.service.stock_ledger import stock_at, take_stock_snapshots
+
+
+async def _create_product(client, headers, stock_qty: int) -> str:
+    resp = await client.post(
+        "/products/create",
+        json={"name": "商品", "short_name": "商品", "purchase_price": "1.00", "stock_qty": stock_qty},
+        headers=headers,
+    )
+    return resp.json()["data"]["id"]
+
+
+async def test_movements_are_recorded(client, admin_headers):
+    before = datetime.now() - timedelta(seconds=1)
+    product_id = await _create_product(client, admin_headers, 10)
+    await client.post("/products/stock", json={"id": product_id, "delta": -3, "reason": "销售"}, headers=admin_headers)
+    await client.post(
+        "/products/stock-batch",
+        json={"lines": [{"id": product_id, "delta": 5}], "reason": "进货"},
+        headers=admin_headers,
+    )
+    await client.post("/products/update", json={"id": product_id, "stock_qty": 20}, headers=admin_headers)
+
+    resp = await client.get(
+        "/products/stock-movements", params={"productId": product_id, "pageSize": 3}, headers=admin_headers
+    )
+    data = resp.json()["data"]
+    assert [(item["delta"], item["reason"]) for item in data["items"]] == [(8, "修改商品信息"), (5, "进货"), (-3, "销售")]
+    assert data["items"][0]["userId"]
+
+    resp = await client.get(
+        "/products/stock-movements",
+        params={"productId": product_id, "cursor": data["nextCursor"]},
+        headers=admin_headers,
+    )
+    assert [item["delta"] for item in resp.json()["data"]["items"]] == [10]
+
+    resp = await client.get(
+        "/products/stock-at", params={"productId": product_id, "at": datetime.now().isoformat()}, headers=admin_headers
+    )
+    assert resp.json()["data"]["stockQty"] == 20
+    resp = await client.get(
+        "/products/stock-at", params={"productId": product_id, "at": before.isoformat()}, headers=admin_headers
+    )
+    assert resp.json()["data"]["stockQty"] == 0
+
+
+async def test_snapshots_and_report(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(ledger_module, "SNAPSHOT_SAFETY_LAG", timedelta(0))
+    start = datetime.now()
+    product_id = await _create_product(client, admin_headers, 10)
+    await client.post("/products/stock", json={"id": product_id, "delta": -4}, headers=admin_headers)
+    await asyncio.sleep(0.01)
+
+    async with AsyncSessionLocal() as db:
+        assert await take_stock_snapshots(db) == 1
+        assert await take_stock_snapshots(db) == 0
+        snapshots = (await db.scalars(select(StockSnapshot.stock_qty))).all()
+    assert snapshots == [6]
+
+    await client.post("/products/stock", json={"id": product_id, "delta": 7}, headers=admin_headers)
+    await client.post("/products/stock", json={"id": product_id, "delta": -2}, headers=admin_headers)
+
+    async with AsyncSessionLocal() as db:
+        assert await stock_at(db, int(product_id), datetime.now()) == 11
+
+    resp = await client.get(
+        "/products/stock-report",
+        params={"productId": product_id, "start": start.isoformat(), "end": datetime.now().isoformat()},
+        headers=admin_headers,
+    )
+    report = resp.json()["data"]
+    assert (report["openingQty"], report["inQty"], report["outQty"], report["closingQty"]) == (0, 17, 6, 11)
+
+
+async def test_movements_commit_with_stock(client, admin_headers):
+    """流水与库存调整同一事务：调整失败时库存与流水都不写入，无需后台刷新即可查询"""
+    product_id = await _create_product(client, admin_headers, 2)
+    resp = await client.post(
+        "/products/stock-batch",
+        json={"lines": [{"id": product_id, "delta": -1}, {"id": "1", "delta": 1}]},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 400
+    await client.post("/products/stock", json={"id": product_id, "delta": -5}, headers=admin_headers)
+
+    async with AsyncSessionLocal() as db:
+        movements = (await db.scalars(select(StockMovement.delta))).all()
+    assert movements == [2]
+
+
+def test_opening_snapshots_seeded_on_create():
+    """已有数据库补建快照表时，已有商品的当前库存作为期初快照"""
+    from app.core.database import engine
+    from app.models import Product
+
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), [
+            {"id": 1, "name": "旧商品", "short_name": "旧", "purchase_price": 1, "stock_qty": 7},
+        ])
+    StockSnapshot.__table__.drop(engine)
+    StockSnapshot.__table__.create(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(select(StockSnapshot.product_id, StockSnapshot.movement_id, StockSnapshot.stock_qty)).all()
+    assert rows == [(1, 0, 7)]
+
+
+async def test_update_stock_conflicts_with_concurrent_adjustment(client, admin_headers, monkeypatch):
+    """修改商品信息读取库存后，其他请求已调整库存：报冲突而不覆盖，流水合计与库存一致"""
+    from app.api import products as products_api
+    from app.models import Product
+    from app.service.stock import adjust_stock, set_stock
+
+    product_id = await _create_product(client, admin_headers, 10)
+
+    async def set_stock_after_concurrent_sale(db, *args):
+        async with AsyncSessionLocal() as other:
+            await adjust_stock(other, int(product_id), -3)
+            await ledger_module.record_movements(other, [(int(product_id), -3)], "销售", None)
+            await other.commit()
+        return await set_stock(db, *args)
+
+    monkeypatch.setattr(products_api, "set_stock", set_stock_after_concurrent_sale)
+    resp = await client.post("/products/update", json={"id": product_id, "stock_qty": 20}, headers=admin_headers)
+    assert resp.status_code == 409
+
+    async with AsyncSessionLocal() as db:
+        stock_qty = await db.scalar(select(Product.stock_qty).where(Product.id == int(product_id)))
+        movements = (await db.scalars(select(StockMovement.delta))).all()
+    assert stock_qty == 7
+    assert sum(movements) == stock_qty
+
+
+async def test_stock_reason_length_is_validated(client, admin_headers):
+    """变更原因超过流水表列长度时返回 422，而不是写入时数据库报错"""
+    product_id = await _create_product(client, admin_headers, 1)
+    reason = "原" * 201
+    resp = await client.post("/products/stock", json={"id": product_id, "delta": 1, "reason": reason}, headers=admin_headers)
+    assert resp.status_code == 422
+    resp = await client.post(
+        "/products/stock-batch", json={"lines": [{"id": product_id, "delta": 1}], "reason": reason}, headers=admin_headers,
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,42 @@
+"""
+已认证用户缓存
+
+修改用户后缓存在事务提交后失效，flush 期间不访问缓存
+"""
+import asyncio
+
+from app.api.deps import user_cache
+from app.core.database import AsyncSessionLocal
+from app.models import User
+
+
+async def test_user_cache_invalidated_after_commit(client, admin, admin_headers, monkeypatch):
+    await client.get("/customer-levels/list", headers=admin_headers)
+    assert await user_cache.get(str(admin.id)) is not None
+
+    deleted = []
+    original_delete = user_cache.delete
+
+    async def tracking_delete(key):
+        deleted.append(key)
+        await original_delete(key)
+
+    monkeypatch.setattr(user_cache, "delete", tracking_delete)
+
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, admin.id)
+        user.name = "新名称"
+        await db.flush()
+        await asyncio.sleep(0)
+        assert deleted == []
+        await db.rollback()
+    await asyncio.sleep(0)
+    assert deleted == []
+
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, admin.id)
+        user.name = "新名称"
+        await db.commit()
+    await asyncio.sleep(0)
+    assert deleted == [str(admin.id)]
+    assert await user_cache.get(str(admin.id)) is None
@@ -0,0 +1,30 @@
+"""
+用户 Service
+
+通过 get_service 注入的 Service 使用异步会话
+"""
+import pytest
+
+from app.api.deps import get_service
+from app.core.database import AsyncSessionLocal
+from app.schemas.user import UserCreate, UserLogin
+from app.service.user_service import UserService
+
+
+async def test_user_service_with_async_session():
+    async with AsyncSessionLocal() as db:
+        user_service = get_service(UserService)(db)
+        user = await user_service.register(
+            UserCreate(username="cashier", name="收银员", password="secret1", phone="13800000000")
+        )
+        with pytest.raises(ValueError):
+            await user_service.register(UserCreate(username="cashier", name="重复", password="secret1"))
+
+        token = await user_service.login(UserLogin(username="cashier", password="secret1"))
+        with pytest.raises(ValueError):
+            await user_service.login(UserLogin(username="cashier", password="wrong"))
+
+        current = await user_service.get_current_user(token.access_token)
+        assert (current.id, current.username, current.admin_flag) == (user.id, "cashier", False)
+        assert (await user_service.get_user_by_username("cashier")).id == user.id
+        assert await user_service.get_user(1) is None
@@ -0,0 +1,80 @@
+"""
+worker ID 租约
+
+同一租约目录下的多个进程租用到不同的 worker ID，释放或进程退出后可被重新租用
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core import snowflake
+from app.core.worker_id import WorkerIdLease
+
+LEASE_SCRIPT = """
+import sys
+from app.core.worker_id import WorkerIdLease
+lease = WorkerIdLease(sys.argv[1], 31)
+print(lease.acquire(), flush=True)
+sys.stdin.read()
+"""
+
+
+def test_leases_are_exclusive(tmp_path):
+    first = WorkerIdLease(str(tmp_path), 31)
+    second = WorkerIdLease(str(tmp_path), 31)
+
+    assert first.acquire() == 0
+    assert second.acquire() == 1
+
+    first.release()
+    third = WorkerIdLease(str(tmp_path), 31)
+    assert third.acquire() == 0
+
+    second.release()
+    third.release()
+
+
+def test_leases_exhausted(tmp_path):
+    leases = [WorkerIdLease(str(tmp_path), 1) for _ in range(3)]
+    assert [lease.acquire() for lease in leases[:2]] == [0, 1]
+    with pytest.raises(RuntimeError):
+        leases[2].acquire()
+    for lease in leases[:2]:
+        lease.release()
+
+
+def test_processes_get_distinct_ids_and_release_on_exit(tmp_path):
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", LEASE_SCRIPT, str(tmp_path)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=Path(__file__).resolve().parent.parent,
+        )
+        for _ in range(4)
+    ]
+    worker_ids = [int(process.stdout.readline()) for process in processes]
+    assert sorted(worker_ids) == [0, 1, 2, 3]
+
+    # 进程退出后锁自动释放
+    for process in processes:
+        process.communicate("")
+    lease = WorkerIdLease(str(tmp_path), 31)
+    assert lease.acquire() == 0
+    lease.release()
+
+
+def test_generator_uses_leased_worker_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(snowflake.settings, "WORKER_ID", None)
+    monkeypatch.setattr(snowflake.settings, "WORKER_ID_LEASE_DIR", str(tmp_path))
+    snowflake.release_worker_id()
+
+    occupied = WorkerIdLease(str(tmp_path), 31)
+    occupied.acquire()
+    try:
+        new_id = snowflake.generate_snowflake_id()
+        worker_bits = (new_id >> snowflake.SnowflakeIDGenerator.WORKER_ID_SHIFT) & snowflake.SnowflakeIDGenerator.MAX_WORKER_ID
+        assert worker_bits == 1
+    finally:
+        snowflake.release_worker_id()
+        occupied.release()